@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 import os
 from io import BytesIO
 from config import Config
+from modules.event_compaction import legacy_event_view
 
 # Page config
 st.set_page_config(
@@ -55,7 +56,8 @@ def load_jobs(sheet_url):
     
     try:
         sheet = client.open_by_url(sheet_url)
-        df = pd.DataFrame(sheet.sheet1.get_all_records())
+        # Compacted rows (one per job) are expanded back into per-stage rows
+        df = legacy_event_view(pd.DataFrame(sheet.sheet1.get_all_records()))
         
         if df.empty:
             return df
@@ -18,6 +18,7 @@ sys.path.append(os.path.dirname(__file__))
 # Import our custom modules
 from modules.cv_parser import CVData, parse_uploaded_cv
 from modules.recommendation_engine import JobMatch, get_job_recommendations
+from modules.event_compaction import legacy_event_view
 from components.cv_uploader import render_cv_upload, render_cv_preferences, get_cv_header_stats
 from config import Config
 
@@ -74,7 +75,8 @@ def load_jobs_data():
         # Load data
         gc = gspread.service_account(filename=creds_path)
         sheet = gc.open_by_url(sheet_url)
-        df = pd.DataFrame(sheet.sheet1.get_all_records())
+        # Compacted rows (one per job) are expanded back into per-stage rows
+        df = legacy_event_view(pd.DataFrame(sheet.sheet1.get_all_records()))
         
         if df.empty:
             return df
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Analysis Cache Module - description analysis reused across keywords, countries and cycles
+The same posting keeps coming back with an identical description. Its keyword
+flags, matched keywords, extracted skills and language are cached under a hash
+of the normalized title + description (namespaced by the keyword matcher's
+signature, so editing keyword lists invalidates old entries): an in-memory LRU
+in front of an optional SQLite file that survives restarts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_description(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", (text or "").lower()).strip()
+
+
+def analysis_key(description: str, title: str = "", signature: str = "") -> str:
+    """Cache key: skills depend on the title too, flags on the keyword lists (signature)"""
+    payload = "\0".join((signature, normalize_description(title), normalize_description(description)))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """LRU of analysis dicts {categories, matched_keywords, top_skills, language} with an optional disk tier"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2048, ttl_days: float = 30):
+        """
+        :param path: SQLite file for the disk tier (None = memory only)
+        :param max_entries: entries kept in memory (least recently used dropped first)
+        :param ttl_days: disk entries older than this are purged on open
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_days * 86400
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._dirty = False
+        if path:
+            self._open()
+
+    def _open(self):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS analysis (key TEXT PRIMARY KEY, data TEXT, updated_at REAL)")
+            self._db.execute("DELETE FROM analysis WHERE updated_at < ?", (time.time() - self.ttl_seconds,))
+            self._db.commit()
+        except Exception as e:
+            logging.warning(f"Analysis cache file {self.path} unavailable ({e}) - caching in memory only")
+            self._db = None
+
+    def _remember(self, key: str, analysis: Dict):
+        self._memory[key] = analysis
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            analysis = self._memory.get(key)
+            if analysis is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return dict(analysis)
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT data FROM analysis WHERE key = ?", (key,)).fetchone()
+                except Exception as e:
+                    logging.debug(f"Analysis cache read failed: {e}")
+                    row = None
+                if row:
+                    analysis = json.loads(row[0])
+                    self._remember(key, analysis)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return dict(analysis)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, analysis: Dict):
+        with self._lock:
+            self._remember(key, dict(analysis))
+            if self._db is not None:
+                try:
+                    self._db.execute("INSERT OR REPLACE INTO analysis (key, data, updated_at) VALUES (?, ?, ?)",
+                                     (key, json.dumps(analysis, ensure_ascii=False), time.time()))
+                    self._dirty = True
+                except Exception as e:
+                    logging.debug(f"Analysis cache write failed: {e}")
+
+    def update(self, key: str, **fields):
+        """Add fields computed later (e.g. the language, detected only for alerts)"""
+        with self._lock:
+            analysis = dict(self._memory.get(key) or {})
+        if analysis:
+            analysis.update(fields)
+            self.put(key, analysis)
+
+    def save(self):
+        """Commit disk-tier writes (called once per page)"""
+        with self._lock:
+            if self._db is not None and self._dirty:
+                try:
+                    self._db.commit()
+                    self._dirty = False
+                except Exception as e:
+                    logging.warning(f"Could not save analysis cache {self.path}: {e}")
+
+    def close(self):
+        self.save()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def describe(self) -> str:
+        return f"{self.hits} hits ({self.disk_hits} from disk) / {self.misses} misses, {len(self._memory)} in memory"
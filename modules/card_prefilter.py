@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Card Prefilter Module - reject jobs from card metadata before opening them
+Clicking a card and waiting for its description is the expensive part of a
+job. Title include / exclude patterns, a company blocklist and the card's
+"Applied" badge are checked first, and a job is skipped only when these alone
+show it cannot pass the filters. Skills and remote / visa wording are only
+known from the description, so they are still decided after the click; skipping
+cards labelled On-site under require_remote / block_remote_prohibited is an
+explicit opt-in (skip_on_site), because an On-site card can still mention
+remote work in its description.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Pattern
+
+WORKPLACE_RE = re.compile(r"\((on-site|hybrid|remote)\)", re.IGNORECASE)
+
+
+def parse_pattern_list(text) -> List[str]:
+    """'intern, sales;Werkstudent' -> ['intern', 'sales', 'Werkstudent'] (lists pass through cleaned)"""
+    if not text:
+        return []
+    if not isinstance(text, str):
+        text = "\n".join(text)
+    return [p.strip() for p in re.split(r"[,;\n]", text) if p.strip()]
+
+
+def compile_patterns(patterns: Iterable[str]) -> Optional[Pattern]:
+    """
+    One case-insensitive regex for a list of patterns, each matched as whole words
+    ('intern' does not match 'international'); invalid regexes are matched literally.
+    """
+    parts = []
+    for pattern in patterns:
+        try:
+            re.compile(pattern)
+        except re.error:
+            pattern = re.escape(pattern)
+        parts.append(f"(?:{pattern})")
+    if not parts:
+        return None
+    return re.compile(r"(?<!\w)(?:" + "|".join(parts) + r")(?!\w)", re.IGNORECASE)
+
+
+def workplace_type(card: Dict) -> str:
+    """'Berlin, Germany (On-site)' -> 'on-site'; '' when the card does not say"""
+    match = WORKPLACE_RE.search(card.get("location") or "")
+    return match.group(1).lower() if match else ""
+
+
+class CardPrefilter:
+    """Card-only rules; reason() returns why a job can be skipped without clicking it"""
+
+    def __init__(self, title_include: Iterable[str] = (), title_exclude: Iterable[str] = (),
+                 company_blocklist: Iterable[str] = (), require_remote: bool = False, require_visa: bool = False,
+                 location_logic: str = "OR", block_remote_prohibited: bool = False, skip_applied: bool = True,
+                 skip_on_site: bool = False):
+        """
+        :param title_include: at least one must match the title (empty = any title)
+        :param title_exclude: titles matching any of these are skipped
+        :param company_blocklist: company names skipped (case-insensitive, whole name)
+        :param require_remote / require_visa / location_logic / block_remote_prohibited: the parser's filter settings
+        :param skip_applied: skip cards showing LinkedIn's "Applied" badge
+        :param skip_on_site: also skip On-site cards the remote settings would reject (off by default)
+        """
+        self.title_include = parse_pattern_list(title_include)
+        self.title_exclude = parse_pattern_list(title_exclude)
+        self.company_blocklist = {c.lower() for c in parse_pattern_list(company_blocklist)}
+        self._include_re = compile_patterns(self.title_include)
+        self._exclude_re = compile_patterns(self.title_exclude)
+        self.skip_applied = skip_applied
+        self.skip_on_site = skip_on_site
+        self.block_remote_prohibited = block_remote_prohibited
+        # An on-site job fails require_remote unless visa support is an accepted alternative
+        self.remote_required = require_remote and not (require_visa and location_logic == "OR")
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "CardPrefilter":
+        return cls(
+            title_include=config.get("title_include"),
+            title_exclude=config.get("title_exclude"),
+            company_blocklist=config.get("company_blocklist"),
+            require_remote=config.get("require_remote", False),
+            require_visa=config.get("require_visa", False),
+            location_logic=config.get("location_logic", "OR"),
+            block_remote_prohibited=config.get("block_remote_prohibited", False),
+            skip_on_site=config.get("prefilter_on_site", False),
+        )
+
+    def reason(self, card: Dict) -> Optional[str]:
+        title = card.get("title") or ""
+        if self.skip_applied and card.get("applied"):
+            return "already applied"
+        if (card.get("company") or "").strip().lower() in self.company_blocklist:
+            return "company blocked"
+        if self._exclude_re is not None:
+            match = self._exclude_re.search(title)
+            if match:
+                return f"title excludes '{match.group(0).lower()}'"
+        if self._include_re is not None and not self._include_re.search(title):
+            return "title not included"
+        if self.skip_on_site and workplace_type(card) == "on-site":
+            if self.block_remote_prohibited:
+                return "on-site, remote prohibited"
+            if self.remote_required:
+                return "on-site, remote required"
+        return None
+
+    def describe(self) -> str:
+        """Part of the filter signature: changing the rules re-evaluates skipped jobs"""
+        parts = []
+        if self.title_include:
+            parts.append(f"Title+:{','.join(self.title_include)}")
+        if self.title_exclude:
+            parts.append(f"Title-:{','.join(self.title_exclude)}")
+        if self.company_blocklist:
+            parts.append(f"Companies-:{','.join(sorted(self.company_blocklist))}")
+        if self.skip_on_site and (self.block_remote_prohibited or self.remote_required):
+            parts.append("On-site-")
+        return ", ".join(parts)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Crawl Checkpoint Module - resumable position of every keyword/country crawl
+Records (keyword, country, cycle, page, last processed job ID) as the scraper
+moves through the start= paginated result pages, so after a browser crash or a
+restart the crawl continues from that page and card instead of page 1. Cards of
+the current page that failed are kept too and retried on resume.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+def search_key(keyword: str, country: str) -> str:
+    return f"{keyword.strip().lower()}|{country.strip().lower()}"
+
+
+class CrawlCheckpoint:
+    """JSON-backed crawl positions, written atomically after every job and page"""
+
+    def __init__(self, path: str, max_age_hours: float = 12):
+        """
+        :param path: JSON file location
+        :param max_age_hours: older unfinished positions are ignored (the result list has moved on)
+        """
+        self.path = path
+        self.max_age_seconds = max_age_hours * 3600
+        self._positions: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._positions = json.load(f).get("searches", {})
+        except Exception as e:
+            logging.warning(f"Could not read crawl checkpoint {self.path}: {e} - starting from page 1")
+            self._positions = {}
+
+    def save(self):
+        with self._lock:
+            data = {"searches": {key: dict(pos) for key, pos in self._positions.items()}}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.warning(f"Could not save crawl checkpoint {self.path}: {e}")
+
+    def position(self, keyword: str, country: str) -> Optional[Dict]:
+        """Unfinished, recent position to resume from, else None (start at page 1)"""
+        pos = self._positions.get(search_key(keyword, country))
+        if not pos or pos.get("completed"):
+            return None
+        if time.time() - pos.get("updated_at", 0) > self.max_age_seconds:
+            return None
+        return dict(pos)
+
+    def _update(self, keyword: str, country: str, **fields):
+        with self._lock:
+            pos = self._positions.setdefault(search_key(keyword, country), {"keyword": keyword, "country": country})
+            pos.update(fields, updated_at=time.time())
+        self.save()
+
+    def record_job(self, keyword: str, country: str, cycle: int, page: int, job_id: Optional[str]):
+        """A card on this page is fully handled (a retried failed card does not move the position)"""
+        with self._lock:
+            pos = self._positions.setdefault(search_key(keyword, country), {"keyword": keyword, "country": country})
+            failed = pos.get("failed_job_ids", []) if pos.get("page") == page else []
+            if job_id in failed:
+                failed = [f for f in failed if f != job_id]
+            else:
+                pos["last_job_id"] = job_id
+            pos.update(cycle=cycle, page=page, failed_job_ids=failed, completed=False, updated_at=time.time())
+        self.save()
+
+    def record_failure(self, keyword: str, country: str, cycle: int, page: int, job_id: Optional[str]):
+        """A card on this page failed: a resume retries it even though later cards were handled"""
+        if not job_id:
+            return
+        with self._lock:
+            pos = self._positions.setdefault(search_key(keyword, country), {"keyword": keyword, "country": country})
+            if pos.get("page") != page:
+                pos.update(last_job_id=None, failed_job_ids=[])
+            failed = pos.setdefault("failed_job_ids", [])
+            if job_id not in failed:
+                failed.append(job_id)
+            pos.update(cycle=cycle, page=page, completed=False, updated_at=time.time())
+        self.save()
+
+    def record_page_done(self, keyword: str, country: str, cycle: int, page: int):
+        """Whole page handled: the next resume starts at the top of the following page"""
+        self._update(keyword, country, cycle=cycle, page=page + 1, last_job_id=None, failed_job_ids=[], completed=False)
+
+    def complete(self, keyword: str, country: str, cycle: int):
+        """Pagination finished for this cycle; the next cycle starts at page 1"""
+        self._update(keyword, country, cycle=cycle, page=1, last_job_id=None, failed_job_ids=[], completed=True)
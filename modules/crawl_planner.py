@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Crawl Planner Module - spend a capped cycle on the cards most likely to match
+Cards are scored by title relevance against the active keyword lists (whole
+keyword phrases plus shared word stems, e.g. "Demand Planner" ~ "demand
+planning") and the search keyword, and each page is processed best-first. With
+a per-cycle time budget the planner stops opening cards once the expected cost
+of one more job no longer fits; the cards left over are carried into the next
+cycle with a bonus. Mean card value per (keyword, country, page) is remembered
+across cycles, so late in the budget low-value pages ahead are skipped and
+searches whose first pages pay off best are queued first.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from modules.crawl_checkpoint import search_key
+from modules.job_cards import card_key
+
+# Title relevance per keyword category (a phrase match in the title)
+CATEGORY_WEIGHTS = {
+    "anaplan": 3.0,
+    "sap": 3.0,
+    "planning": 2.0,
+    "visa": 1.0,
+    "remote": 0.5,
+    "no_relocation": -0.5,
+    "remote_prohibited": -1.0,
+}
+STEM_CATEGORIES = ("anaplan", "sap", "planning")  # lists whose words also count one by one
+STEM_WEIGHT = 1.0
+SEARCH_TERM_WEIGHT = 1.5
+MAX_STEM_MATCHES = 3
+DEFERRED_BONUS = 2.0  # cards left over by the previous cycle's budget go first
+STOPWORDS = {"and", "the", "for", "with", "key", "user", "management", "support", "solution", "advanced"}
+
+_WORD_RE = re.compile(r"[a-z0-9&/+\-]+")
+
+
+def title_stems(text: str) -> set:
+    """'Demand Planner' -> {'deman', 'plann'}: 5-letter prefixes catch planner/planning, forecast/forecasting"""
+    return {word[:5] for word in _WORD_RE.findall((text or "").lower()) if len(word) > 2 and word not in STOPWORDS}
+
+
+class CrawlPlanner:
+    """Card ordering, per-cycle time budget and page values, shared by all pages and pool workers"""
+
+    def __init__(self, keyword_matcher, search_terms: Iterable[str] = (), cycle_budget_s: float = 0,
+                 default_job_s: float = 10.0):
+        """
+        :param keyword_matcher: KeywordMatcher with the active keyword lists
+        :param search_terms: search keywords of the run (their words raise a title's value)
+        :param cycle_budget_s: seconds per cycle (0 = no budget, cards are only reordered)
+        :param default_job_s: expected time per opened job until real jobs were measured
+        """
+        self.keyword_matcher = keyword_matcher
+        lists = keyword_matcher.category_keywords()
+        self.keyword_stems = set()
+        for category in STEM_CATEGORIES:
+            for keyword in lists.get(category, []):
+                self.keyword_stems |= title_stems(keyword)
+        self.search_stems = set()
+        for term in search_terms:
+            self.search_stems |= title_stems(term)
+        self.cycle_budget_s = cycle_budget_s
+        self.job_s = default_job_s
+        self.page_values: Dict[str, float] = {}  # "keyword|country|page" -> mean card value (EWMA over cycles)
+        self._deferred: Dict[str, float] = {}  # card key -> value, carried into the next cycle
+        self._carried: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.cycle_started = time.monotonic()
+        self.cycle_deferred = 0
+        self.cycle_pages_skipped = 0
+
+    # ---------- scoring ----------
+
+    def value(self, card: Dict) -> float:
+        title = card.get("title") or ""
+        scan = self.keyword_matcher.scan(title)
+        value = sum(CATEGORY_WEIGHTS.get(category, 0.0) for category in scan.categories)
+        stems = title_stems(title)
+        value += STEM_WEIGHT * min(MAX_STEM_MATCHES, len(stems & self.keyword_stems))
+        value += SEARCH_TERM_WEIGHT * min(MAX_STEM_MATCHES, len(stems & self.search_stems))
+        if card_key(card) in self._carried:
+            value += DEFERRED_BONUS
+        return value
+
+    def order(self, cards: List[Dict]) -> List[Dict]:
+        """Highest value first; ties keep page order"""
+        return sorted(cards, key=self.value, reverse=True)
+
+    # ---------- time budget ----------
+
+    def begin_cycle(self):
+        with self._lock:
+            if self.cycle_budget_s:
+                logging.info(f"Crawl planner: previous cycle used {time.monotonic() - self.cycle_started:.0f}s "
+                             f"of {self.cycle_budget_s:.0f}s, {self.cycle_deferred} cards deferred, "
+                             f"{self.cycle_pages_skipped} pages skipped")
+            self._carried, self._deferred = self._deferred, {}
+            self.cycle_started = time.monotonic()
+            self.cycle_deferred = 0
+            self.cycle_pages_skipped = 0
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left in this cycle's budget (None = no budget)"""
+        if not self.cycle_budget_s:
+            return None
+        return self.cycle_budget_s - (time.monotonic() - self.cycle_started)
+
+    def has_time(self) -> bool:
+        """Room for one more opened job"""
+        remaining = self.remaining()
+        return remaining is None or remaining >= self.job_s
+
+    def record_job(self, seconds: float):
+        with self._lock:
+            self.job_s = 0.8 * self.job_s + 0.2 * seconds
+
+    def defer(self, cards: List[Dict]):
+        """Cards the budget did not reach: first in line next cycle"""
+        with self._lock:
+            for card in cards:
+                self._deferred[card_key(card)] = self.value(card)
+            self.cycle_deferred += len(cards)
+
+    # ---------- pages ----------
+
+    def _page_key(self, keyword: str, country: str, page: int) -> str:
+        return f"{search_key(keyword, country)}|{page}"
+
+    def observe_page(self, keyword: str, country: str, page: int, cards: List[Dict]):
+        if not cards:
+            return
+        mean = sum(self.value(card) for card in cards) / len(cards)
+        key = self._page_key(keyword, country, page)
+        with self._lock:
+            previous = self.page_values.get(key)
+            self.page_values[key] = mean if previous is None else 0.5 * previous + 0.5 * mean
+
+    def expected_value(self, keyword: str, country: str, page: int) -> Optional[float]:
+        return self.page_values.get(self._page_key(keyword, country, page))
+
+    def page_worth_crawling(self, keyword: str, country: str, page: int) -> bool:
+        """
+        Out of budget: no. In the second half of the budget, pages known to be
+        below the average page value are left for the next cycle.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return True
+        worth = remaining >= self.job_s
+        expected = self.expected_value(keyword, country, page)
+        if worth and expected is not None and remaining < self.cycle_budget_s / 2:
+            with self._lock:
+                average = sum(self.page_values.values()) / len(self.page_values)
+            worth = expected >= average
+        if not worth:
+            with self._lock:
+                self.cycle_pages_skipped += 1
+        return worth
+
+    def order_searches(self, searches: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Searches whose first page paid off best go first (unknown ones keep their place at the front)"""
+        def expected(search):
+            value = self.expected_value(search[0], search[1], 1)
+            return float("inf") if value is None else value
+        return sorted(searches, key=expected, reverse=True)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Event Compaction Module - one Sheets row per job and cycle instead of one per stage
+A job used to be logged as Viewed, then Filtered / Passed filters, and a passing
+job twice more as Passed filters (before and after the Telegram send). The
+compacted row keeps the job's final Stage, its Filter Reason, TG status and the
+Stage History; the Sheets logger updates it in place when a later page gets the
+job further. legacy_event_view() expands compacted rows back into the old
+per-stage rows; the Streamlit apps apply it once where they load the sheet, so
+code counting Stage values keeps working. Jobs skipped by the card pre-filter
+or the language gate never had their description opened and have no Viewed
+row; funnels count them with viewed_count().
+"""
+
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+COMPACT_MARKER = "Stage History"
+ROW_KEY_FIELDS = ["Company", "Vacancy Title", "Cycle #"]
+# Jobs rejected before their description was read are logged without a Viewed event
+UNVIEWED_STAGE_PREFIXES = ("Filtered (language)", "Filtered (pre-filter")
+
+
+def row_key(event: Dict) -> str:
+    return "-".join([str(event.get(f, "")) for f in ROW_KEY_FIELDS])
+
+
+def is_compact(event: Dict) -> bool:
+    return bool(event.get(COMPACT_MARKER))
+
+
+def stage_rank(event: Dict) -> int:
+    """How far the job got: Viewed < Filtered < Passed filters < TG answered < TG sent"""
+    stage = str(event.get("Stage", ""))
+    tg_sent = str(event.get("TG message sent", "")).lower()
+    if stage == "Passed filters":
+        if tg_sent == "yes":
+            return 4
+        return 3 if tg_sent else 2
+    return 1 if stage.startswith("Filtered") else 0
+
+
+def _filter_reason(stage: str) -> str:
+    if stage.startswith("Filtered (") and stage.endswith(")"):
+        return stage[len("Filtered ("):-1]
+    return ""
+
+
+def _history_step(event: Dict) -> str:
+    tg_sent = str(event.get("TG message sent", ""))
+    if event.get("Stage") == "Passed filters" and tg_sent:
+        return "TG sent" if tg_sent.lower() == "yes" else f"TG {tg_sent}"
+    return str(event.get("Stage", ""))
+
+
+def compact_events(events: Iterable[Dict]) -> List[Dict]:
+    """
+    Merge per-stage events into one row per Company / Vacancy Title / Cycle #
+    (first-seen order). Later events win for non-empty values, so the row ends
+    with the final stage and the analysed flags; already compacted rows pass through.
+    """
+    rows: Dict[str, Dict] = {}
+    history: Dict[str, List[str]] = {}
+    for event in events:
+        if is_compact(event):
+            key = row_key(event)
+            if key not in rows or stage_rank(event) >= stage_rank(rows[key]):
+                rows[key] = dict(event)
+                history[key] = str(event[COMPACT_MARKER]).split(" > ")
+            continue
+        key = row_key(event)
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = dict(event)
+            row["First Seen"] = event.get("Timestamp", "")
+            history[key] = []
+        else:
+            for column, value in event.items():
+                if value not in ("", None) or column not in row:
+                    row[column] = value
+        step = _history_step(event)
+        if not history[key] or history[key][-1] != step:
+            history[key].append(step)
+    for key, row in rows.items():
+        row["Filter Reason"] = _filter_reason(str(row.get("Stage", "")))
+        row[COMPACT_MARKER] = " > ".join(history[key])
+    return list(rows.values())
+
+
+def legacy_event_view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compatibility view for dashboards: compacted rows are expanded into the
+    per-stage rows the old logger wrote (Viewed, the final stage, and for sent
+    alerts a Passed filters row with and one without the TG status); rows
+    written by older versions are kept as they are. Pre-filtered and
+    language-gated jobs get no Viewed row (see viewed_count).
+    """
+    if df.empty or COMPACT_MARKER not in df.columns:
+        return df
+    expanded = []
+    for row in df.to_dict("records"):
+        marker = row.get(COMPACT_MARKER)
+        if not isinstance(marker, str) or not marker:
+            expanded.append(row)
+            continue
+        stage = row.get("Stage", "")
+        tg_sent = row.get("TG message sent", "")
+        if not str(stage).startswith(UNVIEWED_STAGE_PREFIXES):
+            expanded.append({**row, "Stage": "Viewed", "TG message sent": ""})
+        if stage == "Passed filters" and tg_sent:
+            expanded.append({**row, "TG message sent": ""})
+        if stage != "Viewed":
+            expanded.append(row)
+    return pd.DataFrame(expanded, columns=df.columns)
+
+
+def viewed_count(df: pd.DataFrame) -> int:
+    """Funnel "Viewed": Viewed rows plus the jobs rejected before their description was opened"""
+    if "Stage" not in df.columns:
+        return len(df)
+    stages = df["Stage"].astype(str)
+    return int((stages == "Viewed").sum() + stages.str.startswith(UNVIEWED_STAGE_PREFIXES).sum())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Job Cards Module - bulk extraction of job card metadata from the results list
+Pulls title, company, URL, job ID, date text, the location / workplace line
+and the "Applied" badge for every card on the page with one execute_script
+call instead of dozens of WebDriver round trips per card.
+CardHarvest accumulates those cards across scroll steps (LinkedIn virtualizes
+the list, so early cards leave the DOM) and locate_job_card re-finds a card by
+job ID right before it is clicked.
+"""
+
+import logging
+import re
+import time
+from typing import Dict, List, Optional
+
+JOB_CARD_SELECTOR = ".job-card-container--clickable"
+
+# Words that identify the "posted N days ago" line on a card
+DATE_MARKERS = ["ago", "hour", "day", "month", "viewed", "yesterday", "today", "just now"]
+
+# Same selector order as the per-card fallback in parse_current_page
+DATE_SELECTORS = [
+    ".job-search-card__listdate",
+    ".job-search-card__listdate--new",
+    ".job-card-container__listed-time",
+    ".job-card-list__footer-wrapper time",
+    "time",
+    "span"
+]
+
+JOB_ID_RE = re.compile(r"/jobs/view/(\d+)")
+
+CARD_EXTRACTION_JS = """
+const cardSelector = arguments[0];
+const dateSelectors = arguments[1];
+const dateMarkers = arguments[2];
+const textOf = el => el ? (el.innerText || el.textContent || '').trim() : '';
+const isDate = t => { const l = t.toLowerCase(); return !!t && dateMarkers.some(m => l.includes(m)); };
+
+return Array.from(document.querySelectorAll(cardSelector)).map(card => {
+    const link = card.querySelector('a.job-card-list__title--link')
+        || card.querySelector('a.job-card-container__link')
+        || Array.from(card.querySelectorAll('a')).find(a => (a.getAttribute('href') || '').includes('/jobs/view/'));
+    const url = link ? link.href : null;
+
+    let dateText = '';
+    for (const sel of dateSelectors) {
+        const t = textOf(card.querySelector(sel));
+        if (isDate(t)) { dateText = t; break; }
+    }
+    if (!dateText) {
+        for (const el of card.querySelectorAll('*')) {
+            const t = textOf(el);
+            if (isDate(t)) { dateText = t; break; }
+        }
+    }
+
+    const holder = card.closest('[data-job-id]') || card.querySelector('[data-job-id]');
+    const footer = Array.from(card.querySelectorAll(
+        '.job-card-container__footer-job-state, .job-card-container__footer-item')).map(textOf);
+    return {
+        title: textOf(card.querySelector('.artdeco-entity-lockup__title span'))
+            || textOf(card.querySelector('.job-card-list__title')),
+        company: textOf(card.querySelector('.artdeco-entity-lockup__subtitle span')),
+        url: url,
+        job_id: holder ? holder.getAttribute('data-job-id') : null,
+        date_text: dateText,
+        location: textOf(card.querySelector('.job-card-container__metadata-wrapper'))
+            || textOf(card.querySelector('.artdeco-entity-lockup__caption')),
+        applied: footer.some(t => /^applied\b/i.test(t))
+    };
+});
+"""
+
+
+# Finds a card by job ID (occludable placeholders keep the ID while the card is virtualized out),
+# scrolls it into view and returns the clickable element once rendered
+LOCATE_CARD_JS = """
+const [jobId, url, cardSelector] = arguments;
+let holder = null;
+if (jobId) {
+    holder = document.querySelector(`[data-occludable-job-id="${jobId}"]`)
+        || document.querySelector(`[data-job-id="${jobId}"]`);
+    if (!holder) {
+        const link = document.querySelector(`a[href*="/jobs/view/${jobId}"]`);
+        holder = link && link.closest(cardSelector);
+    }
+} else if (url) {
+    const link = Array.from(document.querySelectorAll('a')).find(a => a.href === url);
+    holder = link && link.closest(cardSelector);
+}
+if (!holder) return null;
+holder.scrollIntoView({block: 'center'});
+if (holder.matches(cardSelector)) return holder;
+return holder.querySelector(cardSelector) || holder.closest(cardSelector);
+"""
+
+
+def extract_job_id(url: Optional[str]) -> Optional[str]:
+    """Return the numeric LinkedIn job ID from a /jobs/view/<id> URL"""
+    if not url:
+        return None
+    m = JOB_ID_RE.search(url)
+    return m.group(1) if m else None
+
+
+def normalize_job_url(url: Optional[str]) -> Optional[str]:
+    """Make relative /jobs/view/ links absolute"""
+    if url and url.startswith('/jobs/view/'):
+        return 'https://www.linkedin.com' + url
+    return url
+
+
+def normalize_card(raw: Dict) -> Dict:
+    """Fill defaults the per-card code path uses for missing fields"""
+    url = normalize_job_url(raw.get("url"))
+    return {
+        "title": raw.get("title") or "Title not found",
+        "company": raw.get("company") or "Unknown Company",
+        "url": url,
+        "job_id": extract_job_id(url) or raw.get("job_id") or None,
+        "date_text": raw.get("date_text") or "",
+        "location": raw.get("location") or "",
+        "applied": bool(raw.get("applied")),
+    }
+
+
+def extract_job_cards_batch(driver) -> List[Dict]:
+    """Read metadata for every job card on the page in one JavaScript call"""
+    try:
+        raw_cards = driver.execute_script(CARD_EXTRACTION_JS, JOB_CARD_SELECTOR, DATE_SELECTORS, DATE_MARKERS) or []
+    except Exception as e:
+        logging.warning(f"Batch card extraction failed: {e}")
+        return []
+    return [normalize_card(raw) for raw in raw_cards]
+
+
+def card_key(card: Dict) -> str:
+    """Identity of a card across scroll steps: job ID, else URL, else title|company"""
+    return card.get("job_id") or card.get("url") or f"{card.get('title')}|{card.get('company')}"
+
+
+class CardHarvest:
+    """Ordered set of cards seen while scrolling, so virtualized-out cards are not lost"""
+
+    def __init__(self):
+        self._cards: Dict[str, Dict] = {}
+
+    def __len__(self):
+        return len(self._cards)
+
+    def add(self, cards: List[Dict]) -> int:
+        """Add cards in page order; returns how many were new"""
+        new = 0
+        for card in cards:
+            key = card_key(card)
+            if key not in self._cards:
+                self._cards[key] = card
+                new += 1
+        return new
+
+    def collect(self, driver) -> int:
+        """Harvest the currently rendered cards; returns the total collected so far"""
+        self.add(extract_job_cards_batch(driver))
+        return len(self._cards)
+
+    def cards(self) -> List[Dict]:
+        return list(self._cards.values())
+
+
+def locate_job_card(driver, card: Dict, timeout: float = 3.0):
+    """Just-in-time WebElement for a harvested card (None if it cannot be rendered again)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            element = driver.execute_script(LOCATE_CARD_JS, card.get("job_id"), card.get("url"), JOB_CARD_SELECTOR)
+        except Exception as e:
+            logging.debug(f"Could not locate job card {card.get('job_id')}: {e}")
+            element = None
+        if element is not None or time.monotonic() >= deadline:
+            return element
+        time.sleep(0.2)
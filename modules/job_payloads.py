@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Job Payloads Module - job data from LinkedIn's own JSON (voyager) responses
+The search page downloads the result list and, on every card click, the job
+posting as JSON. CdpNetworkCapture picks those responses up from Chrome's
+performance log (Network.* DevTools events) and fetches their bodies with
+Network.getResponseBody; JobPayloadStore pulls job ID, title, company, location,
+posting time, "applied" state and the full description out of them. Cards are
+completed from the store and descriptions are read from it instead of polling
+the description pane. Payloads can be recorded with the page fixtures and fed
+back offline through FixturePayloadCapture.
+"""
+
+import base64
+import datetime
+import json
+import logging
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Job search list, job posting details (REST and GraphQL flavours)
+VOYAGER_JOBS_URL_RE = re.compile(
+    r"/voyager/api/(?:voyagerJobsDash\w*|jobs/\w+|graphql\?[^#]*(?:jobCards|jobPosting|JobPosting))")
+JOB_URN_RE = re.compile(r"urn:li:(?:fsd_|fs_normalized_|fs_)?jobPosting(?:Card)?:\(?(\d+)")
+MIN_DESCRIPTION_CHARS = 50  # same threshold as the description pane polling
+
+
+def performance_logging_capability() -> Dict:
+    """Chrome capability that makes Network.* events readable via driver.get_log('performance')"""
+    return {"performance": "ALL"}
+
+
+def _text(value) -> str:
+    """voyager TextViewModel {'text': ...} or a plain string"""
+    if isinstance(value, dict):
+        value = value.get("text")
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _iter_objects(node) -> Iterator[Dict]:
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _iter_objects(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_objects(value)
+
+
+def _job_id(obj: Dict) -> Optional[str]:
+    for field in ("entityUrn", "dashEntityUrn", "jobPostingUrn", "*jobPosting", "trackingUrn"):
+        match = JOB_URN_RE.search(str(obj.get(field) or ""))
+        if match:
+            return match.group(1)
+    return None
+
+
+def _company(obj: Dict) -> str:
+    name = obj.get("companyName")
+    if isinstance(name, str) and name.strip():
+        return name.strip()
+    if obj.get("primaryDescription"):  # JobPostingCard: company line under the title
+        return _text(obj["primaryDescription"])
+    for inner in _iter_objects(obj.get("companyDetails") or {}):
+        resolved = inner.get("companyResolutionResult")
+        if isinstance(resolved, dict) and resolved.get("name"):
+            return resolved["name"].strip()
+        if isinstance(inner.get("name"), str) and inner["name"].strip():
+            return inner["name"].strip()
+    return ""
+
+
+def _footer(obj: Dict) -> Tuple[Optional[int], bool]:
+    """JobPostingCard footer: (listed date in ms, applied badge)"""
+    listed_at, applied = None, False
+    for item in obj.get("footerItems") or []:
+        if not isinstance(item, dict):
+            continue
+        if item.get("type") == "LISTED_DATE" and item.get("timeAt"):
+            listed_at = int(item["timeAt"])
+        elif item.get("type") == "APPLIED":
+            applied = True
+    return listed_at, applied
+
+
+def extract_jobs(payload) -> Dict[str, Dict]:
+    """{job_id: {title, company, location, posted_at_ms, applied, description}} (only fields found)"""
+    jobs: Dict[str, Dict] = {}
+    for obj in _iter_objects(payload):
+        job_id = _job_id(obj)
+        if not job_id:
+            continue
+        listed_at, applied = _footer(obj)
+        fields = {
+            "title": _text(obj.get("jobPostingTitle")) or _text(obj.get("title")),
+            "company": _company(obj),
+            "location": obj.get("formattedLocation") if isinstance(obj.get("formattedLocation"), str)
+            else _text(obj.get("secondaryDescription")),
+            "posted_at_ms": obj.get("listedAt") or obj.get("originalListedAt") or listed_at,
+            "applied": applied or bool((obj.get("applyingInfo") or {}).get("applied")),
+            "description": _text(obj.get("description")),
+        }
+        job = jobs.setdefault(job_id, {})
+        for key, value in fields.items():
+            if value:
+                job[key] = value
+    return {job_id: job for job_id, job in jobs.items() if job}
+
+
+def relative_posted_text(posted_at_ms: int, now: Optional[datetime.datetime] = None) -> str:
+    """Epoch ms -> '3 hours ago' / '2 days ago', the card wording parse_relative_date understands"""
+    if now is None:
+        now = datetime.datetime.now()
+    seconds = max(0, (now - datetime.datetime.fromtimestamp(posted_at_ms / 1000)).total_seconds())
+    for unit, size in (("week", 7 * 86400), ("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            count = int(seconds // size)
+            return f"{count} {unit}{'s' if count > 1 else ''} ago"
+    return "just now"
+
+
+class JobPayloadStore:
+    """Jobs merged from every payload seen so far (later payloads fill in missing fields)"""
+
+    def __init__(self, max_jobs: int = 5000):
+        self.max_jobs = max_jobs
+        self.jobs: Dict[str, Dict] = {}
+        self.payloads = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def ingest(self, payload) -> int:
+        """Merge one parsed JSON payload; returns the number of jobs it mentioned"""
+        found = extract_jobs(payload)
+        with self._lock:
+            self.payloads += 1
+            for job_id, fields in found.items():
+                self.jobs.setdefault(job_id, {}).update(fields)
+            while len(self.jobs) > self.max_jobs:
+                self.jobs.pop(next(iter(self.jobs)))
+        return len(found)
+
+    def get(self, job_id: Optional[str]) -> Dict:
+        with self._lock:
+            return dict(self.jobs.get(job_id) or {})
+
+    def description(self, job_id: Optional[str]) -> str:
+        return self.get(job_id).get("description", "")
+
+    def enrich(self, card: Dict) -> Dict:
+        """Card with placeholder / missing fields completed from the payloads"""
+        job = self.get(card.get("job_id"))
+        if not job:
+            return card
+        card = dict(card)
+        if job.get("title") and card.get("title") in (None, "", "Title not found"):
+            card["title"] = job["title"]
+        if job.get("company") and card.get("company") in (None, "", "Unknown Company"):
+            card["company"] = job["company"]
+        if job.get("posted_at_ms") and not card.get("date_text"):
+            card["date_text"] = relative_posted_text(job["posted_at_ms"])
+        if job.get("location") and not card.get("location"):
+            card["location"] = job["location"]
+        if job.get("applied"):
+            card["applied"] = True
+        return card
+
+
+class PayloadCapture(ABC):
+    """Source of payloads feeding a JobPayloadStore; sink(url, body) sees every raw payload (fixture recording)"""
+
+    def __init__(self):
+        self.store = JobPayloadStore()
+        self.sink: Optional[Callable[[str, str], None]] = None
+
+    @abstractmethod
+    def _read(self) -> List[Tuple[str, str]]:
+        """(url, body) of the payloads that arrived since the last call"""
+
+    def poll(self) -> int:
+        """Ingest payloads that arrived since the last poll; returns how many"""
+        count = 0
+        for url, body in self._read():
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                continue
+            if self.sink:
+                self.sink(url, body)
+            self.store.ingest(payload)
+            count += 1
+        return count
+
+    def wait_for_description(self, job_id: Optional[str], timeout: float = 5.0, interval: float = 0.2) -> str:
+        """Description of a clicked job once its detail payload arrived ('' on timeout)"""
+        if not job_id:
+            return ""
+        deadline = time.monotonic() + timeout
+        while True:
+            self.poll()
+            description = self.store.description(job_id)
+            if len(description) > MIN_DESCRIPTION_CHARS:
+                return description
+            if time.monotonic() >= deadline:
+                return ""
+            time.sleep(interval)
+
+
+class CdpNetworkCapture(PayloadCapture):
+    """Voyager JSON responses read from a Chrome started with performance logging"""
+
+    def __init__(self, driver, url_re=VOYAGER_JOBS_URL_RE):
+        super().__init__()
+        self.driver = driver
+        self.url_re = url_re
+        self._responses: Dict[str, str] = {}  # requestId -> url, until the body finished loading
+        self.errors = 0
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+        except Exception as e:
+            logging.warning(f"CDP Network.enable failed ({e}) - job payload capture may stay empty")
+
+    def _read(self) -> List[Tuple[str, str]]:
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logging.debug(f"Performance log unavailable: {e}")
+            return []
+        finished = []
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method, params = message.get("method"), message.get("params") or {}
+            if method == "Network.responseReceived":
+                url = (params.get("response") or {}).get("url", "")
+                if self.url_re.search(url):
+                    self._responses[params.get("requestId")] = url
+            elif method == "Network.loadingFinished" and params.get("requestId") in self._responses:
+                finished.append(params["requestId"])
+            elif method == "Network.loadingFailed":
+                self._responses.pop(params.get("requestId"), None)
+        payloads = []
+        for request_id in finished:
+            url = self._responses.pop(request_id)
+            try:
+                result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            except Exception as e:
+                self.errors += 1
+                logging.debug(f"No body for {url}: {e}")
+                continue
+            body = result.get("body", "")
+            if result.get("base64Encoded"):
+                body = base64.b64decode(body).decode("utf-8", errors="replace")
+            payloads.append((url, body))
+        return payloads
+
+
+class FixturePayloadCapture(PayloadCapture):
+    """Recorded payloads ({url, body} dicts), all delivered on the first poll"""
+
+    def __init__(self, payloads: List[Dict]):
+        super().__init__()
+        self._pending = [(p.get("url", ""), p.get("body", "")) for p in payloads]
+
+    def _read(self) -> List[Tuple[str, str]]:
+        pending, self._pending = self._pending, []
+        return pending
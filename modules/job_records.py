@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Job Records Module - compact per-job record and columnar result storage
+JobRecord (__slots__, interned repeated strings) holds one job's fields once;
+the Sheets events and the result row are rendered from it on demand instead of
+being built as separate 22-key dicts. ColumnarResults keeps the run's results
+as typed arrays (strings dictionary-encoded), so a multi-day repetitive run
+grows by a few dozen bytes per matched job, and converts to a pandas
+DataFrame (or an Arrow table when pyarrow is installed) column by column.
+"""
+
+import math
+import sys
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Result columns in Excel / journal order with their storage type
+RESULT_COLUMNS = [
+    ("Company", str),
+    ("Vacancy Title", str),
+    ("Cycle #", int),
+    ("Visa Sponsorship or Relocation", bool),
+    ("Anaplan", bool),
+    ("SAP APO", bool),
+    ("Planning", bool),
+    ("No Relocation Support", bool),
+    ("Remote", bool),
+    ("Remote Prohibited", bool),
+    ("Already Applied", bool),
+    ("Job URL", str),
+    ("Elapsed Time (s)", float),
+    ("Skills", str),
+    ("TG message sent", str),
+    ("Matched key words", str),
+    ("Search Keyword", str),
+    ("Search Country", str),
+    ("Job Date", str),
+    ("transformed publish date from description", str),
+]
+
+# Flag column -> keyword matcher category
+FLAG_CATEGORIES = {
+    "Visa Sponsorship or Relocation": "visa",
+    "Anaplan": "anaplan",
+    "SAP APO": "sap",
+    "Planning": "planning",
+    "No Relocation Support": "no_relocation",
+    "Remote": "remote",
+    "Remote Prohibited": "remote_prohibited",
+    "Already Applied": "already_applied",
+}
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class JobRecord:
+    """One analyzed job; strings shared across jobs (keyword, country, dates, skills) are interned"""
+
+    __slots__ = ("company", "title", "cycle", "job_url", "search_keyword", "search_country", "job_date",
+                 "publish_date", "categories", "skills", "matched_keywords")
+
+    def __init__(self, company: str, title: str, cycle: int, job_url: Optional[str], search_keyword: str = "",
+                 search_country: str = "", job_date: str = "", publish_date: str = ""):
+        self.company = _intern(company)
+        self.title = _intern(title)
+        self.cycle = cycle
+        self.job_url = job_url
+        self.search_keyword = _intern(search_keyword)
+        self.search_country = _intern(search_country)
+        self.job_date = _intern(job_date or "")
+        self.publish_date = _intern(publish_date or "")
+        self.categories = frozenset()
+        self.skills = ""
+        self.matched_keywords = ""
+
+    def set_analysis(self, categories: Iterable[str], top_skills: List[str], matched_keywords: List[str]):
+        self.categories = frozenset(categories)
+        self.skills = _intern(", ".join(top_skills))
+        self.matched_keywords = _intern(", ".join(matched_keywords))
+
+    def flag(self, column: str) -> bool:
+        return FLAG_CATEGORIES[column] in self.categories
+
+    def _fields(self, elapsed: float, details: bool) -> Dict:
+        row = {
+            "Company": self.company,
+            "Vacancy Title": self.title,
+            "Cycle #": self.cycle,
+        }
+        for column, category in FLAG_CATEGORIES.items():
+            row[column] = details and category in self.categories
+        row["Job URL"] = self.job_url
+        row["Elapsed Time (s)"] = round(elapsed, 2)
+        row["Skills"] = self.skills if details else ""
+        return row
+
+    def result_row(self, elapsed: float) -> Dict:
+        """Row for the results journal / Excel ("TG message sent" is filled in once the alert went out)"""
+        row = self._fields(elapsed, True)
+        row.update({
+            "TG message sent": "",
+            "Matched key words": self.matched_keywords,
+            "Search Keyword": self.search_keyword,
+            "Search Country": self.search_country,
+            "Job Date": self.job_date,
+            "transformed publish date from description": self.publish_date,
+        })
+        return row
+
+    def event(self, stage: str, elapsed: float, tg_sent: str = "", details: bool = True,
+              filter_config: Optional[str] = None) -> Dict:
+        """
+        Sheets log event (same keys and order as before)
+        :param details: False before analysis (Viewed / language filter): flags False, no skills
+        :param filter_config: filter signature column, logged with the first Passed filters event
+        """
+        row = {"Timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "Stage": stage}
+        row.update(self._fields(elapsed, details))
+        row.update({
+            "TG message sent": tg_sent,
+            "Matched key words": self.matched_keywords,
+            "Search Keyword": self.search_keyword,
+            "Search Country": self.search_country,
+            "Job Date": self.job_date,
+            "transformed publish date from description": self.publish_date,
+        })
+        if filter_config is not None:
+            row["Filter Config"] = filter_config
+        return row
+
+
+class ColumnarResults:
+    """Append-only typed columns; str columns are dictionary-encoded (int32 codes, -1 = None)"""
+
+    def __init__(self, columns=RESULT_COLUMNS):
+        self.columns = list(columns)
+        self._lock = threading.Lock()
+        self._data: Dict[str, array] = {}
+        self._tables: Dict[str, List[str]] = {}
+        self._codes: Dict[str, Dict[str, int]] = {}
+        for name, kind in self.columns:
+            if kind is str:
+                self._data[name] = array("i")
+                self._tables[name] = []
+                self._codes[name] = {}
+            elif kind is bool:
+                self._data[name] = array("b")  # 0 / 1, -1 = missing
+            elif kind is int:
+                self._data[name] = array("q")
+            else:
+                self._data[name] = array("d")  # NaN = missing
+        self._extra: List[Dict] = []  # keys outside the schema, kept per row only when present
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _encode(self, name: str, value) -> int:
+        if value is None:
+            return -1
+        value = str(value)
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._tables[name])
+            self._tables[name].append(sys.intern(value))
+        return code
+
+    def _push(self, name: str, value):
+        column = self._data[name]
+        try:
+            column.append(value)
+        except BufferError:
+            # A DataFrame from to_dataframe() still views this buffer: continue on a copy,
+            # the viewed array is never written again
+            column = self._data[name] = array(column.typecode, column)
+            column.append(value)
+
+    def append(self, row: Dict):
+        with self._lock:
+            for name, kind in self.columns:
+                value = row.get(name)
+                if kind is str:
+                    self._push(name, self._encode(name, value))
+                elif kind is bool:
+                    self._push(name, -1 if value is None else int(bool(value)))
+                elif kind is int:
+                    self._push(name, int(value or 0))
+                else:
+                    self._push(name, math.nan if value is None else float(value))
+            extra = {key: value for key, value in row.items() if key not in self._data}
+            if extra or self._extra:
+                self._extra.extend({} for _ in range(self._rows - len(self._extra)))
+                self._extra.append(extra)
+            self._rows += 1
+
+    def _value(self, name: str, kind, index: int):
+        raw = self._data[name][index]
+        if kind is str:
+            return None if raw < 0 else self._tables[name][raw]
+        if kind is bool:
+            return None if raw < 0 else bool(raw)
+        if kind is float:
+            return None if math.isnan(raw) else raw
+        return raw
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Rows as dicts (compatibility with code that expects the old list of dicts)"""
+        for index in range(len(self)):
+            row = {name: self._value(name, kind, index) for name, kind in self.columns}
+            if index < len(self._extra):
+                row.update(self._extra[index])
+            yield row
+
+    def _view(self, name: str, kind) -> np.ndarray:
+        return np.frombuffer(memoryview(self._data[name]), dtype={
+            str: np.int32, bool: np.int8, int: np.int64, float: np.float64}[kind])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Numeric and code columns are numpy views of the arrays (no copy); the next
+        append() to a viewed column moves that column to a fresh array instead.
+        str columns become categoricals over the interned value table.
+        """
+        with self._lock:
+            frame = {}
+            for name, kind in self.columns:
+                values = self._view(name, kind)
+                if kind is str:
+                    frame[name] = pd.Categorical.from_codes(values, categories=pd.Index(self._tables[name], dtype=object))
+                elif kind is bool:
+                    if (values < 0).any():
+                        frame[name] = pd.array([None if v < 0 else bool(v) for v in values], dtype="boolean")
+                    else:
+                        frame[name] = values.view(np.bool_)
+                else:
+                    frame[name] = values
+            df = pd.DataFrame(frame, copy=False)
+            if any(self._extra):
+                extra = pd.DataFrame(self._extra + [{}] * (self._rows - len(self._extra)))
+                df = pd.concat([df, extra], axis=1)
+            return df
+
+    def to_arrow(self):
+        """pyarrow Table with dictionary-encoded str columns (requires pyarrow)"""
+        if pa is None:
+            raise RuntimeError("pyarrow is not installed - use to_dataframe()")
+        with self._lock:
+            arrays, names = [], []
+            for name, kind in self.columns:
+                values = self._view(name, kind)
+                if kind is str:
+                    codes = pa.array(values, mask=values < 0)
+                    arrays.append(pa.DictionaryArray.from_arrays(codes, pa.array(self._tables[name], type=pa.string())))
+                elif kind is bool:
+                    arrays.append(pa.array(values.view(np.bool_), mask=values < 0))
+                else:
+                    arrays.append(pa.array(values))
+                names.append(name)
+            return pa.Table.from_arrays(arrays, names=names)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Module - single-pass multi-pattern search over job descriptions
+Compiles all configured keyword lists into one Aho-Corasick automaton so every
+category flag and the matched keyword list come out of one scan of the text.
+"""
+
+import hashlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set
+
+
+@dataclass
+class KeywordScan:
+    """Result of scanning one text"""
+    categories: Set[str] = field(default_factory=set)
+    matched_keywords: List[str] = field(default_factory=list)
+
+    def has(self, category: str) -> bool:
+        return category in self.categories
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton built once from {category: [keywords]}"""
+
+    def __init__(self, categories: Dict[str, List[str]], silent: Iterable[str] = ()):
+        """
+        :param categories: ordered mapping of category name -> keyword list
+        :param silent: categories that set flags but are not reported in matched_keywords
+        """
+        self.silent = set(silent)
+        # Reporting order mirrors the concatenated config lists
+        self._entries = []  # (category, original keyword, pattern id)
+        self._patterns = {}  # lowercase pattern -> id
+        self._pattern_categories = []  # id -> set of categories
+
+        for category, keywords in categories.items():
+            for kw in keywords or []:
+                pattern = kw.lower().strip()
+                if not pattern:
+                    continue
+                pid = self._patterns.get(pattern)
+                if pid is None:
+                    pid = len(self._pattern_categories)
+                    self._patterns[pattern] = pid
+                    self._pattern_categories.append(set())
+                self._pattern_categories[pid].add(category)
+                self._entries.append((category, kw, pid))
+
+        self._build()
+
+    def _build(self):
+        # Node 0 is the root; goto transitions, failure links and outputs per node
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for pattern, pid in self._patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pid)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_pattern_ids(self, text: str) -> Set[int]:
+        """Return ids of every pattern occurring in text (case-insensitive)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def scan(self, text: str) -> KeywordScan:
+        """One linear pass over text -> category flags + matched keywords"""
+        result = KeywordScan()
+        if not text:
+            return result
+        found = self.find_pattern_ids(text)
+        if not found:
+            return result
+        for pid in found:
+            result.categories.update(self._pattern_categories[pid])
+        result.matched_keywords = [
+            kw for category, kw, pid in self._entries
+            if pid in found and category not in self.silent
+        ]
+        return result
+
+    def category_keywords(self) -> Dict[str, List[str]]:
+        """Configured keywords per category, in config order"""
+        keywords: Dict[str, List[str]] = {}
+        for category, kw, _ in self._entries:
+            keywords.setdefault(category, []).append(kw)
+        return keywords
+
+    def signature(self) -> str:
+        """Stable hash of the configured keyword lists (cache namespace for scan results)"""
+        payload = "\n".join(f"{category}\t{kw}" for category, kw, _ in self._entries) + "\n" + ",".join(sorted(self.silent))
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Language Detect Module - lazy, deterministic, cached langdetect wrapper
+langdetect is imported (and its language profiles loaded) on the first
+detection, seeded so the same text always gets the same answer, and results
+are cached by description hash, so a job seen again - or checked by the
+language gate and again for the Telegram alert - is detected only once.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Set
+
+UNKNOWN_LANGUAGE = "unknown"
+
+
+def parse_language_list(text: Optional[str]) -> Set[str]:
+    """'en, DE;fr' -> {'en', 'de', 'fr'} (ISO 639-1 codes as langdetect returns them)"""
+    if not text:
+        return set()
+    if not isinstance(text, str):
+        text = ",".join(text)
+    return {code.strip().lower() for code in text.replace(";", ",").split(",") if code.strip()}
+
+
+def language_allowed(language: str, languages: Iterable[str]) -> bool:
+    """Language gate: no target languages, an undetectable text (the keyword filters still decide) or a match"""
+    languages = set(languages or ())
+    return not languages or language == UNKNOWN_LANGUAGE or language in languages
+
+
+class LanguageDetector:
+    """Seeded langdetect with an LRU cache keyed by the description's SHA-1"""
+
+    def __init__(self, seed: int = 0, max_entries: int = 4096, sample_chars: int = 3000):
+        """
+        :param seed: langdetect's DetectorFactory seed (its sampling is random otherwise)
+        :param max_entries: cached descriptions (least recently used dropped first)
+        :param sample_chars: only the start of long descriptions is analyzed
+        """
+        self.seed = seed
+        self.max_entries = max_entries
+        self.sample_chars = sample_chars
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._detect = None
+
+    def _load(self):
+        """Import langdetect and load its language profiles on first use"""
+        try:
+            from langdetect import DetectorFactory, detect
+            from langdetect.detector_factory import init_factory
+        except ImportError:
+            logging.warning("langdetect is not installed - description language will be 'unknown'")
+            return lambda text: UNKNOWN_LANGUAGE
+        DetectorFactory.seed = self.seed
+        init_factory()  # profiles are loaded once here, under the lock, not racing in worker threads
+        return detect
+
+    def detect(self, text: str) -> str:
+        if not text or not text.strip():
+            return UNKNOWN_LANGUAGE
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+            if self._detect is None:
+                self._detect = self._load()
+            detect = self._detect
+        try:
+            language = detect(text[:self.sample_chars])
+        except Exception:  # LangDetectException: no features in text (numbers, URLs only)
+            language = UNKNOWN_LANGUAGE
+        with self._lock:
+            self._cache[key] = language
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return language
+
+    def describe(self) -> str:
+        return f"language cache {self.hits} hits / {self.misses} misses"
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Notifier Module - background Telegram delivery with a durable retry spool
+The scraper enqueues messages and returns immediately; one worker thread sends
+them over a pooled requests.Session with timeouts, exponential backoff and
+Telegram's 429 retry_after. Every queued item is spooled to disk first, so
+anything unsent survives a crash and is delivered on the next start by the
+notifier of the same bot/chat (each pair spools into its own subfolder).
+"""
+
+import base64
+import hashlib
+import html
+import itertools
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+TELEGRAM_API_BASE = "https://api.telegram.org"
+TELEGRAM_MESSAGE_LIMIT = 4096
+MEDIA_GROUP_MAX = 10
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def spool_dir_for(spool_root: str, bot_token: str, chat_id: str) -> str:
+    """Spool folder of one bot/chat pair, so unsent items never go out through another bot or chat"""
+    pair = hashlib.sha1(f"{bot_token}:{chat_id}".encode("utf-8")).hexdigest()[:12]
+    return os.path.join(spool_root, pair)
+
+
+class TelegramNotifier:
+    """Queue + worker thread delivering Telegram Bot API calls"""
+
+    def __init__(self, bot_token: str, chat_id: str, spool_dir: Optional[str] = None,
+                 api_base: str = TELEGRAM_API_BASE, timeout=(5, 30), max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_max: float = 60.0, stats_every: int = 20):
+        """
+        :param spool_dir: directory for not-yet-delivered items (None disables the spool)
+        :param api_base: Bot API root, overridable for a local HTTP stub
+        :param timeout: (connect, read) seconds for every request
+        :param max_retries: attempts per item for transient failures
+        """
+        self.bot_token = bot_token
+        self.chat_id = chat_id
+        self.spool_dir = spool_dir
+        self.api_base = api_base.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats_every = stats_every
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.sent = 0
+        self.failed = 0
+        self.latencies = deque(maxlen=100)
+        self._queue = queue.Queue()
+        self._seq = itertools.count()
+        self._stop = threading.Event()
+
+        if self.spool_dir:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            self._load_spool()
+        self._thread = threading.Thread(target=self._run, name="telegram-notifier", daemon=True)
+        self._thread.start()
+
+    # ---------- producer side ----------
+
+    def send_message(self, text: str, images: Optional[Iterable] = None, parse_mode: str = "HTML"):
+        """Queue a text message followed by its images; returns immediately"""
+        self._enqueue({"method": "sendMessage", "data": {"chat_id": self.chat_id, "text": text, "parse_mode": parse_mode}})
+        for img in images or []:
+            self._enqueue({"method": "sendPhoto", "data": {"chat_id": self.chat_id}, "photo": _read_bytes(img)})
+
+    def send_media_group(self, images: Iterable, caption: Optional[str] = None):
+        """Queue several images as one album (one API call; a single image falls back to sendPhoto)"""
+        photos = [_read_bytes(img) for img in images][:MEDIA_GROUP_MAX]
+        if len(photos) == 1:
+            data = {"chat_id": self.chat_id}
+            if caption:
+                data.update({"caption": caption, "parse_mode": "HTML"})
+            self._enqueue({"method": "sendPhoto", "data": data, "photo": photos[0]})
+        elif photos:
+            self._enqueue({"method": "sendMediaGroup", "data": {"chat_id": self.chat_id}, "photos": photos, "caption": caption})
+
+    def _enqueue(self, item: Dict):
+        item["id"] = f"{time.time_ns():020d}-{next(self._seq):06d}"
+        item["queued_at"] = time.time()
+        if self.spool_dir:
+            try:
+                self._write_spool(item)
+            except Exception as e:
+                logging.warning(f"Could not spool Telegram item: {e}")
+        self._queue.put(item)
+
+    # ---------- spool ----------
+
+    def _spool_path(self, item_id: str) -> str:
+        return os.path.join(self.spool_dir, f"{item_id}.json")
+
+    def _write_spool(self, item: Dict):
+        data = dict(item)
+        if "photo" in data:
+            data["photo"] = base64.b64encode(data["photo"]).decode("ascii")
+        if "photos" in data:
+            data["photos"] = [base64.b64encode(p).decode("ascii") for p in data["photos"]]
+        tmp_path = self._spool_path(item["id"]) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self._spool_path(item["id"]))
+
+    def _load_spool(self):
+        pending = sorted(name for name in os.listdir(self.spool_dir) if name.endswith(".json"))
+        for name in pending:
+            try:
+                with open(os.path.join(self.spool_dir, name), "r", encoding="utf-8") as f:
+                    item = json.load(f)
+                if "photo" in item:
+                    item["photo"] = base64.b64decode(item["photo"])
+                if "photos" in item:
+                    item["photos"] = [base64.b64decode(p) for p in item["photos"]]
+                self._queue.put(item)
+            except Exception as e:
+                logging.warning(f"Dropping unreadable Telegram spool file {name}: {e}")
+                self._remove_spool(name[:-len(".json")])
+        if pending:
+            logging.info(f"Telegram spool: {len(pending)} unsent items queued from previous run")
+
+    def _remove_spool(self, item_id: str):
+        if not self.spool_dir:
+            return
+        try:
+            os.remove(self._spool_path(item_id))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(f"Could not remove spool file {item_id}: {e}")
+
+    # ---------- worker ----------
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._deliver(item)
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, item: Dict):
+        for attempt in range(self.max_retries):
+            started = time.perf_counter()
+            status, retry_after = self._post(item)
+            if status == "ok":
+                self.latencies.append(time.perf_counter() - started)
+                self.sent += 1
+                self._remove_spool(item["id"])
+                if self.sent % self.stats_every == 0:
+                    logging.info(self.describe())
+                return
+            if status == "permanent":
+                self.failed += 1
+                self._remove_spool(item["id"])
+                return
+            delay = retry_after if retry_after is not None else min(self.backoff_max, self.backoff_base * 2 ** attempt)
+            delay += random.uniform(0, 0.1 * delay)
+            if self._stop.wait(delay):
+                return  # closing: item stays in the spool
+        self.failed += 1
+        logging.error(f"Telegram {item['method']} failed after {self.max_retries} attempts - kept in spool for next start")
+
+    def _post(self, item: Dict):
+        """Returns (status, retry_after) with status in ok / retry / permanent"""
+        url = f"{self.api_base}/bot{self.bot_token}/{item['method']}"
+        data = dict(item["data"])
+        files = None
+        if item["method"] == "sendPhoto":
+            files = {"photo": ("chart.png", item["photo"])}
+        elif item["method"] == "sendMediaGroup":
+            media = []
+            files = {}
+            for i, photo in enumerate(item["photos"]):
+                entry = {"type": "photo", "media": f"attach://photo{i}"}
+                if i == 0 and item.get("caption"):
+                    entry.update({"caption": item["caption"], "parse_mode": "HTML"})
+                media.append(entry)
+                files[f"photo{i}"] = (f"chart{i}.png", photo)
+            data["media"] = json.dumps(media)
+        try:
+            resp = self.session.post(url, data=data, files=files, timeout=self.timeout)
+        except requests.exceptions.Timeout:
+            logging.warning(f"Telegram {item['method']} timeout - will retry")
+            return "retry", None
+        except Exception as e:
+            logging.warning(f"Telegram unavailable ({str(e)[:50]}) - will retry")
+            return "retry", None
+
+        if resp.status_code == 200:
+            return "ok", None
+        if resp.status_code == 429:
+            retry_after = None
+            try:
+                retry_after = float(resp.json().get("parameters", {}).get("retry_after"))
+            except Exception:
+                try:
+                    retry_after = float(resp.headers.get("Retry-After"))
+                except (TypeError, ValueError):
+                    retry_after = None
+            logging.warning(f"Telegram rate limit, retry after {retry_after}s")
+            return "retry", retry_after
+        if resp.status_code >= 500:
+            logging.warning(f"Telegram API error: {resp.status_code} - will retry")
+            return "retry", None
+        logging.error(f"Telegram API rejected {item['method']}: {resp.status_code} {resp.text[:200]}")
+        return "permanent", None
+
+    # ---------- reporting / lifecycle ----------
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict:
+        latencies = list(self.latencies)
+        return {
+            "queue_depth": self.queue_depth(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "avg_latency_s": sum(latencies) / len(latencies) if latencies else 0.0,
+            "max_latency_s": max(latencies) if latencies else 0.0,
+        }
+
+    def describe(self) -> str:
+        s = self.stats()
+        return (f"Telegram notifier: queue={s['queue_depth']}, sent={s['sent']}, failed={s['failed']}, "
+                f"avg latency={s['avg_latency_s']:.2f}s, max={s['max_latency_s']:.2f}s")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far was handled; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def close(self, timeout: Optional[float] = 30):
+        self.flush(timeout)
+        self._stop.set()
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self.session.close()
+
+
+def _read_bytes(img) -> bytes:
+    if isinstance(img, (bytes, bytearray)):
+        return bytes(img)
+    if hasattr(img, "seek"):
+        img.seek(0)
+    return img.read()
+
+
+def _plain_line(line: str, limit: int) -> str:
+    """A single line over the limit: tags dropped, text re-escaped and trimmed, so no tag or entity is cut"""
+    pieces, size = [], 0
+    for char in html.unescape(HTML_TAG_RE.sub("", line)):
+        piece = html.escape(char, quote=False)
+        if size + len(piece) > limit:
+            break
+        pieces.append(piece)
+        size += len(piece)
+    return "".join(pieces)
+
+
+def _pack(parts: Iterable[str], limit: int, separator: str) -> List[str]:
+    messages = []
+    current = None
+    for part in parts:
+        candidate = part if current is None else f"{current}{separator}{part}"
+        if current is not None and len(candidate) > limit:
+            messages.append(current)
+            current = part
+        else:
+            current = candidate
+    if current:
+        messages.append(current)
+    return messages
+
+
+def split_message(blocks: List[str], limit: int = TELEGRAM_MESSAGE_LIMIT, separator: str = "\n\n") -> List[str]:
+    """
+    Pack text blocks into as few messages as fit under Telegram's length limit.
+    Blocks are HTML (parse_mode="HTML"): an oversized block is split at line
+    boundaries, never inside a tag, since Telegram rejects a message with an unclosed tag.
+    """
+    parts = []
+    for block in blocks:
+        if len(block) <= limit:
+            parts.append(block)
+        else:
+            lines = [line if len(line) <= limit else _plain_line(line, limit) for line in block.split("\n")]
+            parts.extend(_pack(lines, limit, "\n"))
+    return _pack(parts, limit, separator)
+
+
+class AlertDigest:
+    """Coalesces per-job alerts into one message (plus one chart album) per window or batch"""
+
+    def __init__(self, notifier: TelegramNotifier, window_s: float = 300, max_jobs: int = 10,
+                 header_fn: Optional[Callable[[int], str]] = None,
+                 images_fn: Optional[Callable[[], List]] = None):
+        """
+        :param window_s: send once the oldest pending job waited this long
+        :param max_jobs: send as soon as this many jobs are pending
+        :param header_fn: count -> header text (e.g. cycle statistics)
+        :param images_fn: returns the current chart images for the album
+        """
+        self.notifier = notifier
+        self.window_s = window_s
+        self.max_jobs = max_jobs
+        self.header_fn = header_fn
+        self.images_fn = images_fn
+        self._entries: List[str] = []
+        self._first_at = None
+        self._lock = threading.Lock()
+        self.digests_sent = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, entry: str):
+        with self._lock:
+            if not self._entries:
+                self._first_at = time.monotonic()
+            self._entries.append(entry)
+            full = len(self._entries) >= self.max_jobs
+        if full:
+            self.flush()
+
+    def due(self) -> bool:
+        return bool(self._entries) and time.monotonic() - self._first_at >= self.window_s
+
+    def maybe_flush(self) -> bool:
+        return self.flush() if self.due() else False
+
+    def flush(self, footer: Optional[str] = None) -> bool:
+        """Send pending jobs (and an optional footer such as the cycle summary)"""
+        with self._lock:
+            entries, self._entries = self._entries, []
+            self._first_at = None
+        if not entries and not footer:
+            return False
+        blocks = []
+        if entries and self.header_fn:
+            blocks.append(self.header_fn(len(entries)))
+        blocks.extend(entries)
+        if footer:
+            blocks.append(footer)
+        for text in split_message(blocks, separator="\n\n———\n\n"):
+            self.notifier.send_message(text)
+        if entries and self.images_fn:
+            try:
+                self.notifier.send_media_group(self.images_fn())
+            except Exception as e:
+                logging.warning(f"Could not attach charts to digest: {e}")
+        self.digests_sent += 1
+        return True
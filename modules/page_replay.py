@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Page Replay Module - record LinkedIn result pages and replay them offline
+Record mode stores each results page's harvested card metadata, every opened
+job's description HTML and, with network capture on, LinkedIn's
+JSON job payloads under a fixtures directory.
+ReplayDriver serves those fixtures through the small WebDriver surface
+parse_current_page uses, so scrolling, card capture, clicks, filters and
+logging run without a browser at full speed (see replay_benchmark.py).
+"""
+
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+from modules.job_cards import CARD_EXTRACTION_JS, JOB_CARD_SELECTOR, LOCATE_CARD_JS, card_key
+from modules.job_payloads import FixturePayloadCapture
+from modules.scroll_loader import COUNT_CARDS_JS, WAIT_FOR_CARDS_JS
+
+DESCRIPTION_CLASS = "jobs-box__html-content"
+
+_SAFE_NAME_RE = re.compile(r"[^\w.-]")
+
+
+def _fixture_name(card: Dict) -> str:
+    return _SAFE_NAME_RE.sub("_", card_key(card))[:80]
+
+
+# ================================
+# Record mode
+# ================================
+
+class FixturePage:
+    """One recorded results page; descriptions are added as jobs are opened"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.join(path, "jobs"), exist_ok=True)
+
+    def record_description(self, card: Dict, html: Optional[str]):
+        if not html:
+            return
+        try:
+            with open(os.path.join(self.path, "jobs", _fixture_name(card) + ".html"), "w", encoding="utf-8") as f:
+                f.write(html)
+        except Exception as e:
+            logging.warning(f"Could not record description fixture: {e}")
+
+    def record_payload(self, url: str, body: str):
+        """Raw JSON response seen by the network capture (one NDJSON line)"""
+        try:
+            with open(os.path.join(self.path, "payloads.ndjson"), "a", encoding="utf-8") as f:
+                f.write(json.dumps({"url": url, "body": body}, ensure_ascii=False) + "\n")
+        except Exception as e:
+            logging.warning(f"Could not record payload fixture: {e}")
+
+
+class FixtureRecorder:
+    """Writes <root>/<page id>/{cards.json, jobs/<job id>.html, payloads.ndjson}"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def start_page(self, cards: List[Dict], meta: Optional[Dict] = None) -> Optional[FixturePage]:
+        """Replay serves cards from their harvested metadata, so the list HTML is not stored"""
+        with self._lock:
+            page_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{next(self._seq):04d}"
+        page = FixturePage(os.path.join(self.root, page_id))
+        try:
+            with open(os.path.join(page.path, "cards.json"), "w", encoding="utf-8") as f:
+                json.dump({"meta": meta or {}, "cards": cards}, f, ensure_ascii=False, indent=1)
+        except Exception as e:
+            logging.warning(f"Could not record page fixture {page_id}: {e}")
+            return None
+        logging.info(f"Recorded page fixture {page.path} ({len(cards)} cards)")
+        return page
+
+
+# ================================
+# Replay mode
+# ================================
+
+def load_fixture_pages(root: str) -> List[Dict]:
+    """Every recorded page under root, oldest first: {path, meta, cards, descriptions, payloads}"""
+    pages = []
+    for name in sorted(os.listdir(root)):
+        cards_path = os.path.join(root, name, "cards.json")
+        if not os.path.isfile(cards_path):
+            continue
+        with open(cards_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        descriptions = {}
+        jobs_dir = os.path.join(root, name, "jobs")
+        if os.path.isdir(jobs_dir):
+            for job_file in os.listdir(jobs_dir):
+                if job_file.endswith(".html"):
+                    with open(os.path.join(jobs_dir, job_file), "r", encoding="utf-8") as f:
+                        descriptions[job_file[:-len(".html")]] = f.read()
+        payloads = []
+        payloads_path = os.path.join(root, name, "payloads.ndjson")
+        if os.path.isfile(payloads_path):
+            with open(payloads_path, "r", encoding="utf-8") as f:
+                payloads = [json.loads(line) for line in f if line.strip()]
+        pages.append({"path": os.path.join(root, name), "meta": data.get("meta", {}),
+                      "cards": data.get("cards", []), "descriptions": descriptions, "payloads": payloads})
+    return pages
+
+
+class _TextExtractor(HTMLParser):
+    BLOCK_TAGS = {"p", "div", "li", "br", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "section"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Approximation of innerText for recorded description HTML"""
+    parser = _TextExtractor()
+    parser.feed(html or "")
+    text = "".join(parser.parts)
+    return re.sub(r"\n\s*\n+", "\n\n", text).strip()
+
+
+class ReplayCard(WebElement):
+    """Card element whose id is the fixture name, so a W3C click tells the driver which job opened"""
+
+
+class ReplayElement:
+    """Any other element (list container, body, description pane)"""
+
+    def __init__(self, driver, role: str):
+        self._driver = driver
+        self.role = role
+
+    def get_attribute(self, name):
+        if self.role == "description" and name in ("innerText", "textContent"):
+            return self._driver.description_text()
+        if self.role == "description" and name == "innerHTML":
+            return self._driver.description_html()
+        return None
+
+    def send_keys(self, *keys):
+        pass
+
+
+class ReplayDriver:
+    """
+    WebDriver stand-in serving one recorded page; call counts and time are kept per call kind.
+    Recorded JSON payloads are served through job_payload_capture like a live network capture.
+    """
+
+    def __init__(self, page: Dict):
+        self.page = page
+        self.current_url = page.get("meta", {}).get("url") or "https://www.linkedin.com/jobs/search/"
+        self.current_card: Optional[str] = None
+        self.calls = defaultdict(int)
+        self.call_seconds = defaultdict(float)
+        self._text_cache: Dict[str, str] = {}
+        if page.get("payloads"):
+            self.job_payload_capture = FixturePayloadCapture(page["payloads"])
+
+    def _track(self, kind: str, started: float):
+        self.calls[kind] += 1
+        self.call_seconds[kind] += time.perf_counter() - started
+
+    # ---------- scripts ----------
+
+    def execute_script(self, script, *args):
+        started = time.perf_counter()
+        try:
+            if script == CARD_EXTRACTION_JS:
+                return [dict(card) for card in self.page["cards"]]
+            if script == COUNT_CARDS_JS:
+                return len(self.page["cards"])
+            if script == LOCATE_CARD_JS:
+                card = {"job_id": args[0], "url": args[1]}
+                return ReplayCard(self, _fixture_name(card))
+            if "document.readyState" in script:
+                return ["complete", self.current_url]
+            return None  # scroll strategies and other page effects
+        finally:
+            self._track("execute_script", started)
+
+    def execute_async_script(self, script, *args):
+        if script == WAIT_FOR_CARDS_JS:
+            return len(self.page["cards"])
+        return None
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    # ---------- element lookup ----------
+
+    def find_element(self, by=None, value=None):
+        started = time.perf_counter()
+        try:
+            if value == DESCRIPTION_CLASS:
+                if self.current_card is None:
+                    raise NoSuchElementException("no job opened")
+                return ReplayElement(self, "description")
+            return ReplayElement(self, "container")
+        finally:
+            self._track("find_element", started)
+
+    def find_elements(self, by=None, value=None):
+        if value == JOB_CARD_SELECTOR:
+            return [ReplayCard(self, _fixture_name(card)) for card in self.page["cards"]]
+        return []
+
+    # ---------- actions / navigation ----------
+
+    def execute(self, command, params=None):
+        """Only W3C actions reach here (ActionChains.perform): remember the clicked card"""
+        started = time.perf_counter()
+        if command == Command.W3C_ACTIONS:
+            for device in (params or {}).get("actions", []):
+                for action in device.get("actions", []):
+                    origin = action.get("origin")
+                    if isinstance(origin, dict):
+                        self.current_card = next(iter(origin.values()))
+            self._track("click", started)
+        return {"value": None}
+
+    def get(self, url):
+        self.current_url = url
+
+    def quit(self):
+        pass
+
+    # ---------- description ----------
+
+    def description_html(self) -> str:
+        return self.page["descriptions"].get(self.current_card, "")
+
+    def description_text(self) -> str:
+        self.calls["description"] += 1
+        if self.current_card not in self._text_cache:
+            self._text_cache[self.current_card] = html_to_text(self.description_html())
+        return self._text_cache[self.current_card]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Recency Module - posting-date normalization and the incremental crawl watermark
+parse_relative_date turns LinkedIn's "3 days ago" / "Reposted 1 week ago" into
+a real date relative to now. RecencyWatermark remembers, per keyword/country,
+when the last complete cycle started, the newest posting time and the job IDs
+already listed, so later cycles can ask LinkedIn only for recent postings and
+stop paginating at the first page made entirely of known jobs.
+"""
+
+import datetime
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from modules.crawl_checkpoint import search_key
+
+RELATIVE_DATE_RE = re.compile(r"(\d+)\+?\s*(minute|min|hour|hr|day|week|month|year)s?\b")
+
+UNIT_DELTAS = {
+    "minute": datetime.timedelta(minutes=1),
+    "min": datetime.timedelta(minutes=1),
+    "hour": datetime.timedelta(hours=1),
+    "hr": datetime.timedelta(hours=1),
+    "day": datetime.timedelta(days=1),
+    "week": datetime.timedelta(weeks=1),
+    "month": datetime.timedelta(days=30),  # Приблизительно 30 дней в месяце
+    "year": datetime.timedelta(days=365),
+}
+
+
+def parse_posted_at(text: str, now: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
+    """Posting time from a card's relative date text, or None if it has none"""
+    if not text:
+        return None
+    if now is None:
+        now = datetime.datetime.now()
+    text = text.lower().strip()
+    if "just now" in text or "today" in text or "moments ago" in text:
+        return now
+    if "yesterday" in text:
+        return now - datetime.timedelta(days=1)
+    m = RELATIVE_DATE_RE.search(text)
+    if m:
+        return now - int(m.group(1)) * UNIT_DELTAS[m.group(2)]
+    # Если просто "viewed" или что-то нестандартное
+    return None
+
+
+def parse_relative_date(text: str, now: Optional[datetime.datetime] = None) -> str:
+    """'N days ago' etc. -> YYYY-MM-DD relative to now ('' when the text has no date)"""
+    posted_at = parse_posted_at(text, now)
+    return posted_at.date().isoformat() if posted_at else ""
+
+
+class RecencyWatermark:
+    """Per-search watermark persisted as JSON: cycle start times, newest posting, known job IDs"""
+
+    def __init__(self, path: Optional[str], slack_s: float = 3600, min_window_s: float = 3600,
+                 max_known_ids: int = 5000):
+        """
+        :param path: JSON file location (None keeps the watermark in memory only)
+        :param slack_s: extra look-back added to the time-posted window (posting times are coarse)
+        :param min_window_s: smallest time-posted window requested from LinkedIn
+        :param max_known_ids: job IDs remembered per search (oldest dropped first)
+        """
+        self.path = path
+        self.slack_s = slack_s
+        self.min_window_s = min_window_s
+        self.max_known_ids = max_known_ids
+        self._searches: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._searches = json.load(f).get("searches", {})
+        except Exception as e:
+            logging.warning(f"Could not read recency watermark {self.path}: {e} - full crawl this cycle")
+            self._searches = {}
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {"searches": {key: dict(entry, known_ids=dict(entry.get("known_ids", {})))
+                                 for key, entry in self._searches.items()}}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.warning(f"Could not save recency watermark {self.path}: {e}")
+
+    def _entry(self, keyword: str, country: str) -> Dict:
+        return self._searches.setdefault(search_key(keyword, country), {"known_ids": {}})
+
+    def _window_s(self, entry: Dict, now: float) -> Optional[int]:
+        since = entry.get("last_complete_started_at")
+        if not since:
+            return None
+        return int(max(self.min_window_s, now - since + self.slack_s))
+
+    def begin_cycle(self, keyword: str, country: str):
+        """
+        Mark the start of a crawl cycle and fix its time-posted window, so every
+        page of the cycle requests the same result set (no-op while one is
+        already in progress, e.g. after a resume)
+        """
+        with self._lock:
+            entry = self._entry(keyword, country)
+            if not entry.get("cycle_started_at"):
+                entry["cycle_started_at"] = time.time()
+            if "cycle_window_s" not in entry:
+                entry["cycle_window_s"] = self._window_s(entry, entry["cycle_started_at"])
+
+    def complete_cycle(self, keyword: str, country: str):
+        """Pagination finished: the next cycle only needs postings newer than this cycle's start"""
+        with self._lock:
+            entry = self._entry(keyword, country)
+            entry["last_complete_started_at"] = entry.pop("cycle_started_at", None) or time.time()
+            entry.pop("cycle_window_s", None)
+        self.save()
+
+    def posted_within_s(self, keyword: str, country: str) -> Optional[int]:
+        """
+        LinkedIn time-posted window (seconds) covering everything since the last
+        complete cycle: the value fixed by begin_cycle, computed from now outside a cycle
+        """
+        entry = self._searches.get(search_key(keyword, country), {})
+        if "cycle_window_s" in entry:
+            return entry["cycle_window_s"]
+        return self._window_s(entry, time.time())
+
+    def is_known(self, keyword: str, country: str, job_id: Optional[str]) -> bool:
+        """Job listed in an earlier cycle (IDs first seen in the running cycle do not count)"""
+        if not job_id:
+            return False
+        entry = self._searches.get(search_key(keyword, country), {})
+        first_seen = entry.get("known_ids", {}).get(job_id)
+        return first_seen is not None and first_seen < entry.get("cycle_started_at", time.time())
+
+    def observe(self, keyword: str, country: str, cards: Iterable[Dict], now: Optional[datetime.datetime] = None) -> int:
+        """Record a page's cards; returns how many were already known from earlier cycles"""
+        known = 0
+        with self._lock:
+            entry = self._entry(keyword, country)
+            known_ids = entry.setdefault("known_ids", {})
+            cycle_started_at = entry.get("cycle_started_at", time.time())
+            stamp = time.time()
+            for card in cards:
+                job_id = card.get("job_id")
+                if job_id:
+                    if job_id in known_ids and known_ids[job_id] < cycle_started_at:
+                        known += 1
+                    known_ids.setdefault(job_id, stamp)
+                posted_at = parse_posted_at(card.get("date_text", ""), now)
+                if posted_at and posted_at.timestamp() > entry.get("newest_posted_at", 0):
+                    entry["newest_posted_at"] = posted_at.timestamp()
+            if len(known_ids) > self.max_known_ids:
+                for job_id in sorted(known_ids, key=known_ids.get)[:len(known_ids) - self.max_known_ids]:
+                    del known_ids[job_id]
+        return known
+
+    def describe(self, keyword: str, country: str) -> str:
+        entry = self._searches.get(search_key(keyword, country), {})
+        newest = entry.get("newest_posted_at")
+        newest_text = datetime.datetime.fromtimestamp(newest).strftime("%Y-%m-%d %H:%M") if newest else "n/a"
+        return f"{len(entry.get('known_ids', {}))} known jobs, newest posting {newest_text}"
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Results Journal Module - append-only NDJSON log of scraper results
+Each new result costs one line append; the Excel workbook is rebuilt from the
+journal only at cycle end or on an interval, with openpyxl's write-only
+(streaming) workbook so memory stays constant however long the run gets.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Summary cells in row 1, right after the last header; read back by get_excel_summary()
+SUMMARY_LABEL = "Checked companies:"
+
+
+def read_summary(sheet) -> Optional[tuple]:
+    """(label, count) from row 1 of a results sheet, None when it has no summary"""
+    row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    for index, value in enumerate(row):
+        if value == SUMMARY_LABEL:
+            return value, row[index + 1] if index + 1 < len(row) else None
+    return None
+
+
+def journal_path_for(output_file: str) -> str:
+    """companies.xlsx -> companies.journal.ndjson"""
+    return os.path.splitext(output_file)[0] + ".journal.ndjson"
+
+
+class ResultsJournal:
+    """Append-only NDJSON results store with periodic Excel materialization"""
+
+    def __init__(self, path: str, reset: bool = False):
+        """
+        :param path: NDJSON file location
+        :param reset: start a fresh journal (a new scraper run)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.count = 0
+        self.last_rebuild = time.monotonic()
+        self._rebuilt_count = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if reset or not os.path.exists(path):
+            open(path, "w", encoding="utf-8").close()
+        else:
+            self.count = sum(1 for _ in self.iter_rows())
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def append(self, row: Dict):
+        """One write per result"""
+        line = json.dumps(row, ensure_ascii=False, default=str)
+        with self._lock:
+            self._handle.write(line + "\n")
+            self._handle.flush()
+            self.count += 1
+
+    def iter_rows(self):
+        """Stream rows back from disk without holding them all in memory"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A half-written last line after a crash
+                    logging.warning(f"Skipping unreadable journal line in {self.path}")
+
+    def columns(self) -> List[str]:
+        """Union of keys in first-seen order (same as pd.DataFrame(list_of_dicts))"""
+        columns = {}
+        for row in self.iter_rows():
+            for key in row:
+                columns.setdefault(key, None)
+        return list(columns)
+
+    def rebuild_excel(self, output_file: str) -> bool:
+        """Materialize the journal into output_file with a streaming writer"""
+        from openpyxl import Workbook
+
+        with self._lock:
+            self._handle.flush()
+            processed = self.count
+        try:
+            columns = self.columns()
+            wb = Workbook(write_only=True)
+            sheet = wb.create_sheet("Results")
+
+            # Summary after the last column, so it never overwrites a header
+            sheet.append(list(columns) + [SUMMARY_LABEL, processed])
+
+            for row in self.iter_rows():
+                sheet.append([row.get(col) for col in columns])
+
+            tmp_path = output_file + ".tmp.xlsx"
+            wb.save(tmp_path)
+            os.replace(tmp_path, output_file)
+            self.last_rebuild = time.monotonic()
+            self._rebuilt_count = processed
+            logging.info(f"Результаты сохранены в файл: {output_file} ({processed} rows from journal)")
+            return True
+        except Exception as e:
+            logging.error(f"Ошибка при сохранении результатов в Excel: {e}")
+            return False
+
+    def maybe_rebuild(self, output_file: str, interval_s: Optional[float]) -> bool:
+        """Rebuild only if new rows exist and the interval has elapsed"""
+        if not interval_s or self.count == self._rebuilt_count:
+            return False
+        if time.monotonic() - self.last_rebuild < interval_s:
+            return False
+        return self.rebuild_excel(output_file)
+
+    def close(self):
+        with self._lock:
+            if not self._handle.closed:
+                self._handle.close()
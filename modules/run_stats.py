@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Run Statistics Module - incremental aggregates and cached charts for Telegram alerts
+Keeps running counters as results are added (ring buffer of inter-job times with
+Welford mean/variance, per-criterion counts) and renders the p-chart / bar chart
+with object-oriented matplotlib Figures, caching the PNG bytes until the
+aggregates change enough to matter.
+"""
+
+import io
+import logging
+import math
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+CRITERIA = ["Visa Sponsorship or Relocation", "Anaplan", "SAP APO", "Planning", "No Relocation Support", "Remote", "Remote Prohibited"]
+
+
+class RunningStats:
+    """O(1)-per-result aggregates over the results stream"""
+
+    def __init__(self, window: int = 50, criteria: Optional[List[str]] = None):
+        self.criteria = list(criteria or CRITERIA)
+        self.counts: Dict[str, int] = {crit: 0 for crit in self.criteria}
+        self.recent = deque(maxlen=window)  # (listing index, time diff)
+        self.total = 0
+        self.version = 0
+        self._last_elapsed = None
+        # Welford over all inter-job times
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def add(self, row: Dict):
+        with self._lock:
+            for crit in self.criteria:
+                if row.get(crit) is True:
+                    self.counts[crit] += 1
+            elapsed = row.get("Elapsed Time (s)")
+            if elapsed is not None:
+                elapsed = float(elapsed)
+                if self._last_elapsed is not None:
+                    diff = elapsed - self._last_elapsed
+                    self.recent.append((self.total, diff))
+                    self.n += 1
+                    delta = diff - self.mean
+                    self.mean += delta / self.n
+                    self._m2 += delta * (diff - self.mean)
+                self._last_elapsed = elapsed
+            self.total += 1
+            self.version += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.recent), dict(self.counts), self.n
+
+
+def _figure_png(fig) -> bytes:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    FigureCanvasAgg(fig)
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    return buf.getvalue()
+
+
+def render_p_chart(recent) -> Optional[bytes]:
+    """P-chart of the last inter-job time differences"""
+    if not recent:
+        return None
+    from matplotlib.figure import Figure
+
+    xs = [idx for idx, _ in recent]
+    ys = [diff for _, diff in recent]
+    avg_time_diff = sum(ys) / len(ys)
+    fig = Figure(figsize=(10, 5))
+    ax = fig.add_subplot(111)
+    ax.plot(xs, ys, marker='o', linestyle='-', color='b', label='Time Difference (s)')
+    ax.axhline(y=avg_time_diff, color='r', linestyle='--', label=f'Avg Diff ({avg_time_diff:.2f}s)')
+    ax.fill_between(xs, avg_time_diff, ys, where=[y > avg_time_diff for y in ys], color='red', alpha=0.1)
+    ax.fill_between(xs, avg_time_diff, ys, where=[y < avg_time_diff for y in ys], color='green', alpha=0.1)
+    ax.set_xlabel('Listing Index')
+    ax.set_ylabel('Time Diff (s)')
+    ax.set_title(f'P-Chart: Time Difference (Last {len(ys)})')
+    ax.legend()
+    ax.grid(True)
+    return _figure_png(fig)
+
+
+def render_bar_chart(counts: Dict[str, int]) -> Optional[bytes]:
+    """Distribution of matched criteria"""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot(111)
+    ax.bar(list(counts.keys()), list(counts.values()), color='skyblue')
+    ax.set_xlabel('Criteria')
+    ax.set_ylabel('Count')
+    ax.set_title('Distribution of Criteria in Processed Jobs')
+    fontsize = max(6, 14 - len(counts))
+    ax.tick_params(axis='x', labelrotation=45, labelsize=fontsize)
+    fig.tight_layout()
+    return _figure_png(fig)
+
+
+class ChartCache:
+    """Re-renders charts only when the aggregates moved enough to be visible"""
+
+    def __init__(self, stats: RunningStats, refresh_every: int = 5, min_relative_change: float = 0.1,
+                 outlier_sigmas: float = 2.0):
+        """
+        :param refresh_every: new time points before the p-chart is redrawn
+        :param min_relative_change: relative change of any criterion count that redraws the bar chart
+        :param outlier_sigmas: a latest time diff this far from the running mean forces a p-chart redraw
+        """
+        self.stats = stats
+        self.refresh_every = refresh_every
+        self.min_relative_change = min_relative_change
+        self.outlier_sigmas = outlier_sigmas
+        self._p_png = None
+        self._p_n = 0
+        self._bar_png = None
+        self._bar_counts = None
+        self.renders = 0
+        self._lock = threading.Lock()  # parallel workers may ask for images at the same time
+
+    def _p_chart_stale(self, recent, n) -> bool:
+        if self._p_png is None:
+            return True
+        if n - self._p_n >= self.refresh_every:
+            return True
+        if n > self._p_n and self.stats.stdev > 0:
+            latest = recent[-1][1]
+            return abs(latest - self.stats.mean) > self.outlier_sigmas * self.stats.stdev
+        return False
+
+    def _bar_chart_stale(self, counts) -> bool:
+        if self._bar_png is None:
+            return True
+        for crit, value in counts.items():
+            old = self._bar_counts.get(crit, 0)
+            if old == 0 and value > 0:
+                return True
+            if old and abs(value - old) / old >= self.min_relative_change:
+                return True
+        return False
+
+    def p_chart(self) -> Optional[io.BytesIO]:
+        with self._lock:
+            return self._p_chart()
+
+    def _p_chart(self) -> Optional[io.BytesIO]:
+        recent, _, n = self.stats.snapshot()
+        if not recent:
+            return None
+        if self._p_chart_stale(recent, n):
+            try:
+                self._p_png = render_p_chart(recent)
+                self._p_n = n
+                self.renders += 1
+            except Exception as e:
+                logging.error(f"Ошибка при построении p-chart: {e}")
+                return None
+        return io.BytesIO(self._p_png) if self._p_png else None
+
+    def bar_chart(self) -> Optional[io.BytesIO]:
+        with self._lock:
+            return self._bar_chart()
+
+    def _bar_chart(self) -> Optional[io.BytesIO]:
+        if not self.stats.total:
+            return None
+        _, counts, _ = self.stats.snapshot()
+        if self._bar_chart_stale(counts):
+            try:
+                self._bar_png = render_bar_chart(counts)
+                self._bar_counts = counts
+                self.renders += 1
+            except Exception as e:
+                logging.error(f"Ошибка при построении бар-чарта: {e}")
+                return None
+        return io.BytesIO(self._bar_png) if self._bar_png else None
+
+    def images(self) -> List[io.BytesIO]:
+        """Fresh file objects for send_telegram_message (each upload consumes one)"""
+        return [img for img in (self.p_chart(), self.bar_chart()) if img]
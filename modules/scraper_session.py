@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Scraper Session Module - run-wide state shared by every scraper thread
+Holds what used to be module-level globals in the parser (results, cycle
+counters, the all-time matched set) behind one lock, so several browser
+workers can update the same statistics safely.
+"""
+
+import logging
+import threading
+from typing import Dict, List
+
+from modules.job_records import ColumnarResults
+
+
+class ScraperSession:
+    """Thread-safe results list and cycle statistics for one scraper run"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.results = ColumnarResults()  # typed columns instead of one dict per result
+        self.total_vacancies_checked = 0
+
+        # Cycle tracking
+        self.cycle_number = 1
+        self.cycle_parsed_jobs = 0
+        self.cycle_new_matches = 0
+        self.cycle_matched_jobs = []  # List of {company, position} dicts for current cycle
+        self.cycle_new_jobs_only = []  # Truly new jobs (not seen in previous cycles)
+        self.cycle_skipped_seen = 0  # Cards skipped before click because the job ID was already analyzed
+        self.cycle_prefiltered = 0  # Cards rejected from their metadata alone, never clicked
+        self.cycle_analysis_hits = 0  # Descriptions whose analysis came from the analysis cache
+        self.cycle_analysis_misses = 0
+        self.total_matches_all_time = 0
+        self.unique_jobs_discovered = 0  # Unique jobs discovered across all cycles
+        self.all_time_matched_jobs = set()  # All jobs ever matched across all cycles
+
+    # ---------- updates ----------
+
+    def add_result(self, row: Dict):
+        with self.lock:
+            self.results.append(row)
+
+    def add_checked(self, count: int):
+        with self.lock:
+            self.total_vacancies_checked += count
+
+    def add_parsed(self):
+        with self.lock:
+            self.cycle_parsed_jobs += 1
+
+    def _count_match(self, job_entry: Dict):
+        self.cycle_new_matches += 1
+        self.total_matches_all_time += 1
+        # Add to matched jobs list if not already there (avoid duplicates within cycle)
+        if job_entry not in self.cycle_matched_jobs:
+            self.cycle_matched_jobs.append(job_entry)
+
+    def record_match(self, company: str, title: str) -> bool:
+        """Count a job that passed the filters; True if it was never matched before"""
+        job_entry = {"company": company, "position": title}
+        job_key = f"{company.lower().strip()}|{title.lower().strip()}"  # Normalized unique identifier
+        with self.lock:
+            self._count_match(job_entry)
+            if job_key in self.all_time_matched_jobs:
+                return False
+            self.all_time_matched_jobs.add(job_key)
+            self.cycle_new_jobs_only.append(job_entry)
+            self.unique_jobs_discovered += 1
+            return True
+
+    def record_seen_skip(self, matched: bool, company: str, title: str):
+        """A card skipped via the seen-job index; earlier matches still count as duplicates"""
+        with self.lock:
+            self.cycle_skipped_seen += 1
+            if matched:
+                self._count_match({"company": company, "position": title})
+
+    def record_prefilter(self):
+        with self.lock:
+            self.cycle_prefiltered += 1
+
+    def record_analysis(self, cache_hit: bool):
+        with self.lock:
+            if cache_hit:
+                self.cycle_analysis_hits += 1
+            else:
+                self.cycle_analysis_misses += 1
+
+    # ---------- reporting ----------
+
+    def validate(self) -> bool:
+        """Validate that cycle tracking variables are consistent"""
+        with self.lock:
+            # Validate that unique jobs counter matches the set size
+            if self.unique_jobs_discovered != len(self.all_time_matched_jobs):
+                logging.error(f"State inconsistency: unique_jobs_discovered={self.unique_jobs_discovered}, but set size={len(self.all_time_matched_jobs)}")
+                return False
+
+            # Validate that unique jobs count doesn't exceed total matches
+            if self.unique_jobs_discovered > self.total_matches_all_time:
+                logging.error(f"State inconsistency: unique_jobs_discovered={self.unique_jobs_discovered} > total_matches_all_time={self.total_matches_all_time}")
+                return False
+
+            # Validate cycle consistency
+            duplicates_this_cycle = self.cycle_new_matches - len(self.cycle_new_jobs_only)
+            if duplicates_this_cycle < 0:
+                logging.error(f"Cycle inconsistency: cycle_new_matches={self.cycle_new_matches} < cycle_new_jobs_only={len(self.cycle_new_jobs_only)}")
+                return False
+
+            return True
+
+    def statistics_lines(self) -> List[str]:
+        """Statistics block shared by the cycle summary and digest headers"""
+        with self.lock:
+            duplicates_this_cycle = self.cycle_new_matches - len(self.cycle_new_jobs_only)
+            lines = [
+                "📊 Statistics:",
+                f"• Jobs scanned: {self.cycle_parsed_jobs}",
+                f"• Skipped (already analyzed): {self.cycle_skipped_seen}",
+                f"• Matches found this cycle: {self.cycle_new_matches} ({len(self.cycle_new_jobs_only)} new, {duplicates_this_cycle} duplicates)",
+                f"• Unique jobs discovered to date: {self.unique_jobs_discovered}",
+                f"• Total match occurrences: {self.total_matches_all_time}",
+            ]
+            if self.cycle_prefiltered:
+                lines.append(f"• Skipped by card pre-filter: {self.cycle_prefiltered}")
+            if self.cycle_analysis_hits or self.cycle_analysis_misses:
+                lines.append(f"• Analysis cache: {self.cycle_analysis_hits} hits / {self.cycle_analysis_misses} misses")
+            return lines
+
+    def reset_cycle(self):
+        """Reset cycle-specific counters for new cycle"""
+        with self.lock:
+            if not self.validate():
+                logging.warning("Cycle state validation failed before reset - continuing anyway")
+            self.cycle_parsed_jobs = 0
+            self.cycle_new_matches = 0
+            self.cycle_matched_jobs = []
+            self.cycle_new_jobs_only = []
+            self.cycle_skipped_seen = 0
+            self.cycle_prefiltered = 0
+            self.cycle_analysis_hits = 0
+            self.cycle_analysis_misses = 0
+            self.cycle_number += 1
+        logging.info(f"Starting cycle #{self.cycle_number}")
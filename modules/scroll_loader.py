@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Scroll Loader Module - event-driven lazy-loading of the job results list
+A MutationObserver installed in the page counts job cards and timestamps DOM
+activity; after each scroll step one async script returns as soon as new cards
+have settled or a short quiet period shows nothing more is coming, instead of
+sleeping a fixed number of seconds. ScrollStrategyStats keeps each strategy's
+yield across runs and picks the next step UCB1-style, so the order adapts when
+LinkedIn changes its lazy loading.
+"""
+
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from modules.job_cards import JOB_CARD_SELECTOR
+
+# Installs (once per document) window.__jobCardWatch = {count, lastChange, lastMutation}
+CARD_WATCH_JS = """
+function installCardWatch(selector) {
+    let watch = window.__jobCardWatch;
+    if (!watch || watch.selector !== selector) {
+        if (watch && watch.observer) watch.observer.disconnect();
+        watch = {selector: selector, count: 0, lastChange: Date.now(), lastMutation: Date.now()};
+        watch.observer = new MutationObserver(() => {
+            watch.lastMutation = Date.now();
+            const n = document.querySelectorAll(selector).length;
+            if (n !== watch.count) { watch.count = n; watch.lastChange = watch.lastMutation; }
+        });
+        watch.observer.observe(document.body, {childList: true, subtree: true});
+        window.__jobCardWatch = watch;
+    }
+    watch.count = document.querySelectorAll(selector).length;
+    return watch;
+}
+"""
+
+COUNT_CARDS_JS = CARD_WATCH_JS + "return installCardWatch(arguments[0]).count;"
+
+# arguments: selector, previous count, settle ms, quiet ms, timeout ms, callback
+WAIT_FOR_CARDS_JS = CARD_WATCH_JS + """
+const [selector, previous, settleMs, quietMs, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const watch = installCardWatch(selector);
+const started = Date.now();
+(function poll() {
+    const now = Date.now();
+    const idleFor = now - Math.max(started, watch.lastMutation);
+    if (watch.count > previous && idleFor >= settleMs) return done(watch.count);
+    if (idleFor >= quietMs || now - started >= timeoutMs) return done(watch.count);
+    setTimeout(poll, 50);
+})();
+"""
+
+# Scroll steps: JS run with (container, card selector); returns immediately, loading is awaited separately
+SCROLL_STRATEGIES: Dict[str, str] = {
+    # Incremental window scroll + container to bottom (the old initial burst)
+    "container_burst": """
+        const container = arguments[0];
+        window.scrollBy(0, Math.max(400, (container.scrollHeight || document.documentElement.scrollHeight) / 10));
+        if (container.scrollHeight > container.clientHeight) container.scrollTop = container.scrollHeight;
+    """,
+    "pixel_scroll": "window.scrollBy(0, 600);",
+    "last_card_into_view": """
+        const cards = document.querySelectorAll(arguments[1]);
+        if (cards.length) cards[cards.length - 1].scrollIntoView({block: 'center'});
+        window.scrollBy(0, 300);
+    """,
+    "bottom_scroll": """
+        window.scrollTo(0, document.body.scrollHeight);
+        window.scrollBy(0, 500);
+    """,
+    "card_walk": """
+        const cards = document.querySelectorAll(arguments[1]);
+        cards.forEach(card => card.scrollIntoView({block: 'start'}));
+    """,
+    "container_bottom": """
+        const container = arguments[0];
+        container.scrollTop = container.scrollHeight;
+        container.dispatchEvent(new Event('scroll'));
+    """,
+}
+
+# Same progression as the old fixed loop: pixels, then the last card, then the bottom, then fallbacks
+DEFAULT_SCROLL_PLAN = (
+    ["container_burst"] + ["pixel_scroll"] * 5 + ["last_card_into_view"] * 5 + ["bottom_scroll"] * 4
+    + ["card_walk", "container_bottom", "bottom_scroll"]
+)
+
+
+DEFAULT_PAGE_SIZE = 25  # cards per full results page
+
+
+class ScrollStrategyStats:
+    """Persisted per-strategy yield (cards gained per second) with a UCB1 step chooser"""
+
+    def __init__(self, path: Optional[str], strategies: Iterable[str] = tuple(SCROLL_STRATEGIES),
+                 exploration: float = 1.0, decay: float = 0.9, retire_after: int = 15,
+                 retired_probe_rate: float = 0.02, page_history: int = 30):
+        """
+        :param path: JSON file location (None keeps stats in memory only)
+        :param exploration: UCB1 bonus weight, in cards per second
+        :param decay: weight kept by evidence from earlier runs when loading, so old behavior fades out
+        :param retire_after: runs without a single gained card before a strategy is dropped
+        :param retired_probe_rate: chance a dropped strategy is retried anyway (LinkedIn may change again)
+        :param page_history: final card counts remembered to learn the full page size
+        """
+        self.path = path
+        self.strategies = [name for name in strategies if name in SCROLL_STRATEGIES]
+        self.exploration = exploration
+        self.decay = decay
+        self.retire_after = retire_after
+        self.retired_probe_rate = retired_probe_rate
+        self.page_history = page_history
+        self.arms: Dict[str, Dict[str, float]] = {name: {"runs": 0.0, "gained": 0.0, "seconds": 0.0}
+                                                  for name in self.strategies}
+        self.page_sizes: List[int] = []
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for name, arm in data.get("strategies", {}).items():
+                if name in self.arms:
+                    self.arms[name] = {key: float(arm.get(key, 0)) * self.decay for key in ("runs", "gained", "seconds")}
+            self.page_sizes = [int(n) for n in data.get("page_sizes", [])][-self.page_history:]
+            logging.info(f"Loaded scroll strategy stats from {self.path}: {self.describe()}")
+        except Exception as e:
+            logging.warning(f"Could not read scroll stats {self.path}: {e} - starting fresh")
+
+    def save(self):
+        """Atomically write the stats if they changed"""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            data = {"strategies": {name: dict(arm) for name, arm in self.arms.items()},
+                    "page_sizes": list(self.page_sizes)}
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self._dirty = True
+            logging.warning(f"Could not save scroll stats {self.path}: {e}")
+
+    def record(self, name: str, gained: int, seconds: float):
+        with self._lock:
+            arm = self.arms.setdefault(name, {"runs": 0.0, "gained": 0.0, "seconds": 0.0})
+            arm["runs"] += 1
+            arm["gained"] += gained
+            arm["seconds"] += seconds
+            self._dirty = True
+
+    def record_page(self, final_count: int):
+        with self._lock:
+            self.page_sizes = (self.page_sizes + [final_count])[-self.page_history:]
+            self._dirty = True
+
+    def target_count(self) -> int:
+        """Learned full page size (largest recent page), instead of a hard-coded threshold"""
+        with self._lock:
+            return max(self.page_sizes) if self.page_sizes else DEFAULT_PAGE_SIZE
+
+    def yield_rate(self, name: str) -> float:
+        arm = self.arms[name]
+        return arm["gained"] / arm["seconds"] if arm["seconds"] > 0 else 0.0
+
+    def is_retired(self, name: str) -> bool:
+        arm = self.arms[name]
+        return arm["runs"] >= self.retire_after and arm["gained"] < 0.5
+
+    def choose(self) -> str:
+        """Untried strategies first, then the best UCB1 score; retired ones only as a rare probe"""
+        with self._lock:
+            active = [name for name in self.strategies if not self.is_retired(name)]
+            retired = [name for name in self.strategies if name not in active]
+            if retired and (not active or random.random() < self.retired_probe_rate):
+                return random.choice(retired)
+            untried = [name for name in active if self.arms[name]["runs"] < 1]
+            if untried:
+                return untried[0]
+            total_runs = sum(self.arms[name]["runs"] for name in active)
+            return max(active, key=lambda name: self.yield_rate(name) + self.exploration * math.sqrt(
+                2 * math.log(max(total_runs, 1.0)) / self.arms[name]["runs"]))
+
+    def describe(self) -> str:
+        parts = []
+        for name in sorted(self.strategies, key=self.yield_rate, reverse=True):
+            arm = self.arms[name]
+            state = " (dropped)" if self.is_retired(name) else ""
+            parts.append(f"{name} {self.yield_rate(name):.2f} cards/s over {arm['runs']:.0f} runs{state}")
+        return "; ".join(parts)
+
+
+class ScrollLoader:
+    """Runs scroll steps and waits for the card count to change or the DOM to go quiet"""
+
+    def __init__(self, driver, container=None, selector: str = JOB_CARD_SELECTOR, settle_ms: int = 300,
+                 quiet_ms: int = 1200, timeout_ms: int = 8000, jitter=(0.1, 0.4),
+                 scheduler: Optional[ScrollStrategyStats] = None, harvester=None, timings=None):
+        """
+        :param container: results list element (window scroll is used when None)
+        :param settle_ms: after new cards appear, return once the DOM was still this long
+        :param quiet_ms: without new cards, give up after this long with no DOM mutations
+        :param timeout_ms: hard cap per step
+        :param jitter: small random pause (s) after each step for behavioral disguise
+        :param scheduler: ScrollStrategyStats that picks steps and receives their yield
+        :param harvester: CardHarvest collecting cards after every step; progress is then measured
+                          in harvested cards, since the virtualized DOM count can stay flat
+        :param timings: StageTimings receiving every step's duration as "scroll_step"
+        """
+        self.driver = driver
+        self.container = container
+        self.selector = selector
+        self.settle_ms = settle_ms
+        self.quiet_ms = quiet_ms
+        self.timeout_ms = timeout_ms
+        self.jitter = jitter
+        self.stats: Dict[str, Dict] = {}
+        self.async_supported = True
+        self.scheduler = scheduler
+        self.harvester = harvester
+        self.timings = timings
+
+    def count(self) -> int:
+        try:
+            return int(self.driver.execute_script(COUNT_CARDS_JS, self.selector))
+        except Exception as e:
+            logging.debug(f"Card watch unavailable: {e}")
+            return len(self.driver.find_elements("css selector", self.selector))
+
+    def wait_for_cards(self, previous: int) -> int:
+        """Block until new cards settle, the page goes quiet, or the step times out"""
+        if self.async_supported:
+            try:
+                self.driver.set_script_timeout(self.timeout_ms / 1000 + 5)
+                return int(self.driver.execute_async_script(
+                    WAIT_FOR_CARDS_JS, self.selector, previous, self.settle_ms, self.quiet_ms, self.timeout_ms))
+            except Exception as e:
+                logging.debug(f"Async card wait failed, polling instead: {e}")
+                self.async_supported = False
+        deadline = time.monotonic() + self.quiet_ms / 1000
+        current = self.count()
+        while current <= previous and time.monotonic() < deadline:
+            time.sleep(0.2)
+            current = self.count()
+        return current
+
+    def progress(self) -> int:
+        """Cards collected so far (harvested total, or the DOM count without a harvester)"""
+        return len(self.harvester) if self.harvester is not None else self.count()
+
+    def step(self, name: str) -> int:
+        """Run one strategy, wait for its effect and record cards gained / time spent"""
+        dom_before = self.count()
+        before = len(self.harvester) if self.harvester is not None else dom_before
+        started = time.perf_counter()
+        try:
+            self.driver.execute_script(SCROLL_STRATEGIES[name], self.container, self.selector)
+        except Exception as e:
+            logging.debug(f"Scroll strategy {name} failed: {e}")
+        after = self.wait_for_cards(dom_before)
+        if self.harvester is not None:
+            after = self.harvester.collect(self.driver)
+        if self.jitter:
+            time.sleep(random.uniform(*self.jitter))
+        gained = max(0, after - before)
+        elapsed = time.perf_counter() - started
+        if self.scheduler:
+            self.scheduler.record(name, gained, elapsed)
+        if self.timings is not None:
+            self.timings.record("scroll_step", elapsed)
+        entry = self.stats.setdefault(name, {"runs": 0, "gained": 0, "seconds": 0.0})
+        entry["runs"] += 1
+        entry["gained"] += gained
+        entry["seconds"] += elapsed
+        if gained:
+            logging.info(f"{name}: +{gained} jobs (total: {after})")
+        return gained
+
+    def run(self, plan: Iterable[str] = DEFAULT_SCROLL_PLAN, target_count: Optional[int] = 23,
+            max_idle_steps: int = 6, max_steps: Optional[int] = None) -> int:
+        """
+        Execute steps until target_count cards are loaded or max_idle_steps steps in a row gain nothing.
+        With a scheduler the steps (and, if target_count is None, the target) come from its statistics.
+        """
+        if self.scheduler:
+            steps = (self.scheduler.choose() for _ in range(max_steps or len(DEFAULT_SCROLL_PLAN)))
+            if target_count is None:
+                target_count = self.scheduler.target_count()
+        else:
+            steps = iter(plan)
+        target_count = target_count or DEFAULT_PAGE_SIZE
+        if self.harvester is not None:
+            self.harvester.collect(self.driver)
+        idle = 0
+        for name in steps:
+            if self.progress() >= target_count:
+                break
+            idle = 0 if self.step(name) else idle + 1
+            if idle >= max_idle_steps:
+                break
+        final_count = self.progress()
+        if self.scheduler:
+            self.scheduler.record_page(final_count)
+        return final_count
+
+    def describe(self) -> str:
+        parts = [f"{name} x{s['runs']} +{s['gained']} in {s['seconds']:.1f}s" for name, s in self.stats.items()]
+        return "; ".join(parts) if parts else "no scroll steps"
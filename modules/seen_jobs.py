@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Seen Jobs Module - persistent index of already analyzed LinkedIn jobs
+Keyed by the numeric job ID from /jobs/view/<id>, so the scraper can skip the
+click, description wait and analysis for cards it has already processed in this
+or any previous run, under any keyword or country.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+class SeenJobIndex:
+    """JSON-backed job_id -> outcome index shared across cycles and runs"""
+
+    def __init__(self, path: str, ttl_days: float = 30):
+        """
+        :param path: JSON file location
+        :param ttl_days: non-matching entries older than this are analyzed again;
+                         entries of any kind older than this are dropped on save
+        """
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # pool workers save concurrently; one writer at a time
+        self._dirty = False
+        self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, job_id):
+        return job_id in self._entries
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f).get("jobs", {})
+            logging.info(f"Loaded seen-job index: {len(self._entries)} jobs from {self.path}")
+        except Exception as e:
+            logging.warning(f"Could not read seen-job index {self.path}: {e} - starting empty")
+            self._entries = {}
+
+    def save(self):
+        """Atomically write the index if it changed, dropping entries older than the TTL"""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                cutoff = time.time() - self.ttl_seconds
+                expired = [job_id for job_id, entry in self._entries.items() if entry.get("analyzed_at", 0) < cutoff]
+                for job_id in expired:
+                    del self._entries[job_id]
+                data = {"jobs": dict(self._entries)}
+                self._dirty = False
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                logging.warning(f"Could not save seen-job index {self.path}: {e}")
+
+    def lookup(self, job_id: Optional[str], filter_signature: str = "") -> Optional[Dict]:
+        """
+        Return the stored entry if the job can be skipped, else None.
+        Matched jobs are always skipped (they were already alerted); jobs that
+        did not match are re-analyzed when the filter settings changed or the
+        entry expired.
+        """
+        if not job_id:
+            return None
+        entry = self._entries.get(job_id)
+        if not entry:
+            return None
+        if entry.get("matched"):
+            return entry
+        if entry.get("filters") != filter_signature:
+            return None
+        if time.time() - entry.get("analyzed_at", 0) > self.ttl_seconds:
+            return None
+        return entry
+
+    def mark(self, job_id: Optional[str], matched: bool, company: str = "", title: str = "",
+             filter_signature: str = "", cycle: Optional[int] = None):
+        """Record the outcome of a fully analyzed job"""
+        if not job_id:
+            return
+        with self._lock:
+            previous = self._entries.get(job_id, {})
+            self._entries[job_id] = {
+                "matched": bool(matched or previous.get("matched")),
+                "company": company,
+                "title": title,
+                "filters": filter_signature,
+                "cycle": cycle,
+                "analyzed_at": time.time(),
+            }
+            self._dirty = True
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Sheets Logger Module - cached Google Sheets client with a local dedup-key index
+Authenticates and opens the log spreadsheet once per process, and keeps the
+Company-Vacancy Title-Stage-TG message sent keys in a persisted local index
+that is updated with our own appends. The full sheet is downloaded again only
+when a cheap two-cell probe shows the row count changed behind our back.
+Compacted job rows (one per job and cycle) are upserted instead: their sheet
+row numbers are kept in the same index, and rows whose job got further are
+rewritten in place with one batch_update per flush.
+SheetsWriteBehindSink puts a durable local queue and a background flusher in
+front of it, so crawling never waits on the Sheets API or its write quota.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from modules.event_compaction import COMPACT_MARKER, ROW_KEY_FIELDS, is_compact, row_key, stage_rank
+
+KEY_FIELDS = ["Company", "Vacancy Title", "Stage", "TG message sent"]
+UPDATED_RANGE_RE = re.compile(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?$")
+
+
+def event_key(event: Dict) -> str:
+    return "-".join([str(event.get(f, "")) for f in KEY_FIELDS])
+
+
+def _sheet_digest(sheet_url: str) -> str:
+    return hashlib.sha1(sheet_url.encode("utf-8")).hexdigest()[:12]
+
+
+def index_path_for(cache_dir: str, sheet_url: str) -> str:
+    return os.path.join(cache_dir, f"sheets_key_index_{_sheet_digest(sheet_url)}.json")
+
+
+def queue_path_for(cache_dir: str, sheet_url: str) -> str:
+    return os.path.join(cache_dir, f"sheets_pending_{_sheet_digest(sheet_url)}.ndjson")
+
+
+class SheetsEventLogger:
+    """Long-lived gspread client + dedup index for the parser event log"""
+
+    def __init__(self, credentials_path: str, sheet_url: str, cache_dir: Optional[str] = None):
+        self.credentials_path = credentials_path
+        self.sheet_url = sheet_url
+        self.index_path = index_path_for(cache_dir, sheet_url) if cache_dir else None
+        self._worksheet = None
+        self.headers: List[str] = []
+        self.keys = set()
+        self.job_rows: Dict[str, List[int]] = {}  # compacted row key -> [sheet row, stage rank]
+        self.data_rows = 0  # rows in the sheet including the header, as far as we know
+        self._verified = False
+        self._lock = threading.Lock()
+        self.resyncs = 0
+        self._load_index()
+
+    # ---------- connection ----------
+
+    @property
+    def worksheet(self):
+        if self._worksheet is None:
+            import gspread
+            gc = gspread.service_account(filename=self.credentials_path)
+            self._worksheet = gc.open_by_url(self.sheet_url).sheet1
+            self.headers = self._worksheet.row_values(1)
+        return self._worksheet
+
+    def reset_connection(self):
+        """Drop the cached client after an API error (e.g. expired auth)"""
+        self._worksheet = None
+        self._verified = False
+
+    # ---------- local key index ----------
+
+    def _load_index(self):
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("sheet_url") == self.sheet_url:
+                self.keys = set(data.get("keys", []))
+                self.job_rows = data.get("job_rows", {})
+                self.data_rows = int(data.get("data_rows", 0))
+                logging.info(f"Loaded Sheets key index: {len(self.keys)} keys, {self.data_rows} rows")
+        except Exception as e:
+            logging.warning(f"Could not read Sheets key index {self.index_path}: {e}")
+
+    def _save_index(self):
+        if not self.index_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"sheet_url": self.sheet_url, "data_rows": self.data_rows, "keys": sorted(self.keys),
+                           "job_rows": self.job_rows}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logging.warning(f"Could not save Sheets key index: {e}")
+
+    def resync(self):
+        """Full download: rebuild headers, keys and row count from the sheet"""
+        all_values = self.worksheet.get_all_values()
+        self.headers = all_values[0] if all_values else []
+        key_indices = [self.headers.index(f) for f in KEY_FIELDS if f in self.headers]
+        self.keys = set()
+        self.job_rows = {}
+        compact_columns = [COMPACT_MARKER, "Stage", "TG message sent"] + ROW_KEY_FIELDS
+        compact = all(f in self.headers for f in compact_columns)
+        for row_number, row in enumerate(all_values[1:], start=2):
+            values = dict(zip(self.headers, row))
+            if compact and values.get(COMPACT_MARKER):
+                self.job_rows[row_key(values)] = [row_number, stage_rank(values)]
+            elif len(key_indices) == len(KEY_FIELDS):
+                try:
+                    self.keys.add("-".join([row[i] for i in key_indices]))
+                except Exception:
+                    continue
+        self.data_rows = len(all_values)
+        self._verified = True
+        self.resyncs += 1
+        self._save_index()
+        logging.info(f"Sheets key index re-synced: {len(self.keys)} keys, {len(self.job_rows)} job rows "
+                     f"from {self.data_rows} rows")
+
+    def _probe_consistent(self) -> bool:
+        """Two-cell check: our last known row is filled and the next one is empty"""
+        if self.data_rows < 1 or "Company" not in self.headers:
+            return False
+        from gspread.utils import rowcol_to_a1
+        col = self.headers.index("Company") + 1
+        start = rowcol_to_a1(self.data_rows, col)
+        end = rowcol_to_a1(self.data_rows + 1, col)
+        values = self.worksheet.get(f"{start}:{end}")
+        return len(values) == 1 and bool(values[0] and str(values[0][0]).strip())
+
+    def _ensure_index(self):
+        if self._verified:
+            return
+        self.worksheet  # connect (loads headers) before probing
+        if self._probe_consistent():
+            self._verified = True
+        else:
+            logging.info("Sheet row count changed since last index update - re-syncing keys")
+            self.resync()
+
+    # ---------- writes ----------
+
+    def _ensure_headers(self, events: List[Dict]):
+        """Add every missing column with a single header-row update"""
+        missing = []
+        for event_dict in events:
+            for col in event_dict.keys():
+                if col not in self.headers and col not in missing:
+                    missing.append(col)
+        if not missing:
+            return
+        from gspread.utils import rowcol_to_a1
+        new_headers = self.headers + missing
+        first = rowcol_to_a1(1, len(self.headers) + 1)
+        last = rowcol_to_a1(1, len(new_headers))
+        self.worksheet.update(range_name=f"{first}:{last}", values=[missing])
+        self.headers = new_headers
+
+    def _after_append(self, response, appended: int):
+        start_row = end_row = None
+        try:
+            match = UPDATED_RANGE_RE.search(response["updates"]["updatedRange"])
+            start_row = int(match.group(1))
+            end_row = int(match.group(2) or match.group(1))
+        except Exception:
+            pass
+        if start_row is not None and start_row != self.data_rows + 1:
+            # Someone else wrote to the sheet - our keys may be missing theirs
+            logging.info(f"Append landed at row {start_row}, expected {self.data_rows + 1} - index will re-sync")
+            self._verified = False
+        self.data_rows = end_row if end_row is not None else self.data_rows + appended
+        return start_row if start_row is not None else self.data_rows - appended + 1
+
+    def _update_rows(self, updates: Dict[int, Dict]) -> int:
+        """Rewrite existing rows in place, all of them in one batch_update call"""
+        if not updates:
+            return 0
+        from gspread.utils import rowcol_to_a1
+        last_column = rowcol_to_a1(1, len(self.headers)).rstrip("0123456789")
+        data = [{"range": f"A{row_number}:{last_column}{row_number}",
+                 "values": [[event_dict.get(col, "") for col in self.headers]]}
+                for row_number, event_dict in sorted(updates.items())]
+        self.worksheet.batch_update(data, value_input_option='USER_ENTERED')
+        return len(data)
+
+    def log_events(self, events: List[Dict]) -> int:
+        """
+        Append events whose dedup key is not in the sheet yet and upsert compacted
+        job rows (only when the job got further than the row already shows);
+        returns rows written
+        """
+        if not events:
+            return 0
+        with self._lock:
+            self._ensure_index()
+            self._ensure_headers(events)
+            new_keys = set()
+            dedup = all(f in self.headers for f in KEY_FIELDS)
+            can_upsert = all(f in self.headers for f in ROW_KEY_FIELDS)
+            filtered_events = []
+            job_events: Dict[str, Dict] = {}
+            for event_dict in events:
+                if can_upsert and is_compact(event_dict):
+                    key = row_key(event_dict)
+                    if key not in job_events or stage_rank(event_dict) >= stage_rank(job_events[key]):
+                        job_events[key] = event_dict
+                    continue
+                if dedup:
+                    new_key = event_key(event_dict)
+                    if new_key in self.keys or new_key in new_keys:
+                        logging.info(f"Duplicate event (key: {new_key}) not logged to Google Sheets.")
+                        continue
+                    new_keys.add(new_key)
+                filtered_events.append(event_dict)
+
+            updates: Dict[int, Dict] = {}
+            appended_jobs = []
+            for key, event_dict in job_events.items():
+                known = self.job_rows.get(key)
+                if known is None:
+                    filtered_events.append(event_dict)
+                    appended_jobs.append((key, event_dict))
+                elif stage_rank(event_dict) > known[1]:
+                    updates[known[0]] = event_dict
+            written = self._update_rows(updates)
+            for key, event_dict in job_events.items():
+                if key in self.job_rows and self.job_rows[key][0] in updates:
+                    self.job_rows[key][1] = stage_rank(event_dict)
+            if not filtered_events:
+                if written:
+                    self._save_index()
+                return written
+            rows = [[event_dict.get(col, "") for col in self.headers] for event_dict in filtered_events]
+            response = self.worksheet.append_rows(rows, value_input_option='USER_ENTERED')
+            self.keys.update(new_keys)
+            start_row = self._after_append(response, len(rows))
+            # Compacted rows were appended last, in order
+            first_job_row = start_row + len(rows) - len(appended_jobs)
+            for offset, (key, event_dict) in enumerate(appended_jobs):
+                self.job_rows[key] = [first_job_row + offset, stage_rank(event_dict)]
+            self._save_index()
+            return written + len(rows)
+
+
+def is_quota_error(error: Exception) -> bool:
+    """gspread APIError 429 / RESOURCE_EXHAUSTED"""
+    code = getattr(getattr(error, "response", None), "status_code", None)
+    return code == 429 or "RESOURCE_EXHAUSTED" in str(error) or "Quota exceeded" in str(error)
+
+
+class SheetsWriteBehindSink:
+    """Durable local queue + background thread flushing batched append_rows"""
+
+    def __init__(self, sheets_logger: SheetsEventLogger, queue_path: str, writes_per_minute: float = 50,
+                 max_batch: int = 500, min_writes_per_minute: float = 5):
+        """
+        :param queue_path: NDJSON file holding events not yet written to the sheet
+        :param writes_per_minute: starting write budget (Sheets allows 60/min per user)
+        :param max_batch: most rows per append_rows call
+        """
+        self.sheets_logger = sheets_logger
+        self.queue_path = queue_path
+        self.max_batch = max_batch
+        self.max_writes_per_minute = writes_per_minute
+        self.min_writes_per_minute = min_writes_per_minute
+        self.writes_per_minute = writes_per_minute
+        self._pending = deque()
+        self._file_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._last_write = 0.0
+        self._failures = 0
+        self.rows_written = 0
+        self.batches_written = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(queue_path)), exist_ok=True)
+        self._load_queue()
+        self._thread = threading.Thread(target=self._run, name="sheets-write-behind", daemon=True)
+        self._thread.start()
+
+    # ---------- durable queue ----------
+
+    def _load_queue(self):
+        if not os.path.exists(self.queue_path):
+            return
+        with open(self.queue_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    self._pending.append(json.loads(line))
+                except ValueError:
+                    continue
+        if self._pending:
+            logging.info(f"Sheets queue: {len(self._pending)} events pending from previous run")
+
+    def _rewrite_queue(self):
+        tmp_path = self.queue_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for event_dict in self._pending:
+                f.write(json.dumps(event_dict, ensure_ascii=False, default=str) + "\n")
+        os.replace(tmp_path, self.queue_path)
+
+    def submit(self, events: List[Dict]):
+        """Persist events locally and return at once"""
+        if not events:
+            return
+        lines = "".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in events)
+        with self._file_lock:
+            with open(self.queue_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            # Round-trip through JSON so queued and replayed events look the same
+            self._pending.extend(json.loads(line) for line in lines.splitlines())
+        self._wakeup.set()
+
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    # ---------- worker ----------
+
+    def _interval(self) -> float:
+        return 60.0 / self.writes_per_minute
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(timeout=1.0)
+            self._wakeup.clear()
+            if not self._pending:
+                continue
+            # Spend at most writes_per_minute; events keep piling up meanwhile, so batches grow under pressure
+            wait = self._last_write + self._interval() - time.monotonic()
+            if wait > 0 and self._stop.wait(wait):
+                break
+            self._flush_once()
+
+    def _flush_once(self) -> bool:
+        with self._flush_lock:
+            return self._flush_batch()
+
+    def _flush_batch(self) -> bool:
+        with self._file_lock:
+            batch = list(self._pending)[:self.max_batch]
+        if not batch:
+            return True
+        self._last_write = time.monotonic()
+        try:
+            written = self.sheets_logger.log_events(batch)
+        except Exception as e:
+            self._failures += 1
+            if is_quota_error(e):
+                self.writes_per_minute = max(self.min_writes_per_minute, self.writes_per_minute / 2)
+                logging.warning(f"Sheets write quota hit - slowing to {self.writes_per_minute:.0f} writes/min")
+            else:
+                self.sheets_logger.reset_connection()
+                logging.warning(f"Sheets flush failed ({str(e)[:100]}) - {len(self._pending)} events kept in queue")
+                # Back off on repeated errors without blocking the crawler
+                self._stop.wait(min(300, 5 * 2 ** min(self._failures, 6)))
+            return False
+        self._failures = 0
+        self.writes_per_minute = min(self.max_writes_per_minute, self.writes_per_minute + 1)
+        with self._file_lock:
+            for _ in batch:
+                self._pending.popleft()
+            self._rewrite_queue()
+        self.rows_written += written
+        self.batches_written += 1
+        logging.info(f"Sheets: wrote {written} rows ({len(batch)} events), queue={len(self._pending)}")
+        return True
+
+    def close(self, timeout: float = 30) -> bool:
+        """Stop the worker after trying to drain the queue; unsent events stay on disk"""
+        deadline = time.monotonic() + timeout
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        while self._pending and time.monotonic() < deadline:
+            if not self._flush_once():
+                time.sleep(min(self._interval(), max(0.0, deadline - time.monotonic())))
+        return not self._pending
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Stage Timing Module - named per-stage timers aggregated into latency histograms
+Every stage of a job (card lookup, click, description wait, langdetect, keyword
+matching, skill extraction, Telegram, Sheets) plus scroll steps and page turns
+is timed into an HDR-style histogram: power-of-two magnitudes split into linear
+sub-buckets, so percentiles stay within ~1% from microseconds to minutes in a
+few hundred counters. At cycle end the histograms are appended to an NDJSON
+file (one line per cycle) and reset.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class LatencyHistogram:
+    """HDR-style histogram of durations, recorded in microseconds"""
+
+    def __init__(self, sub_bucket_bits: int = 8):
+        """
+        :param sub_bucket_bits: significant bits kept per value (8 -> buckets under 0.8% wide)
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.buckets: Dict[int, int] = {}  # lowest value (us) of the bucket -> count
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def _bucket(self, value_us: int) -> int:
+        shift = max(0, value_us.bit_length() - self.sub_bucket_bits)
+        return (value_us >> shift) << shift
+
+    def _bucket_top(self, lowest_us: int) -> int:
+        shift = max(0, lowest_us.bit_length() - self.sub_bucket_bits)
+        return lowest_us + (1 << shift) - 1
+
+    def record(self, seconds: float):
+        value_us = max(0, int(seconds * 1_000_000))
+        bucket = self._bucket(value_us)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_us += value_us
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other: "LatencyHistogram"):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, p: float) -> float:
+        """Value (s) at or below which p percent of recordings fall (bucket's highest equivalent value)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(p / 100 * self.count)))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self._bucket_top(bucket), self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self.total_us / self.count / 1_000_000 if self.count else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total_s": round(self.total_us / 1_000_000, 6),
+            "mean_s": round(self.mean, 6),
+            "min_s": (self.min_us or 0) / 1_000_000,
+            "p50_s": self.percentile(50),
+            "p90_s": self.percentile(90),
+            "p99_s": self.percentile(99),
+            "max_s": self.max_us / 1_000_000,
+            "buckets_us": [[bucket, self.buckets[bucket]] for bucket in sorted(self.buckets)],
+        }
+
+
+class StageTimings:
+    """Thread-safe named stage histograms shared by all pages and pool workers"""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @contextmanager
+    def measure(self, stage: str):
+        """with timings.measure("click"): ... - records even when the block raises or continues"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def histogram(self, stage: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get(stage)
+
+    def merge(self, other: "StageTimings"):
+        """Add another run's histograms (e.g. benchmark repeats) into these"""
+        with other._lock:
+            histograms = list(other._histograms.items())
+        with self._lock:
+            for stage, histogram in histograms:
+                self._histograms.setdefault(stage, LatencyHistogram()).merge(histogram)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {stage: histogram.to_dict() for stage, histogram in self._histograms.items()}
+
+    def summary_lines(self) -> List[str]:
+        """One line per stage, biggest total time first"""
+        lines = []
+        for stage, h in sorted(self.snapshot().items(), key=lambda item: -item[1]["total_s"]):
+            lines.append(f"{stage}: n={h['count']} p50={h['p50_s']:.3f}s p90={h['p90_s']:.3f}s "
+                         f"p99={h['p99_s']:.3f}s max={h['max_s']:.3f}s total={h['total_s']:.1f}s")
+        return lines
+
+    def export(self, path: str, cycle: int, **meta):
+        """Append this cycle's histograms as one NDJSON line"""
+        record = {"timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "cycle": cycle, **meta, "stages": self.snapshot()}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except Exception as e:
+            logging.warning(f"Could not write stage timings to {path}: {e}")
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+
+def stage_timings_path_for(output_file: str) -> str:
+    """companies.xlsx -> companies.stage_timings.ndjson"""
+    return os.path.splitext(output_file)[0] + ".stage_timings.ndjson"
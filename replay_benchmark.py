@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Offline replay benchmark for parse_current_page.
+Replays pages recorded with "Record pages for offline replay" (or
+config["record_fixtures"]) through ReplayDriver - no browser, no LinkedIn,
+no behavioral delays, no Telegram/Sheets - and reports jobs/sec and where
+the time goes, so parsing/filtering changes can be measured reproducibly.
+
+Usage:
+    python replay_benchmark.py <fixtures dir> [--repeat N] [--languages en,de] [--verbose]
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_SCRIPT = os.path.join(BASE_DIR, "universal parser_wo_semantic_chatgpt.py")
+sys.path.insert(0, BASE_DIR)
+
+from modules.page_replay import ReplayDriver, load_fixture_pages
+from modules.stage_timing import StageTimings
+
+
+def load_scraper():
+    """The scraper is a script with a space in its name - load it as a module"""
+    spec = importlib.util.spec_from_file_location("linkedin_scraper", SCRAPER_SCRIPT)
+    scraper = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(scraper)
+    return scraper
+
+
+def build_replay_config(output_dir):
+    """
+    GUI defaults, minus everything that talks to the outside world or persists
+    across runs or repeats (analysis cache, dedup, value ordering, card
+    pre-filter), so every repeat does the same work
+    """
+    return {
+        "search_country": "Replay",
+        "keyword": "replay",
+        "output_file_path": os.path.join(output_dir, "replay_jobs.xlsx"),
+        "telegram_bot_token": "",
+        "telegram_chat_id": "",
+        "google_sheets_url": "",
+        "require_remote": True,
+        "require_visa": True,
+        "require_skills": True,
+        "location_logic": "OR",
+        "batch_card_extraction": True,
+        "skip_seen_jobs": False,
+        "telegram_digest": False,
+        "adaptive_scroll": False,
+        "crawl_checkpoints": False,
+        "incremental_crawl": False,
+        "analysis_cache_enabled": False,
+        "card_prefilter_enabled": False,
+        "value_ordering": False,
+    }
+
+
+def run_benchmark(fixtures_dir, repeat=1, languages=""):
+    pages = load_fixture_pages(fixtures_dir)
+    if not pages:
+        raise SystemExit(f"No recorded pages under {fixtures_dir}")
+    scraper = load_scraper()
+    scraper.HUMAN_DELAY_SCALE = 0
+
+    call_counts = defaultdict(int)
+    call_seconds = defaultdict(float)
+    page_seconds = []
+    jobs = 0
+    timings = StageTimings()
+    for _ in range(repeat):
+        # Fresh run state per repeat: a shared one would dedup the second pass ("DUPLICATE job")
+        with tempfile.TemporaryDirectory() as output_dir:
+            config = build_replay_config(output_dir)
+            config["target_languages"] = languages
+            start_time = scraper.prepare_run(config)
+            try:
+                for page in pages:
+                    driver = ReplayDriver(page)
+                    started = time.perf_counter()
+                    result = scraper.parse_current_page(driver, None, start_time, config)
+                    page_seconds.append(time.perf_counter() - started)
+                    jobs += result["processed"] if result else 0
+                    for kind, count in driver.calls.items():
+                        call_counts[kind] += count
+                    for kind, seconds in driver.call_seconds.items():
+                        call_seconds[kind] += seconds
+                timings.merge(config["stage_timings"])
+            finally:
+                scraper.finish_run(config)
+
+    total = sum(page_seconds)
+    driver_total = sum(call_seconds.values())
+    return {
+        "pages": len(page_seconds),
+        "jobs": jobs,
+        "seconds": total,
+        "jobs_per_second": jobs / total if total else 0.0,
+        "page_seconds": page_seconds,
+        "driver_seconds": driver_total,
+        "analysis_seconds": total - driver_total,
+        "driver_calls": dict(call_counts),
+        "stage_lines": timings.summary_lines(),
+    }
+
+
+def print_report(report):
+    page_seconds = report["page_seconds"]
+    median = statistics.median(page_seconds)
+    print(f"Pages replayed:   {report['pages']}")
+    print(f"Jobs processed:   {report['jobs']}")
+    print(f"Total time:       {report['seconds']:.3f}s ({report['jobs_per_second']:.1f} jobs/s)")
+    print(f"Per page:         median {median * 1000:.1f}ms, max {max(page_seconds) * 1000:.1f}ms")
+    print(f"Driver stand-in:  {report['driver_seconds']:.3f}s")
+    print(f"Scraper code:     {report['analysis_seconds']:.3f}s")
+    print("Driver calls:     " + ", ".join(f"{kind}={count}" for kind, count in sorted(report["driver_calls"].items())))
+    print("Stages:")
+    for line in report["stage_lines"]:
+        print(f"  {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded LinkedIn pages through parse_current_page")
+    parser.add_argument("fixtures_dir", help="directory with recorded pages (page_fixtures next to the seen index)")
+    parser.add_argument("--repeat", type=int, default=1, help="replay every page N times")
+    parser.add_argument("--languages", default="", help="language gate, e.g. en,de (default: all languages)")
+    parser.add_argument("--verbose", action="store_true", help="keep the scraper's INFO logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Скрипт настраивает INFO при импорте; в бенчмарке логи только мешают измерению
+        logging.disable(logging.INFO)
+    print_report(run_benchmark(args.fixtures_dir, repeat=args.repeat, languages=args.languages))
+
+
+if __name__ == "__main__":
+    main()
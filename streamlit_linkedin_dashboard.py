@@ -12,6 +12,7 @@ from collections import Counter
 from datetime import datetime, timedelta
 import base64
 from config import Config
+from modules.event_compaction import legacy_event_view, viewed_count
 
 # Page configuration
 st.set_page_config(
@@ -199,7 +200,8 @@ def load_google_sheet_data():
         sh = gc.open_by_url(sheet_url)
         worksheet = sh.sheet1
         data = worksheet.get_all_records()
-        df = pd.DataFrame(data)
+        # Compacted rows (one per job) are expanded back into per-stage rows
+        df = legacy_event_view(pd.DataFrame(data))
         
         # Data type conversions
         numeric_cols = ["Elapsed Time (s)", "Job ID"]
@@ -549,7 +551,8 @@ def calculate_funnel_data(df):
     """Calculate funnel stage data."""
     try:
         stages = {
-            "Viewed": len(df[df.get("Stage", "Viewed") == "Viewed"]) if "Stage" in df.columns else len(df),
+            # Pre-filtered / language-gated jobs have no Viewed row but were still listed
+            "Viewed": viewed_count(df),
             "Filtered": len(df[df.get("Stage", "") == "Filtered (criteria)"]),
             "Passed": len(df[df.get("Stage", "") == "Passed filters"]),
             "TG Sent": 0
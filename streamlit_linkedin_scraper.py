@@ -8,6 +8,7 @@ from wordcloud import WordCloud
 import itertools
 from collections import Counter
 from config import Config
+from modules.event_compaction import legacy_event_view, viewed_count
 
 st.set_page_config(page_title="LinkedIn Job Scraper", layout="centered")
 st.title("LinkedIn Job Scraper (Streamlit)")
@@ -32,7 +33,8 @@ def read_google_sheet(sheet_url=None, credentials=None):
         sh = gc.open_by_url(sheet_url)
         worksheet = sh.sheet1
         data = worksheet.get_all_records()
-        return pd.DataFrame(data)
+        # Compacted rows (one per job) are expanded back into per-stage rows
+        return legacy_event_view(pd.DataFrame(data))
     except FileNotFoundError:
         st.error("📁 Credentials file not found")
         return pd.DataFrame()
@@ -192,10 +194,7 @@ try:
         sheet_url = Config.SHEET_URL or st.secrets.get("sheet_url", None)
         if not creds_path or not sheet_url:
             raise ValueError("Configuration missing")
-        gc = gspread.service_account(filename=creds_path)
-        sh = gc.open_by_url(sheet_url)
-        ws = sh.sheet1
-        log_df = pd.DataFrame(ws.get_all_records())
+        log_df = read_google_sheet(sheet_url, creds_path)
         # === ФИКС: приведение типов для всех потенциально проблемных колонок ===
         for col in ["Elapsed Time (s)", "Job ID"]:
             if col in log_df.columns:
@@ -228,6 +227,9 @@ try:
                     funnel_counts[stage] = (mask_passed & mask_not_sent).sum()
                 else:
                     funnel_counts[stage] = (log_df["Stage"] == stage).sum()
+            elif stage == "Viewed":
+                # Pre-filtered / language-gated jobs have no Viewed row but were still listed
+                funnel_counts[stage] = viewed_count(log_df)
             else:
                 funnel_counts[stage] = (log_df["Stage"] == stage).sum()
         percent_stages = ["Viewed", "Filtered (criteria)", "Passed filters", "TG message sent"]
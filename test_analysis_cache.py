@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the description analysis cache (memory LRU + SQLite disk tier).
+"""
+
+import sqlite3
+import time
+
+from modules.analysis_cache import AnalysisCache, analysis_key
+
+ANALYSIS = {"categories": ["planning", "remote"], "matched_keywords": ["remote", "demand planning"],
+            "top_skills": ["planning", "anaplan"], "language": None}
+
+
+def test_key_ignores_case_and_whitespace_but_not_title_or_keywords():
+    key = analysis_key("Demand  planning\nrole", "Planner", "sig1")
+    assert key == analysis_key("demand planning role ", "  PLANNER", "sig1")
+    assert key != analysis_key("demand planning role", "Analyst", "sig1")
+    assert key != analysis_key("demand planning role", "Planner", "sig2")
+
+
+def test_memory_lru_counts_hits_and_misses():
+    cache = AnalysisCache(max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", ANALYSIS)
+    cache.put("b", ANALYSIS)
+    assert cache.get("a") == ANALYSIS  # a is now most recent
+    cache.put("c", ANALYSIS)  # evicts b
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_update_adds_language_later():
+    cache = AnalysisCache()
+    cache.put("a", ANALYSIS)
+    cache.update("a", language="en")
+    cache.update("missing", language="de")
+    assert cache.get("a")["language"] == "en"
+    assert cache.get("missing") is None
+
+
+def test_disk_tier_survives_restart_and_expires(tmp_path):
+    path = str(tmp_path / "analysis_cache.sqlite3")
+    cache = AnalysisCache(path)
+    cache.put("fresh", ANALYSIS)
+    cache.put("old", ANALYSIS)
+    cache.close()
+    with sqlite3.connect(path) as db:
+        db.execute("UPDATE analysis SET updated_at = ? WHERE key = 'old'", (time.time() - 40 * 86400,))
+
+    reopened = AnalysisCache(path, ttl_days=30)
+    assert reopened.get("fresh") == ANALYSIS
+    assert reopened.get("fresh") == ANALYSIS
+    assert reopened.get("old") is None
+    assert (reopened.hits, reopened.disk_hits, reopened.misses) == (2, 1, 1)
+    reopened.close()
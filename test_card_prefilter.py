@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the card-metadata pre-filter that runs before a job is clicked.
+"""
+
+from modules.card_prefilter import CardPrefilter, compile_patterns, parse_pattern_list, workplace_type
+
+
+def card(title="Demand Planner", company="Acme", location="Berlin, Germany (Hybrid)", applied=False):
+    return {"title": title, "company": company, "location": location, "applied": applied}
+
+
+def test_patterns_match_whole_words_case_insensitively():
+    assert parse_pattern_list("intern, sales;\nWerkstudent") == ["intern", "sales", "Werkstudent"]
+    pattern = compile_patterns(["intern", "sap (apo|ibp)", "[unclosed"])
+    assert pattern.search("Supply Chain Intern")
+    assert not pattern.search("International Planner")
+    assert pattern.search("SAP IBP Consultant")
+    assert pattern.search("Planner [unclosed")
+    assert compile_patterns([]) is None
+
+
+def test_title_company_and_badge_rules():
+    prefilter = CardPrefilter(title_include="planner, anaplan", title_exclude="intern", company_blocklist="Spam Corp")
+    assert prefilter.reason(card()) is None
+    assert prefilter.reason(card("Planner Intern")) == "title excludes 'intern'"
+    assert prefilter.reason(card("Sales Manager")) == "title not included"
+    assert prefilter.reason(card(company="spam corp ")) == "company blocked"
+    assert prefilter.reason(card(applied=True)) == "already applied"
+    assert prefilter.describe() == "Title+:planner,anaplan, Title-:intern, Companies-:spam corp"
+
+
+def test_on_site_cards_not_skipped_by_default():
+    on_site = card(location="Munich, Bavaria, Germany (On-site)")
+    assert workplace_type(on_site) == "on-site"
+    # The description may still offer remote work, so the real filter decides
+    assert CardPrefilter().reason(on_site) is None
+    assert CardPrefilter(require_remote=True).reason(on_site) is None
+    assert CardPrefilter(block_remote_prohibited=True).reason(on_site) is None
+    assert CardPrefilter.from_config({"require_remote": True, "block_remote_prohibited": True}).reason(on_site) is None
+
+
+def test_on_site_cards_skipped_only_with_opt_in():
+    on_site = card(location="Munich, Bavaria, Germany (On-site)")
+    assert CardPrefilter(skip_on_site=True).reason(on_site) is None
+    assert CardPrefilter(require_remote=True, skip_on_site=True).reason(on_site) == "on-site, remote required"
+    # Visa support is an accepted alternative to remote with OR logic
+    assert CardPrefilter(require_remote=True, require_visa=True, skip_on_site=True).reason(on_site) is None
+    assert CardPrefilter(require_remote=True, require_visa=True, location_logic="AND", skip_on_site=True).reason(on_site)
+    prefilter = CardPrefilter.from_config({"block_remote_prohibited": True, "prefilter_on_site": True})
+    assert prefilter.reason(on_site) == "on-site, remote prohibited"
+    assert prefilter.describe() == "On-site-"
+    assert CardPrefilter(require_remote=True, skip_on_site=True).reason(card(location="")) is None
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for resumable crawl checkpoints.
+"""
+
+import time
+
+from modules.crawl_checkpoint import CrawlCheckpoint
+
+
+def test_resume_position_survives_restart(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = CrawlCheckpoint(path)
+    assert checkpoint.position("Planner", "Germany") is None
+
+    checkpoint.record_page_done("Planner", "Germany", cycle=2, page=8)
+    checkpoint.record_job("Planner", "Germany", cycle=2, page=9, job_id="4011")
+
+    position = CrawlCheckpoint(path).position(" planner", "GERMANY ")
+    assert position["page"] == 9
+    assert position["last_job_id"] == "4011"
+    assert position["cycle"] == 2
+
+
+def test_failed_cards_are_kept_for_resume(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = CrawlCheckpoint(path)
+    checkpoint.record_job("Planner", "Germany", cycle=1, page=2, job_id="1")
+    checkpoint.record_failure("Planner", "Germany", cycle=1, page=2, job_id="2")
+    checkpoint.record_job("Planner", "Germany", cycle=1, page=2, job_id="3")
+
+    position = CrawlCheckpoint(path).position("Planner", "Germany")
+    assert position["last_job_id"] == "3" and position["failed_job_ids"] == ["2"]
+
+    # The retried card succeeds: it leaves the list without moving the position back
+    checkpoint.record_job("Planner", "Germany", cycle=1, page=2, job_id="2")
+    position = checkpoint.position("Planner", "Germany")
+    assert position["last_job_id"] == "3" and position["failed_job_ids"] == []
+
+    checkpoint.record_failure("Planner", "Germany", cycle=1, page=2, job_id="4")
+    checkpoint.record_page_done("Planner", "Germany", cycle=1, page=2)
+    assert checkpoint.position("Planner", "Germany")["failed_job_ids"] == []
+
+
+def test_completed_or_stale_positions_start_over(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = CrawlCheckpoint(path, max_age_hours=1)
+    checkpoint.record_page_done("Planner", "Germany", cycle=1, page=3)
+    checkpoint.complete("Planner", "Germany", cycle=1)
+    assert checkpoint.position("Planner", "Germany") is None
+
+    checkpoint.record_job("Analyst", "Spain", cycle=1, page=2, job_id="7")
+    checkpoint._positions["analyst|spain"]["updated_at"] = time.time() - 7200
+    assert checkpoint.position("Analyst", "Spain") is None
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    path.write_text("{oops", encoding="utf-8")
+    assert CrawlCheckpoint(str(path)).position("a", "b") is None
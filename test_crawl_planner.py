@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the value-ordered, time-budgeted crawl planner.
+"""
+
+import time
+
+from modules.crawl_planner import CrawlPlanner, title_stems
+from modules.keyword_matcher import KeywordMatcher
+
+MATCHER = KeywordMatcher({
+    "anaplan": ["anaplan", "anaplan model builder"],
+    "sap": ["sap apo", "sap ibp"],
+    "planning": ["demand planning", "supply planning"],
+    "remote_prohibited": ["on-site only"],
+})
+
+
+def card(title, job_id):
+    return {"title": title, "company": "Acme", "job_id": job_id, "url": None}
+
+
+def test_title_stems_catch_word_variants():
+    assert title_stems("Demand Planner") & title_stems("demand planning") == {"deman", "plann"}
+
+
+def test_cards_are_ordered_by_title_relevance():
+    planner = CrawlPlanner(MATCHER, search_terms=["forecasting"])
+    cards = [card("Sales Manager", "1"), card("Supply Planner", "2"), card("Anaplan Model Builder", "3"),
+             card("Forecasting Analyst", "4"), card("Office Assistant", "5")]
+    assert [c["job_id"] for c in planner.order(cards)] == ["3", "2", "4", "1", "5"]
+
+
+def test_budget_defers_cards_into_the_next_cycle():
+    planner = CrawlPlanner(MATCHER, cycle_budget_s=60, default_job_s=10)
+    assert planner.has_time()
+    planner.cycle_started = time.monotonic() - 55
+    assert not planner.has_time()
+    planner.defer([card("Office Assistant", "5")])
+    planner.begin_cycle()
+    assert planner.has_time()
+    assert planner.order([card("Sales Manager", "1"), card("Office Assistant", "5")])[0]["job_id"] == "5"
+
+    no_budget = CrawlPlanner(MATCHER)
+    no_budget.cycle_started -= 10_000
+    assert no_budget.has_time() and no_budget.page_worth_crawling("anaplan", "Germany", 9)
+
+
+def test_low_value_pages_skipped_late_in_the_budget():
+    planner = CrawlPlanner(MATCHER, cycle_budget_s=100, default_job_s=5)
+    planner.observe_page("anaplan", "Germany", 1, [card("Anaplan Model Builder", "1")])
+    planner.observe_page("anaplan", "Germany", 2, [card("Office Assistant", "2")])
+    assert planner.page_worth_crawling("anaplan", "Germany", 2)  # first half: everything
+    planner.cycle_started = time.monotonic() - 70
+    assert planner.page_worth_crawling("anaplan", "Germany", 1)
+    assert not planner.page_worth_crawling("anaplan", "Germany", 2)
+    assert planner.page_worth_crawling("anaplan", "Germany", 3)  # unknown page
+    assert planner.order_searches([("sales", "Germany"), ("anaplan", "Germany")])[0] == ("sales", "Germany")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for compacted per-job Sheets rows and the per-stage compatibility view.
+"""
+
+import pandas as pd
+
+from modules.event_compaction import compact_events, legacy_event_view, stage_rank, viewed_count
+from modules.job_records import JobRecord
+
+
+def job_events(company, *stages):
+    record = JobRecord(company, "Planner", 3, f"https://www.linkedin.com/jobs/view/{company}/")
+    events = [record.event("Viewed", 1.0, details=False)]
+    record.set_analysis({"visa"}, ["planning"], ["visa sponsorship"])
+    for stage, tg_sent in stages:
+        events.append(record.event(stage, 2.0, tg_sent=tg_sent))
+    return events
+
+
+def test_one_row_per_job_with_final_stage_and_history():
+    events = (job_events("Acme", ("Passed filters", ""), ("Passed filters", "yes"))
+              + job_events("Beta", ("Filtered (missing skills)", "")))
+    rows = compact_events(events)
+    assert [r["Company"] for r in rows] == ["Acme", "Beta"]
+    acme, beta = rows
+    assert acme["Stage"] == "Passed filters" and acme["TG message sent"] == "yes"
+    assert acme["Stage History"] == "Viewed > Passed filters > TG sent"
+    assert acme["Visa Sponsorship or Relocation"] is True and acme["Skills"] == "planning"
+    assert beta["Filter Reason"] == "missing skills"
+    assert beta["Stage History"] == "Viewed > Filtered (missing skills)"
+    assert compact_events(rows) == rows  # already compacted rows pass through
+
+
+def test_stage_rank_orders_job_progress():
+    ranks = [stage_rank({"Stage": "Viewed"}), stage_rank({"Stage": "Filtered (criteria)"}),
+             stage_rank({"Stage": "Passed filters"}),
+             stage_rank({"Stage": "Passed filters", "TG message sent": "no (duplicate)"}),
+             stage_rank({"Stage": "Passed filters", "TG message sent": "yes"})]
+    assert ranks == sorted(ranks) and len(set(ranks)) == 5
+
+
+def test_legacy_view_restores_per_stage_rows():
+    legacy = (job_events("Acme", ("Passed filters", ""), ("Passed filters", "yes"))
+              + job_events("Beta", ("Filtered (criteria)", "")))
+    old_rows = [{"Stage": "Viewed", "Company": "Old", "Vacancy Title": "Planner", "TG message sent": ""}]
+    df = pd.DataFrame(old_rows + compact_events(legacy))
+    view = legacy_event_view(df)
+    expected = pd.DataFrame(old_rows + legacy)
+    assert view["Stage"].value_counts().to_dict() == expected["Stage"].value_counts().to_dict()
+    assert (view["TG message sent"] == "yes").sum() == 1
+    assert list(view.columns) == list(df.columns)
+
+
+def test_unviewed_jobs_still_count_as_viewed_in_the_funnel():
+    events = (job_events("Acme", ("Passed filters", ""))
+              + [{**job_events("Beta")[0], "Stage": "Filtered (pre-filter: company blocked)"}]
+              + [{**job_events("Gamma")[0], "Stage": "Filtered (language)"}])
+    view = legacy_event_view(pd.DataFrame(compact_events(events)))
+    assert (view["Stage"] == "Viewed").sum() == 1
+    assert viewed_count(view) == 3
+    assert viewed_count(pd.DataFrame([{"Company": "No stage column"}])) == 1
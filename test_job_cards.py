@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for batch job card extraction (no browser needed).
+"""
+
+from modules.job_cards import CardHarvest, extract_job_cards_batch, extract_job_id, locate_job_card
+
+
+class FakeDriver:
+    def __init__(self, payload=None, error=None):
+        self.payload = payload
+        self.error = error
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.payload
+
+
+def test_extract_job_id():
+    assert extract_job_id("https://www.linkedin.com/jobs/view/4012345678/?refId=abc") == "4012345678"
+    assert extract_job_id("/jobs/view/123") == "123"
+    assert extract_job_id("https://www.linkedin.com/company/acme") is None
+    assert extract_job_id(None) is None
+
+
+def test_batch_extraction_is_one_call_and_normalizes():
+    driver = FakeDriver([
+        {"title": "Demand Planner", "company": "Acme", "url": "/jobs/view/42/", "job_id": None, "date_text": "2 days ago"},
+        {"title": "", "company": "", "url": None, "job_id": "77", "date_text": ""},
+    ])
+    cards = extract_job_cards_batch(driver)
+    assert driver.calls == 1
+    assert cards[0] == {
+        "title": "Demand Planner", "company": "Acme",
+        "url": "https://www.linkedin.com/jobs/view/42/", "job_id": "42", "date_text": "2 days ago",
+        "location": "", "applied": False,
+    }
+    assert cards[1]["title"] == "Title not found"
+    assert cards[1]["company"] == "Unknown Company"
+    assert cards[1]["job_id"] == "77"
+
+
+def test_batch_extraction_failure_returns_empty():
+    assert extract_job_cards_batch(FakeDriver(error=RuntimeError("boom"))) == []
+
+
+def test_harvest_keeps_cards_that_left_the_dom_in_page_order():
+    harvest = CardHarvest()
+    window_1 = [{"title": f"Job {n}", "company": "Acme", "url": f"/jobs/view/{n}/"} for n in (1, 2, 3)]
+    window_2 = [{"title": f"Job {n}", "company": "Acme", "url": f"/jobs/view/{n}/"} for n in (3, 4, 5)]
+    assert harvest.collect(FakeDriver(window_1)) == 3
+    assert harvest.collect(FakeDriver(window_2)) == 5
+    assert [card["job_id"] for card in harvest.cards()] == ["1", "2", "3", "4", "5"]
+    assert harvest.add([{"job_id": None, "url": None, "title": "X", "company": "Y"}]) == 1
+
+
+def test_locate_job_card_retries_until_rendered():
+    class RenderingDriver:
+        def __init__(self):
+            self.calls = 0
+
+        def execute_script(self, script, job_id, url, selector):
+            self.calls += 1
+            return "element" if self.calls == 3 else None
+
+    driver = RenderingDriver()
+    assert locate_job_card(driver, {"job_id": "42", "url": None}, timeout=2) == "element"
+    assert locate_job_card(FakeDriver(None), {"job_id": "42", "url": None}, timeout=0) is None
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for reading job data from LinkedIn's JSON responses (recorded payloads, no browser needed).
+"""
+
+import base64
+import datetime
+import json
+
+import pytest
+
+from modules.job_payloads import CdpNetworkCapture, JobPayloadStore, PayloadCapture, extract_jobs, relative_posted_text
+from modules.page_replay import FixtureRecorder, ReplayDriver, load_fixture_pages
+
+LISTED_AT = int(datetime.datetime(2026, 10, 16, 9, 0).timestamp() * 1000)
+DESCRIPTION = "We are looking for an Anaplan model builder. Visa sponsorship available, fully remote team."
+
+# Shapes as returned by /voyager/api/voyagerJobsDashJobCards and /voyager/api/jobs/jobPostings/<id>
+LIST_PAYLOAD = {"data": {"paging": {"total": 2}}, "included": [
+    {"entityUrn": "urn:li:fsd_jobPostingCard:(4012345678,JOBS_SEARCH)",
+     "jobPostingTitle": "Anaplan Model Builder",
+     "primaryDescription": {"text": "Acme GmbH"},
+     "secondaryDescription": {"text": "Berlin, Germany (Remote)"},
+     "footerItems": [{"type": "LISTED_DATE", "timeAt": LISTED_AT}, {"type": "APPLIED"}],
+     "*jobPosting": "urn:li:fsd_jobPosting:4012345678"},
+    {"entityUrn": "urn:li:fsd_jobPostingCard:(4099999999,JOBS_SEARCH)",
+     "jobPostingTitle": "Demand Planner", "primaryDescription": {"text": "Beta AG"}},
+    {"entityUrn": "urn:li:fsd_company:1234", "name": "Acme GmbH"},
+]}
+DETAIL_PAYLOAD = {
+    "entityUrn": "urn:li:fs_normalized_jobPosting:4012345678",
+    "title": "Anaplan Model Builder",
+    "description": {"text": DESCRIPTION},
+    "listedAt": LISTED_AT,
+    "formattedLocation": "Berlin, Germany",
+    "companyDetails": {"com.linkedin.voyager.jobs.JobPostingCompany": {
+        "companyResolutionResult": {"entityUrn": "urn:li:fs_normalized_company:1234", "name": "Acme GmbH"}}},
+}
+LIST_URL = "https://www.linkedin.com/voyager/api/voyagerJobsDashJobCards?decorationId=x&q=jobSearch"
+DETAIL_URL = "https://www.linkedin.com/voyager/api/jobs/jobPostings/4012345678?decorationId=y"
+
+
+def test_list_and_detail_payloads_merge_per_job():
+    assert set(extract_jobs(LIST_PAYLOAD)) == {"4012345678", "4099999999"}
+    store = JobPayloadStore()
+    store.ingest(LIST_PAYLOAD)
+    store.ingest(DETAIL_PAYLOAD)
+    job = store.get("4012345678")
+    assert job["title"] == "Anaplan Model Builder" and job["company"] == "Acme GmbH"
+    assert job["posted_at_ms"] == LISTED_AT and job["applied"] is True
+    assert store.description("4012345678") == DESCRIPTION
+    assert store.get("4099999999") == {"title": "Demand Planner", "company": "Beta AG"}
+
+    card = store.enrich({"title": "Title not found", "company": "Unknown Company", "url": None,
+                         "job_id": "4012345678", "date_text": ""})
+    assert card["title"] == "Anaplan Model Builder" and card["company"] == "Acme GmbH"
+    assert card["date_text"].endswith("ago") and card["applied"] is True
+
+
+def test_relative_posted_text():
+    now = datetime.datetime(2026, 10, 18, 9, 0)
+    assert relative_posted_text(LISTED_AT, now) == "2 days ago"
+    assert relative_posted_text(int(now.timestamp() * 1000) - 3 * 3600 * 1000, now) == "3 hours ago"
+    assert relative_posted_text(int(now.timestamp() * 1000), now) == "just now"
+
+
+class PerformanceLogDriver:
+    """Chrome performance log + Network.getResponseBody for three responses"""
+
+    def __init__(self):
+        self.cdp = []
+        self.bodies = {"1": {"body": json.dumps(LIST_PAYLOAD), "base64Encoded": False},
+                       "2": {"body": base64.b64encode(json.dumps(DETAIL_PAYLOAD).encode()).decode(),
+                             "base64Encoded": True}}
+        self.log = [self._event("Network.responseReceived", requestId="1", response={"url": LIST_URL}),
+                    self._event("Network.responseReceived", requestId="3",
+                                response={"url": "https://www.linkedin.com/li/track"}),
+                    self._event("Network.loadingFinished", requestId="1"),
+                    self._event("Network.loadingFinished", requestId="3"),
+                    self._event("Network.responseReceived", requestId="2", response={"url": DETAIL_URL})]
+
+    @staticmethod
+    def _event(method, **params):
+        return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+    def get_log(self, kind):
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append(cmd)
+        return self.bodies.get(params.get("requestId"), {})
+
+
+def test_cdp_capture_reads_job_responses_once_loaded():
+    driver = PerformanceLogDriver()
+    capture = CdpNetworkCapture(driver)
+    recorded = []
+    capture.sink = lambda url, body: recorded.append(url)
+    assert capture.poll() == 1  # detail response not finished yet, tracking request ignored
+    assert capture.store.description("4012345678") == ""
+    driver.log = [driver._event("Network.loadingFinished", requestId="2")]
+    assert capture.wait_for_description("4012345678", timeout=1) == DESCRIPTION
+    assert recorded == [LIST_URL, DETAIL_URL]
+    assert driver.cdp == ["Network.enable", "Network.getResponseBody", "Network.getResponseBody"]
+
+
+def test_payload_capture_needs_a_reader():
+    with pytest.raises(TypeError):
+        PayloadCapture()
+
+    class Incomplete(PayloadCapture):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_recorded_payloads_replay_offline(tmp_path):
+    cards = [{"title": "Title not found", "company": "Unknown Company", "job_id": "4012345678",
+              "url": "https://www.linkedin.com/jobs/view/4012345678/", "date_text": ""}]
+    page = FixtureRecorder(str(tmp_path)).start_page(cards)
+    page.record_payload(LIST_URL, json.dumps(LIST_PAYLOAD))
+    page.record_payload(DETAIL_URL, json.dumps(DETAIL_PAYLOAD))
+
+    replay = ReplayDriver(load_fixture_pages(str(tmp_path))[0])
+    capture = replay.job_payload_capture
+    assert capture.poll() == 2
+    assert capture.store.enrich(cards[0])["title"] == "Anaplan Model Builder"
+    assert capture.wait_for_description("4012345678", timeout=0) == DESCRIPTION
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the slotted job record and the columnar results buffer.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from modules.job_records import RESULT_COLUMNS, ColumnarResults, JobRecord
+
+EVENT_KEYS = [
+    "Timestamp", "Stage", "Company", "Vacancy Title", "Cycle #", "Visa Sponsorship or Relocation", "Anaplan",
+    "SAP APO", "Planning", "No Relocation Support", "Remote", "Remote Prohibited", "Already Applied", "Job URL",
+    "Elapsed Time (s)", "Skills", "TG message sent", "Matched key words", "Search Keyword", "Search Country",
+    "Job Date", "transformed publish date from description",
+]
+
+
+def make_record():
+    record = JobRecord("Acme", "Demand Planner", 2, "https://www.linkedin.com/jobs/view/42/",
+                       "anaplan", "Germany", "2 days ago", "2026-10-16")
+    record.set_analysis({"remote", "planning"}, ["planning", "anaplan"], ["remote", "demand planning"])
+    return record
+
+
+def test_record_is_slotted():
+    record = make_record()
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+def test_events_keep_the_sheet_layout():
+    record = make_record()
+    viewed = record.event("Viewed", 12.345, details=False)
+    assert list(viewed) == EVENT_KEYS
+    assert viewed["Remote"] is False and viewed["Skills"] == ""
+    assert viewed["Matched key words"] == "remote, demand planning"
+    assert viewed["Elapsed Time (s)"] == 12.35
+
+    passed = record.event("Passed filters", 13.0, filter_config="Remote:True")
+    assert list(passed) == EVENT_KEYS + ["Filter Config"]
+    assert passed["Remote"] is True and passed["Planning"] is True and passed["Anaplan"] is False
+    assert passed["Skills"] == "planning, anaplan"
+
+    sent = record.event("Passed filters", 14.0, tg_sent="yes")
+    assert sent["TG message sent"] == "yes" and "Filter Config" not in sent
+
+
+def test_result_row_matches_columns():
+    row = make_record().result_row(20.0)
+    assert list(row) == [name for name, _ in RESULT_COLUMNS]
+    assert row["Search Country"] == "Germany" and row["Job Date"] == "2 days ago"
+
+
+def test_columnar_results_round_trip_and_dataframe():
+    results = ColumnarResults()
+    for elapsed in (1.0, 2.5, 4.0):
+        results.append(make_record().result_row(elapsed))
+    error_row = {"Company": "anaplan", "Vacancy Title": "", "Cycle #": 2, "Job URL": None,
+                 "Elapsed Time (s)": 5.0, "Remote": False, "Note": "global error"}
+    results.append(error_row)
+
+    assert len(results) == 4
+    rows = list(results)
+    assert rows[0] == make_record().result_row(1.0)
+    assert rows[3]["Job URL"] is None and rows[3]["Note"] == "global error"
+    assert rows[3]["Anaplan"] is None  # missing flag stays missing
+
+    df = results.to_dataframe()
+    assert list(df.columns) == [name for name, _ in RESULT_COLUMNS] + ["Note"]
+    assert df["Elapsed Time (s)"].tolist() == [1.0, 2.5, 4.0, 5.0]
+    assert df["Remote"].tolist() == [True, True, True, False]
+    assert df["Search Country"].dtype == "category"
+    assert df["Search Country"].cat.categories.tolist() == ["Germany"]
+    assert df["Job URL"].isna().tolist() == [False, False, False, True]
+    assert df["TG message sent"].isna().tolist() == [False, False, False, True]
+    # the DataFrame views the arrays; appending moves the viewed column and leaves the frame intact
+    assert np.shares_memory(df["Elapsed Time (s)"].to_numpy(), results._view("Elapsed Time (s)", float))
+    results.append(error_row)
+    assert len(results.to_dataframe()) == 5
+    assert df["Elapsed Time (s)"].tolist() == [1.0, 2.5, 4.0, 5.0]
+
+
+def test_repeated_strings_are_stored_once():
+    results = ColumnarResults()
+    for i in range(1000):
+        row = make_record().result_row(float(i))
+        row["Job URL"] = f"https://www.linkedin.com/jobs/view/{i}/"
+        results.append(row)
+    assert len(results._tables["Skills"]) == 1
+    assert len(results._tables["Job URL"]) == 1000
+    assert results._data["Elapsed Time (s)"].itemsize == 8
+    assert not any(math.isnan(v) for v in results._data["Elapsed Time (s)"])
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass keyword matcher.
+Checks that one Aho-Corasick scan gives the same answers as the old per-list substring checks.
+"""
+
+from modules.keyword_matcher import KeywordMatcher
+
+
+CATEGORIES = {
+    "visa": ["relocation support", "visa sponsorship available"],
+    "anaplan": ["anaplan", "anaplan model builder"],
+    "planning": ["demand planning", "s&op", "planning"],
+    "no_relocation": ["no relocation", "Relocation Assistance Provided: No"],
+    "already_applied": ["applied"],
+}
+
+
+def naive_scan(text, categories, silent=()):
+    text = text.lower()
+    flags = {cat for cat, kws in categories.items() if any(kw.lower() in text for kw in kws)}
+    matched = [kw for cat, kws in categories.items() if cat not in silent for kw in kws if kw.lower() in text]
+    return flags, matched
+
+
+def test_matches_naive_substring_search():
+    matcher = KeywordMatcher(CATEGORIES, silent=("already_applied",))
+    samples = [
+        "",
+        "Senior Anaplan Model Builder with demand planning and S&OP experience",
+        "We offer relocation support. Relocation Assistance Provided: No",
+        "no relocation, previously applied candidates welcome",
+        "nothing relevant here",
+        "anaplananaplan planningplanning",
+    ]
+    for text in samples:
+        scan = matcher.scan(text)
+        flags, matched = naive_scan(text, CATEGORIES, silent=("already_applied",))
+        assert scan.categories == flags, text
+        assert scan.matched_keywords == matched, text
+
+
+def test_overlapping_patterns_and_suffix_outputs():
+    matcher = KeywordMatcher({"a": ["he", "she", "his", "hers"]})
+    scan = matcher.scan("ushers")
+    assert scan.matched_keywords == ["he", "she", "hers"]
+
+
+def test_keyword_in_several_categories_sets_every_flag():
+    matcher = KeywordMatcher({"remote": ["remote"], "remote_prohibited": ["no remote", "remote"]})
+    scan = matcher.scan("Fully REMOTE role")
+    assert scan.has("remote") and scan.has("remote_prohibited")
+    assert scan.matched_keywords == ["remote", "remote"]
+
+
+def test_signature_changes_with_keyword_lists():
+    base = KeywordMatcher({"visa": ["visa sponsorship"], "remote": ["remote"]})
+    same = KeywordMatcher({"visa": ["visa sponsorship"], "remote": ["remote"]})
+    edited = KeywordMatcher({"visa": ["visa sponsorship", "relocation"], "remote": ["remote"]})
+    assert base.signature() == same.signature()
+    assert base.signature() != edited.signature()
+
+
+def test_category_keywords_keep_config_order():
+    matcher = KeywordMatcher(CATEGORIES)
+    assert matcher.category_keywords() == CATEGORIES
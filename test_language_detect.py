@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy, seeded and cached language detector.
+"""
+
+from modules.language_detect import UNKNOWN_LANGUAGE, LanguageDetector, language_allowed, parse_language_list
+
+ENGLISH = "we are looking for a demand planning consultant to join our supply chain team in berlin"
+GERMAN = "wir suchen einen berater für die bedarfsplanung, der unser team in der lieferkette verstärkt"
+
+
+def test_parse_language_list():
+    assert parse_language_list("en, DE;fr ,") == {"en", "de", "fr"}
+    assert parse_language_list(["en", " de "]) == {"en", "de"}
+    assert parse_language_list("") == set()
+    assert parse_language_list(None) == set()
+
+
+def test_detection_is_lazy_seeded_and_cached():
+    detector = LanguageDetector()
+    assert detector._detect is None  # nothing loaded until the first description
+    assert detector.detect(ENGLISH) == "en"
+    assert detector.detect(GERMAN) == "de"
+    assert detector.detect(ENGLISH) == "en"
+    assert (detector.hits, detector.misses) == (1, 2)
+    # Same seed -> same answer from a fresh detector
+    assert LanguageDetector().detect(GERMAN) == "de"
+    assert detector.detect("   ") == UNKNOWN_LANGUAGE
+    assert detector.detect("12345 67890") == UNKNOWN_LANGUAGE
+
+
+def test_cache_is_bounded():
+    detector = LanguageDetector(max_entries=2)
+    for text in (ENGLISH, GERMAN, ENGLISH + " today"):
+        detector.detect(text)
+    detector.detect(ENGLISH)
+    assert detector.misses == 4  # the oldest entry was evicted
+
+
+def test_language_gate():
+    detector = LanguageDetector()
+    assert language_allowed(detector.detect(GERMAN), [])
+    assert language_allowed(detector.detect(ENGLISH), {"en"})
+    assert not language_allowed(detector.detect(GERMAN), {"en"})
+    assert language_allowed(detector.detect("12345 67890"), {"en"})
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the background Telegram notifier against a local HTTP stub.
+"""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from modules.notifier import AlertDigest, TelegramNotifier, split_message, spool_dir_for
+
+
+class StubTelegram(BaseHTTPRequestHandler):
+    calls = []
+    responses = []  # queue of (status, body) to return before falling back to 200
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        StubTelegram.calls.append(self.path.rsplit("/", 1)[-1])
+        status, body = StubTelegram.responses.pop(0) if StubTelegram.responses else (200, {"ok": True})
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub():
+    StubTelegram.calls = []
+    StubTelegram.responses = []
+    server = HTTPServer(("127.0.0.1", 0), StubTelegram)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_messages_are_delivered_in_order_and_respect_retry_after(tmp_path):
+    server, base = start_stub()
+    StubTelegram.responses = [(429, {"ok": False, "parameters": {"retry_after": 0.2}})]
+    notifier = TelegramNotifier("TOKEN", "42", spool_dir=str(tmp_path), api_base=base, backoff_base=0.01)
+    try:
+        notifier.send_message("hello", images=[b"png-1", b"png-2"])
+        assert notifier.flush(timeout=10)
+        assert StubTelegram.calls == ["sendMessage", "sendMessage", "sendPhoto", "sendPhoto"]
+        stats = notifier.stats()
+        assert stats["sent"] == 3 and stats["failed"] == 0 and stats["queue_depth"] == 0
+        assert os.listdir(str(tmp_path)) == []
+    finally:
+        notifier.close()
+        server.shutdown()
+
+
+def test_permanent_errors_are_dropped(tmp_path):
+    server, base = start_stub()
+    StubTelegram.responses = [(400, {"ok": False, "description": "bad chat"})]
+    notifier = TelegramNotifier("TOKEN", "42", spool_dir=str(tmp_path), api_base=base)
+    try:
+        notifier.send_message("hello")
+        assert notifier.flush(timeout=10)
+        assert notifier.stats()["failed"] == 1
+        assert os.listdir(str(tmp_path)) == []
+    finally:
+        notifier.close()
+        server.shutdown()
+
+
+def test_unsent_items_survive_restart(tmp_path):
+    # Unreachable API: the item stays in the spool when the notifier is closed
+    notifier = TelegramNotifier("TOKEN", "42", spool_dir=str(tmp_path), api_base="http://127.0.0.1:9",
+                                backoff_base=5)
+    notifier.send_message("survive me", images=[b"png"])
+    notifier.close(timeout=0.5)
+    assert len(os.listdir(str(tmp_path))) == 2
+
+    server, base = start_stub()
+    restarted = TelegramNotifier("TOKEN", "42", spool_dir=str(tmp_path), api_base=base)
+    try:
+        assert restarted.flush(timeout=10)
+        assert StubTelegram.calls == ["sendMessage", "sendPhoto"]
+        assert os.listdir(str(tmp_path)) == []
+    finally:
+        restarted.close()
+        server.shutdown()
+
+
+def test_spool_is_kept_per_bot_and_chat(tmp_path):
+    first = spool_dir_for(str(tmp_path), "TOKEN", "42")
+    assert first == spool_dir_for(str(tmp_path), "TOKEN", "42")
+    assert first != spool_dir_for(str(tmp_path), "TOKEN", "43")
+    assert first != spool_dir_for(str(tmp_path), "OTHER", "42")
+
+    notifier = TelegramNotifier("TOKEN", "42", spool_dir=first, api_base="http://127.0.0.1:9", backoff_base=5)
+    notifier.send_message("only for chat 42")
+    notifier.close(timeout=0.5)
+
+    server, base = start_stub()
+    other_chat = TelegramNotifier("TOKEN", "43", spool_dir=spool_dir_for(str(tmp_path), "TOKEN", "43"), api_base=base)
+    try:
+        assert other_chat.flush(timeout=10)
+        assert StubTelegram.calls == []
+        assert len(os.listdir(first)) == 1
+    finally:
+        other_chat.close()
+        server.shutdown()
+
+
+def test_split_message_respects_limit():
+    blocks = ["a" * 30, "b" * 30, "c" * 30]
+    assert split_message(blocks, limit=70, separator="\n") == ["a" * 30 + "\n" + "b" * 30, "c" * 30]
+
+
+def test_split_message_never_cuts_html_tags():
+    link = "<a href='https://www.linkedin.com/jobs/view/42/'>https://www.linkedin.com/jobs/view/42/</a>"
+    block = "<b>Acme</b>\n" + "x" * 40 + "\n" + link
+    messages = split_message([block], limit=100)
+    assert messages == ["<b>Acme</b>\n" + "x" * 40, link]
+
+    # A single line over the limit loses its tags instead of being cut inside one
+    long_line = "<b>" + "Planner &amp; " * 10 + "</b>"
+    messages = split_message([long_line], limit=50)
+    assert len(messages) == 1 and len(messages[0]) <= 50
+    assert "<" not in messages[0] and messages[0].startswith("Planner &amp; Planner")
+    assert not messages[0].endswith("&amp") and not messages[0].endswith("&")
+
+
+def test_digest_coalesces_jobs_into_one_message_and_album(tmp_path):
+    server, base = start_stub()
+    notifier = TelegramNotifier("TOKEN", "42", spool_dir=str(tmp_path), api_base=base)
+    digest = AlertDigest(notifier, window_s=3600, max_jobs=3,
+                         header_fn=lambda n: f"{n} new jobs", images_fn=lambda: [b"p-chart", b"bar-chart"])
+    try:
+        digest.add("job 1")
+        digest.add("job 2")
+        assert digest.maybe_flush() is False
+        digest.add("job 3")  # reaches max_jobs
+        assert notifier.flush(timeout=10)
+        assert StubTelegram.calls == ["sendMessage", "sendMediaGroup"]
+        assert len(digest) == 0
+
+        digest.add("job 4")
+        digest.flush(footer="cycle summary")
+        assert notifier.flush(timeout=10)
+        assert StubTelegram.calls[2:] == ["sendMessage", "sendMediaGroup"]
+    finally:
+        notifier.close()
+        server.shutdown()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for page fixture recording and the offline replay driver (no browser needed).
+"""
+
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
+
+from modules.job_cards import CARD_EXTRACTION_JS, locate_job_card
+from modules.page_replay import FixtureRecorder, ReplayDriver, html_to_text, load_fixture_pages
+
+
+SEARCH_URL = "https://www.linkedin.com/jobs/search/?keywords=anaplan"
+CARDS = [
+    {"title": "Demand Planner", "company": "Acme", "url": "https://www.linkedin.com/jobs/view/42/",
+     "job_id": "42", "date_text": "2 days ago"},
+    {"title": "Anaplan Consultant", "company": "Beta", "url": "https://www.linkedin.com/jobs/view/77/",
+     "job_id": "77", "date_text": "1 week ago"},
+]
+
+
+def record(tmp_path):
+    page = FixtureRecorder(str(tmp_path)).start_page(CARDS, {"url": SEARCH_URL})
+    page.record_description(CARDS[0], "<div><p>Acme planning role.</p><ul><li>Visa sponsorship</li></ul></div>")
+    page.record_description(CARDS[1], "<div>Anaplan model builder, fully remote</div>")
+    return load_fixture_pages(str(tmp_path))
+
+
+def test_recorded_page_round_trips(tmp_path):
+    pages = record(tmp_path)
+    assert len(pages) == 1
+    assert pages[0]["cards"] == CARDS
+    assert pages[0]["meta"]["url"].endswith("keywords=anaplan")
+    assert set(pages[0]["descriptions"]) == {"42", "77"}
+
+
+def test_html_to_text_keeps_block_breaks():
+    assert html_to_text("<div><p>One</p><ul><li>Two</li><li>Three</li></ul></div>") == "One\n\nTwo\nThree"
+
+
+def test_replay_click_opens_the_recorded_description(tmp_path):
+    driver = ReplayDriver(record(tmp_path)[0])
+    assert driver.execute_script(CARD_EXTRACTION_JS) == CARDS
+
+    job = locate_job_card(driver, CARDS[1])
+    ActionChains(driver).move_to_element(job).click().perform()
+    description = driver.find_element(By.CLASS_NAME, "jobs-box__html-content")
+    assert description.get_attribute("innerText") == "Anaplan model builder, fully remote"
+
+    ActionChains(driver).move_to_element(locate_job_card(driver, CARDS[0])).click().perform()
+    assert "Visa sponsorship" in description.get_attribute("innerText")
+    assert driver.calls["click"] == 2
+
+
+def test_parse_current_page_replays_offline(tmp_path):
+    from replay_benchmark import build_replay_config, load_scraper
+
+    cards = CARDS[:1] + [
+        {"title": "Forklift Driver", "company": "Beta", "url": "https://www.linkedin.com/jobs/view/77/",
+         "job_id": "77", "date_text": "1 week ago"},
+        {"title": "Sales Intern", "company": "Gamma", "url": "https://www.linkedin.com/jobs/view/91/",
+         "job_id": "91", "date_text": "1 day ago"},
+    ]
+    page = FixtureRecorder(str(tmp_path / "fixtures")).start_page(cards, {"url": SEARCH_URL})
+    page.record_description(cards[0], "<div><p>Demand planning role in our supply chain team. We offer visa "
+                                      "sponsorship and relocation support. SAP APO, Excel and SQL required.</p></div>")
+    page.record_description(cards[1], "<div><p>Forklift driver for our warehouse, night shifts, own car needed.</p></div>")
+
+    scraper = load_scraper()
+    scraper.HUMAN_DELAY_SCALE = 0
+    config = build_replay_config(str(tmp_path))
+    config.update(card_prefilter_enabled=True, title_exclude=["intern"])
+    start_time = scraper.prepare_run(config)
+    try:
+        driver = ReplayDriver(load_fixture_pages(str(tmp_path / "fixtures"))[0])
+        result = scraper.parse_current_page(driver, None, start_time, config)
+    finally:
+        scraper.finish_run(config)
+
+    assert result["cards"] == 3
+    assert result["prefiltered"] == 1  # never clicked
+    assert config["session"].cycle_parsed_jobs == 2
+    assert result["processed"] == 1  # the forklift job was filtered out
+    assert [row["Company"] for row in config["session"].results] == ["Acme"]
+    assert driver.calls["click"] == 2
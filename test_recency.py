@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for posting-date normalization and the recency watermark.
+"""
+
+import datetime
+import time
+
+from modules.recency import RecencyWatermark, parse_posted_at, parse_relative_date
+
+NOW = datetime.datetime(2026, 3, 10, 12, 0)
+
+
+def test_parse_relative_date_uses_the_given_now():
+    assert parse_relative_date("2 days ago", now=NOW) == "2026-03-08"
+    assert parse_relative_date("Reposted 1 week ago", now=NOW) == "2026-03-03"
+    assert parse_relative_date("30+ days ago", now=NOW) == "2026-02-08"
+    assert parse_relative_date("5 hours ago", now=NOW) == "2026-03-10"
+    assert parse_relative_date("Yesterday", now=NOW) == "2026-03-09"
+    assert parse_relative_date("Viewed", now=NOW) == ""
+    assert parse_posted_at("3 minutes ago", now=NOW) == NOW - datetime.timedelta(minutes=3)
+
+
+def test_parse_relative_date_defaults_to_current_time():
+    assert parse_relative_date("today") == datetime.date.today().isoformat()
+
+
+def test_watermark_window_and_known_pages(tmp_path):
+    path = str(tmp_path / "watermark.json")
+    watermark = RecencyWatermark(path, slack_s=0, min_window_s=60)
+    assert watermark.posted_within_s("Planner", "Germany") is None
+
+    cards = [{"job_id": str(n), "date_text": "1 hour ago"} for n in range(3)]
+    watermark.begin_cycle("Planner", "Germany")
+    assert watermark.observe("Planner", "Germany", cards) == 0
+    # Same IDs again in the same cycle are not "known" yet
+    assert watermark.observe("Planner", "Germany", cards) == 0
+    watermark.complete_cycle("Planner", "Germany")
+
+    reloaded = RecencyWatermark(path, slack_s=0, min_window_s=60)
+    assert 60 <= reloaded.posted_within_s("Planner", "Germany") < 120
+    time.sleep(0.01)
+    reloaded.begin_cycle("Planner", "Germany")
+    assert reloaded.is_known("Planner", "Germany", "1")
+    assert reloaded.observe("Planner", "Germany", cards + [{"job_id": "99", "date_text": ""}]) == 3
+    assert "4 known jobs" in reloaded.describe("Planner", "Germany")
+
+
+def test_window_is_fixed_for_the_whole_cycle(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    watermark = RecencyWatermark(None, slack_s=0, min_window_s=60)
+    watermark.begin_cycle("Planner", "Germany")
+    assert watermark.posted_within_s("Planner", "Germany") is None
+    watermark.complete_cycle("Planner", "Germany")
+
+    clock[0] = 1500.0
+    watermark.begin_cycle("Planner", "Germany")
+    assert watermark.posted_within_s("Planner", "Germany") == 500
+    clock[0] = 2000.0  # later pages of the same cycle keep the window
+    assert watermark.posted_within_s("Planner", "Germany") == 500
+    watermark.begin_cycle("Planner", "Germany")  # resume: still the same cycle
+    assert watermark.posted_within_s("Planner", "Germany") == 500
+
+    watermark.complete_cycle("Planner", "Germany")
+    clock[0] = 2300.0
+    watermark.begin_cycle("Planner", "Germany")
+    assert watermark.posted_within_s("Planner", "Germany") == 800
+
+
+def test_known_ids_are_bounded():
+    watermark = RecencyWatermark(None, max_known_ids=5)
+    watermark.observe("a", "b", [{"job_id": str(n)} for n in range(8)])
+    assert "5 known jobs" in watermark.describe("a", "b")
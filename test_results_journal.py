@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only results journal.
+"""
+
+import pytest
+
+from modules.job_records import RESULT_COLUMNS
+from modules.results_journal import ResultsJournal, journal_path_for, read_summary
+
+
+def test_journal_appends_and_reloads(tmp_path):
+    path = journal_path_for(str(tmp_path / "usa_planning_jobs.xlsx"))
+    assert path.endswith("usa_planning_jobs.journal.ndjson")
+
+    journal = ResultsJournal(path, reset=True)
+    journal.append({"Company": "Acme", "Remote": True})
+    journal.append({"Company": "Beta", "Remote": False, "Job URL": None})
+    journal.close()
+
+    reopened = ResultsJournal(path)
+    assert reopened.count == 2
+    assert reopened.columns() == ["Company", "Remote", "Job URL"]
+    assert [row["Company"] for row in reopened.iter_rows()] == ["Acme", "Beta"]
+    reopened.close()
+
+    assert ResultsJournal(path, reset=True).count == 0
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    path = str(tmp_path / "j.ndjson")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"Company": "Acme"}\n{"Company": "Be')
+    journal = ResultsJournal(path)
+    assert journal.count == 1
+    journal.close()
+
+
+def test_rebuild_writes_summary_cells(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    output = str(tmp_path / "out.xlsx")
+    journal = ResultsJournal(journal_path_for(output), reset=True)
+    for i in range(3):
+        journal.append({"Company": f"C{i}", "Elapsed Time (s)": float(i)})
+    assert journal.maybe_rebuild(output, interval_s=3600) is False
+    assert journal.rebuild_excel(output) is True
+    journal.close()
+
+    sheet = openpyxl.load_workbook(output).active
+    assert sheet["A1"].value == "Company"
+    assert sheet["A4"].value == "C2"
+    assert sheet["C1"].value == "Checked companies:"
+    assert sheet["D1"].value == 3
+    assert read_summary(sheet) == ("Checked companies:", 3)
+
+
+def test_summary_does_not_overwrite_headers(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    output = str(tmp_path / "out.xlsx")
+    journal = ResultsJournal(journal_path_for(output), reset=True)
+    row = {name: "x" for name, _ in RESULT_COLUMNS}
+    journal.append(row)
+    assert journal.rebuild_excel(output) is True
+    journal.close()
+
+    header = [cell.value for cell in next(openpyxl.load_workbook(output).active.iter_rows(max_row=1))]
+    assert header == [name for name, _ in RESULT_COLUMNS] + ["Checked companies:", 1]
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental run statistics and the chart cache.
+"""
+
+import statistics
+
+import pytest
+
+from modules.run_stats import ChartCache, RunningStats
+
+
+def make_rows(elapsed_times):
+    return [{"Elapsed Time (s)": t, "Remote": i % 2 == 0, "Anaplan": True} for i, t in enumerate(elapsed_times)]
+
+
+def test_welford_matches_batch_statistics():
+    elapsed = [0.0, 3.0, 4.5, 10.0, 11.0, 19.5]
+    stats = RunningStats(window=3)
+    for row in make_rows(elapsed):
+        stats.add(row)
+    diffs = [b - a for a, b in zip(elapsed, elapsed[1:])]
+    assert stats.n == len(diffs)
+    assert stats.mean == pytest.approx(statistics.mean(diffs))
+    assert stats.variance == pytest.approx(statistics.variance(diffs))
+    assert [d for _, d in stats.recent] == pytest.approx(diffs[-3:])
+    assert stats.counts["Remote"] == 3
+    assert stats.counts["Anaplan"] == 6
+    assert stats.counts["SAP APO"] == 0
+
+
+def test_charts_are_cached_until_aggregates_change():
+    pytest.importorskip("matplotlib")
+    stats = RunningStats()
+    cache = ChartCache(stats, refresh_every=5)
+    assert cache.images() == []
+
+    for row in make_rows([0.0, 2.0, 4.0]):
+        stats.add(row)
+    first = cache.images()
+    assert len(first) == 2 and cache.renders == 2
+
+    stats.add({"Elapsed Time (s)": 6.0})
+    cache.images()
+    assert cache.renders == 2  # one steady point, counts unchanged: served from cache
+
+    for t in (8.0, 10.0, 12.0, 14.0):
+        stats.add({"Elapsed Time (s)": t})
+    cache.images()
+    assert cache.renders == 3  # p-chart refreshed after refresh_every new points
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared scraper session state.
+"""
+
+import threading
+
+from modules.scraper_session import ScraperSession
+
+
+def test_new_and_duplicate_matches_across_cycles():
+    session = ScraperSession()
+    assert session.record_match("Acme", "Planner") is True
+    assert session.record_match(" acme ", "PLANNER") is False
+    session.record_seen_skip(True, "Beta", "Analyst")
+    session.record_seen_skip(False, "Gamma", "Driver")
+
+    assert session.cycle_new_matches == 3
+    assert session.cycle_skipped_seen == 2
+    assert session.unique_jobs_discovered == 1
+    assert session.validate()
+
+    session.reset_cycle()
+    assert session.cycle_number == 2
+    assert session.cycle_new_matches == 0 and session.cycle_new_jobs_only == []
+    assert session.record_match("Acme", "Planner") is False
+    assert session.total_matches_all_time == 4
+
+
+def test_parallel_workers_alert_each_job_once():
+    session = ScraperSession()
+    new_flags = []
+
+    def worker():
+        for i in range(200):
+            new_flags.append(session.record_match(f"Company {i}", "Planner"))
+            session.add_parsed()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(new_flags) == 200
+    assert session.cycle_parsed_jobs == 800
+    assert session.total_matches_all_time == 800
+    assert session.validate()
+
+
+def test_analysis_cache_counters_in_summary():
+    session = ScraperSession()
+    assert not any("Analysis cache" in line for line in session.statistics_lines())
+    session.record_analysis(True)
+    session.record_analysis(False)
+    session.record_analysis(True)
+    assert "• Analysis cache: 2 hits / 1 misses" in session.statistics_lines()
+    session.reset_cycle()
+    assert session.cycle_analysis_hits == 0 and session.cycle_analysis_misses == 0
+
+
+def test_prefiltered_cards_in_summary():
+    session = ScraperSession()
+    assert not any("pre-filter" in line for line in session.statistics_lines())
+    session.record_prefilter()
+    session.record_prefilter()
+    assert "• Skipped by card pre-filter: 2" in session.statistics_lines()
+    session.reset_cycle()
+    assert session.cycle_prefiltered == 0
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-driven scroll loader (fake driver, no browser).
+"""
+
+from modules.job_cards import CardHarvest
+from modules.scroll_loader import (
+    COUNT_CARDS_JS, SCROLL_STRATEGIES, WAIT_FOR_CARDS_JS, ScrollLoader, ScrollStrategyStats
+)
+
+
+class FakeDriver:
+    """Cards load only when the bottom of the list is reached"""
+
+    def __init__(self, loads_on=("bottom_scroll",), per_step=10, total=25, async_ok=True):
+        self.loads_on = [SCROLL_STRATEGIES[name] for name in loads_on]
+        self.per_step = per_step
+        self.total = total
+        self.cards = 7
+        self.async_ok = async_ok
+        self.async_calls = 0
+
+    def execute_script(self, script, *args):
+        if script == COUNT_CARDS_JS:
+            return self.cards
+        if script in self.loads_on:
+            self.cards = min(self.total, self.cards + self.per_step)
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        assert script == WAIT_FOR_CARDS_JS
+        self.async_calls += 1
+        if not self.async_ok:
+            raise RuntimeError("async scripts unsupported")
+        return self.cards
+
+    def find_elements(self, by, selector):
+        return [object()] * self.cards
+
+
+def test_run_stops_at_target_and_records_yield():
+    driver = FakeDriver()
+    loader = ScrollLoader(driver, jitter=None)
+    plan = ["pixel_scroll", "bottom_scroll", "pixel_scroll", "bottom_scroll", "bottom_scroll"]
+    assert loader.run(plan, target_count=23) == 25
+    assert loader.stats["bottom_scroll"] == {"runs": 2, "gained": 18, "seconds": loader.stats["bottom_scroll"]["seconds"]}
+    assert loader.stats["pixel_scroll"]["gained"] == 0
+    assert "bottom_scroll x2 +18" in loader.describe()
+
+
+def test_run_gives_up_after_idle_steps():
+    driver = FakeDriver(loads_on=())
+    loader = ScrollLoader(driver, jitter=None)
+    assert loader.run(["pixel_scroll"] * 10, max_idle_steps=3) == 7
+    assert loader.stats["pixel_scroll"]["runs"] == 3
+
+
+def test_polling_fallback_without_async_scripts():
+    driver = FakeDriver(async_ok=False)
+    loader = ScrollLoader(driver, quiet_ms=0, jitter=None)
+    assert loader.step("bottom_scroll") == 10
+    loader.step("bottom_scroll")
+    assert driver.async_calls == 1
+
+
+def test_scheduler_learns_best_strategy_and_persists(tmp_path):
+    path = str(tmp_path / "scroll_stats.json")
+    stats = ScrollStrategyStats(path, exploration=0.1, retire_after=3)
+    for name in stats.strategies:
+        stats.record(name, 10 if name == "last_card_into_view" else 0, 1.0)
+    for _ in range(3):
+        stats.record("card_walk", 0, 1.0)
+    assert stats.choose() == "last_card_into_view"
+    assert stats.is_retired("card_walk")
+    stats.record_page(24)
+    stats.save()
+
+    reloaded = ScrollStrategyStats(path, decay=0.5)
+    assert reloaded.arms["last_card_into_view"]["gained"] == 5
+    assert reloaded.target_count() == 24
+    assert "last_card_into_view" in reloaded.describe().split(";")[0]
+
+
+def test_loader_uses_scheduler_steps_and_learned_target():
+    stats = ScrollStrategyStats(None)
+    stats.page_sizes = [17]
+    driver = FakeDriver()
+    loader = ScrollLoader(driver, jitter=None, scheduler=stats)
+    assert loader.run(target_count=None) == 17
+    assert stats.arms["bottom_scroll"]["gained"] == 10
+    assert sum(arm["runs"] for arm in stats.arms.values()) == 4
+    assert stats.page_sizes[-1] == 17
+
+
+def test_harvester_measures_progress_while_dom_count_stays_flat():
+    class VirtualizedDriver(FakeDriver):
+        """DOM always holds 7 cards; every bottom scroll renders the next 7 IDs"""
+
+        def __init__(self):
+            super().__init__(loads_on=())
+            self.offset = 0
+
+        def execute_script(self, script, *args):
+            if script == SCROLL_STRATEGIES["bottom_scroll"]:
+                self.offset = min(self.offset + 7, 18)
+                return None
+            if script == COUNT_CARDS_JS:
+                return 7
+            if "querySelectorAll(cardSelector)" in script:
+                return [{"title": "T", "company": "C", "url": f"/jobs/view/{n}/"} for n in range(self.offset, self.offset + 7)]
+            return None
+
+    harvest = CardHarvest()
+    loader = ScrollLoader(VirtualizedDriver(), jitter=None, harvester=harvest)
+    assert loader.run(["bottom_scroll"] * 5, target_count=25, max_idle_steps=2) == 25
+    assert len(harvest) == 25
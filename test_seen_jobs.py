@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent seen-job index.
+"""
+
+import threading
+import time
+
+from modules.seen_jobs import SeenJobIndex
+
+
+def test_matched_jobs_are_skipped_after_reload(tmp_path):
+    path = str(tmp_path / "seen.json")
+    index = SeenJobIndex(path)
+    index.mark("101", True, "Acme", "Planner", "sig-a", cycle=1)
+    index.mark("102", False, "Beta", "Driver", "sig-a", cycle=1)
+    index.save()
+
+    reloaded = SeenJobIndex(path)
+    assert len(reloaded) == 2
+    assert reloaded.lookup("101", "sig-b")["matched"] is True
+    assert reloaded.lookup("102", "sig-a") is not None
+    assert reloaded.lookup("999", "sig-a") is None
+    assert reloaded.lookup(None, "sig-a") is None
+
+
+def test_unmatched_jobs_are_rechecked_when_filters_change_or_expire(tmp_path):
+    index = SeenJobIndex(str(tmp_path / "seen.json"), ttl_days=1)
+    index.mark("102", False, "Beta", "Driver", "sig-a")
+    assert index.lookup("102", "sig-b") is None
+
+    index._entries["102"]["analyzed_at"] = time.time() - 2 * 86400
+    assert index.lookup("102", "sig-a") is None
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / "seen.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert len(SeenJobIndex(str(path))) == 0
+
+
+def test_concurrent_saves_and_expired_entries_are_dropped(tmp_path):
+    path = str(tmp_path / "seen.json")
+    index = SeenJobIndex(path, ttl_days=1)
+    index.mark("old", True, "Acme", "Planner", "sig-a")
+    index._entries["old"]["analyzed_at"] = time.time() - 2 * 86400
+
+    def worker(n):
+        for i in range(20):
+            index.mark(f"{n}-{i}", False, "Beta", "Driver", "sig-a")
+            index.save()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    index.save()
+
+    reloaded = SeenJobIndex(path)
+    assert len(reloaded) == 80
+    assert "old" not in reloaded
+    assert not (tmp_path / "seen.json.tmp").exists()
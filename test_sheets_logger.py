@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached Sheets logger and its local dedup-key index (fake worksheet, no network).
+"""
+
+import re
+import time
+
+import pytest
+
+pytest.importorskip("gspread")
+
+from modules.sheets_logger import SheetsEventLogger, SheetsWriteBehindSink
+
+
+class FakeWorksheet:
+    def __init__(self, rows):
+        self.rows = [list(r) for r in rows]
+        self.full_downloads = 0
+        self.appends = 0
+
+    def row_values(self, n):
+        return list(self.rows[n - 1]) if len(self.rows) >= n else []
+
+    def get_all_values(self):
+        self.full_downloads += 1
+        return [list(r) for r in self.rows]
+
+    def get(self, a1_range):
+        rows = [int(n) for n in re.findall(r"(\d+)", a1_range)]
+        col = self.rows[0].index("Company")
+        out = [[r[col]] for r in self.rows[rows[0] - 1:rows[1]] if len(r) > col and r[col]]
+        return out
+
+    def update_cell(self, row, col, value):
+        while len(self.rows[0]) < col:
+            self.rows[0].append("")
+        self.rows[0][col - 1] = value
+
+    def append_rows(self, rows, value_input_option=None):
+        self.appends += 1
+        start = len(self.rows) + 1
+        self.rows.extend(rows)
+        return {"updates": {"updatedRange": f"Sheet1!A{start}:V{len(self.rows)}"}}
+
+    def batch_update(self, data, value_input_option=None):
+        self.batch_updates = getattr(self, "batch_updates", 0) + 1
+        for item in data:
+            row_number = int(re.match(r"A(\d+):", item["range"]).group(1))
+            self.rows[row_number - 1] = list(item["values"][0])
+
+
+HEADERS = ["Timestamp", "Stage", "Company", "Vacancy Title", "TG message sent"]
+
+
+def event(company, stage="Viewed", tg=""):
+    return {"Timestamp": "t", "Stage": stage, "Company": company, "Vacancy Title": "Planner", "TG message sent": tg}
+
+
+def make_logger(tmp_path, sheet):
+    logger = SheetsEventLogger("creds.json", "https://sheet", cache_dir=str(tmp_path))
+    logger._worksheet = sheet
+    logger.headers = sheet.row_values(1)
+    return logger
+
+
+def test_full_download_happens_once_then_index_is_kept_current(tmp_path):
+    sheet = FakeWorksheet([HEADERS, ["t", "Viewed", "Acme", "Planner", ""]])
+    logger = make_logger(tmp_path, sheet)
+
+    assert logger.log_events([event("Acme"), event("Beta"), event("Beta")]) == 1
+    assert logger.log_events([event("Gamma"), event("Beta")]) == 1
+    assert sheet.full_downloads == 1
+    assert [r[2] for r in sheet.rows[1:]] == ["Acme", "Beta", "Gamma"]
+
+    # New process: persisted index + cheap probe, no full download
+    reloaded = make_logger(tmp_path, sheet)
+    assert reloaded.log_events([event("Acme"), event("Delta")]) == 1
+    assert sheet.full_downloads == 1
+
+
+def test_external_rows_trigger_resync(tmp_path):
+    sheet = FakeWorksheet([HEADERS])
+    make_logger(tmp_path, sheet).log_events([event("Acme")])
+    sheet.rows.append(["t", "Viewed", "Zeta", "Planner", ""])  # written by someone else
+
+    logger = make_logger(tmp_path, sheet)
+    assert logger.log_events([event("Zeta")]) == 0
+    assert logger.resyncs == 1
+
+
+def job_row(company, stage, tg="", history="Viewed"):
+    return {"Timestamp": "t", "Stage": stage, "Company": company, "Vacancy Title": "Planner", "TG message sent": tg,
+            "Cycle #": 1, "Stage History": history}
+
+
+def test_compacted_rows_are_updated_in_place(tmp_path):
+    sheet = FakeWorksheet([HEADERS + ["Cycle #", "Stage History"]])
+    logger = make_logger(tmp_path, sheet)
+    assert logger.log_events([job_row("Acme", "Passed filters", history="Viewed > Passed filters"),
+                              job_row("Beta", "Filtered (criteria)")]) == 2
+
+    # Later page: Acme's alert was sent, Beta seen again without progress, Gamma is new
+    reloaded = make_logger(tmp_path, sheet)
+    assert reloaded.log_events([job_row("Acme", "Passed filters", "yes", "Viewed > Passed filters > TG sent"),
+                                job_row("Beta", "Viewed"), job_row("Gamma", "Viewed")]) == 2
+    assert [(r[2], r[1], r[4]) for r in sheet.rows[1:]] == [
+        ("Acme", "Passed filters", "yes"), ("Beta", "Filtered (criteria)", ""), ("Gamma", "Viewed", "")]
+    assert sheet.appends == 2 and sheet.batch_updates == 1
+
+    # A re-sync rebuilds the row index from the sheet
+    reloaded.resync()
+    assert reloaded.job_rows["Gamma-Planner-1"][0] == 4
+
+
+class QuotaError(Exception):
+    def __init__(self):
+        super().__init__("APIError: [429]: Quota exceeded for quota metric 'Write requests'")
+
+
+def test_header_changes_are_one_update(tmp_path):
+    sheet = FakeWorksheet([["Timestamp", "Stage"]])
+    updates = []
+    sheet.update = lambda range_name=None, values=None: updates.append((range_name, values)) or sheet.rows[0].extend(values[0])
+    logger = make_logger(tmp_path, sheet)
+    logger.log_events([event("Acme")])
+    assert updates == [("C1:E1", [["Company", "Vacancy Title", "TG message sent"]])]
+
+
+def test_write_behind_sink_survives_restart_and_quota_errors(tmp_path):
+    sheet = FakeWorksheet([HEADERS])
+    logger = make_logger(tmp_path, sheet)
+    queue_path = str(tmp_path / "pending.ndjson")
+
+    real_append = sheet.append_rows
+    failures = [QuotaError()]
+
+    def flaky_append(rows, value_input_option=None):
+        if failures:
+            raise failures.pop()
+        return real_append(rows, value_input_option)
+    sheet.append_rows = flaky_append
+
+    # Worker effectively paused (1 write/min budget, first write already "spent")
+    sink = SheetsWriteBehindSink(logger, queue_path, writes_per_minute=1, min_writes_per_minute=1)
+    sink._last_write = time.monotonic()
+    sink.submit([event("Acme"), event("Beta")])
+    assert sink.queue_depth() == 2
+    sink._stop.set()
+    sink._wakeup.set()
+    sink._thread.join(timeout=5)
+
+    restarted = SheetsWriteBehindSink(logger, queue_path, writes_per_minute=600)
+    assert restarted.queue_depth() == 2
+    assert restarted.close(timeout=10)
+    assert [r[2] for r in sheet.rows[1:]] == ["Acme", "Beta"]
+    assert restarted.writes_per_minute == 301  # halved on the 429, +1 after the successful write
+    assert open(queue_path, encoding="utf-8").read() == ""
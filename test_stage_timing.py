@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for per-stage timers and HDR-style latency histograms.
+"""
+
+import json
+
+import pytest
+
+from modules.stage_timing import LatencyHistogram, StageTimings, stage_timings_path_for
+
+
+def test_histogram_percentiles_within_one_percent():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.01)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.01)
+    assert histogram.percentile(100) == 1.0
+    assert histogram.mean == pytest.approx(0.5005, rel=1e-6)
+    # 1000 values spread over three decades fit in a few hundred buckets
+    assert len(histogram.buckets) < 600
+
+
+def test_histogram_merge():
+    fast, slow = LatencyHistogram(), LatencyHistogram()
+    for _ in range(90):
+        fast.record(0.01)
+    for _ in range(10):
+        slow.record(12.0)
+    fast.merge(slow)
+    assert fast.count == 100
+    assert fast.percentile(50) == pytest.approx(0.01, rel=0.01)
+    assert fast.percentile(95) == pytest.approx(12.0, rel=0.01)
+    assert fast.max_us == 12_000_000
+
+
+def test_measure_records_on_exception_and_export_resets(tmp_path):
+    timings = StageTimings()
+    with pytest.raises(ValueError):
+        with timings.measure("click"):
+            raise ValueError("stale element")
+    for seconds in (0.5, 1.5):
+        timings.record("description_wait", seconds)
+    assert timings.histogram("click").count == 1
+    assert timings.summary_lines()[0].startswith("description_wait: n=2")
+
+    path = stage_timings_path_for(str(tmp_path / "jobs.xlsx"))
+    assert path.endswith("jobs.stage_timings.ndjson")
+    timings.export(path, 1, keyword="anaplan")
+    timings.reset()
+    timings.record("click", 0.1)
+    timings.export(path, 2, keyword="anaplan")
+
+    with open(path, encoding="utf-8") as f:
+        cycles = [json.loads(line) for line in f]
+    assert [c["cycle"] for c in cycles] == [1, 2]
+    assert cycles[0]["stages"]["description_wait"]["count"] == 2
+    assert cycles[0]["stages"]["description_wait"]["total_s"] == pytest.approx(2.0)
+    assert set(cycles[1]["stages"]) == {"click"}
+
+
+def test_stage_timings_merge_adds_runs():
+    total, run = StageTimings(), StageTimings()
+    run.record("click", 0.2)
+    run.record("page", 1.0)
+    total.merge(run)
+    total.merge(run)
+    assert total.histogram("click").count == 2
+    assert total.snapshot()["page"]["total_s"] == pytest.approx(2.0, rel=0.01)
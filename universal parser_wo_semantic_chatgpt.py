@@ -3,20 +3,18 @@ import logging
 import time
 import io
 import threading
+import queue
 import tkinter as tk
 import tkinter.messagebox as messagebox
 import tkinter.filedialog as filedialog
 import pandas as pd
-import requests
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 from openpyxl import load_workbook
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from langdetect import detect, LangDetectException
 import undetected_chromedriver as uc
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.action_chains import ActionChains
@@ -24,6 +22,29 @@ import os  # для shutdown системы
 import json
 import re
 import random
+import contextlib
+from modules.keyword_matcher import KeywordMatcher, KeywordScan
+from modules.job_cards import (
+    JOB_CARD_SELECTOR, DATE_MARKERS, DATE_SELECTORS, CardHarvest, locate_job_card, normalize_card
+)
+from modules.seen_jobs import SeenJobIndex
+from modules.results_journal import ResultsJournal, journal_path_for, read_summary, SUMMARY_LABEL
+from modules.run_stats import RunningStats, ChartCache
+from modules.notifier import TelegramNotifier, AlertDigest, spool_dir_for
+from modules.sheets_logger import SheetsEventLogger, SheetsWriteBehindSink, queue_path_for
+from modules.scraper_session import ScraperSession
+from modules.scroll_loader import ScrollLoader, ScrollStrategyStats, DEFAULT_SCROLL_PLAN
+from modules.crawl_checkpoint import CrawlCheckpoint
+from modules.recency import RecencyWatermark, parse_relative_date
+from modules.page_replay import FixtureRecorder
+from modules.stage_timing import StageTimings, stage_timings_path_for
+from modules.language_detect import LanguageDetector, parse_language_list, language_allowed
+from modules.analysis_cache import AnalysisCache, analysis_key
+from modules.job_records import JobRecord
+from modules.event_compaction import compact_events
+from modules.card_prefilter import CardPrefilter, parse_pattern_list
+from modules.crawl_planner import CrawlPlanner
+from modules.job_payloads import CdpNetworkCapture, performance_logging_capability
 
 # ================================
 # Настройка логирования
@@ -50,6 +71,13 @@ PROFILES = {
     "dummy": r"C:\Users\potre\SeleniumProfileDummy"
 }
 ACTIVE_PROFILE = "dummy"  # Change this to switch profiles
+# Extra profiles for the parallel worker pool (worker 0 uses the profile above);
+# workers without an entry get "<profile>_worker<N>" next to it
+WORKER_PROFILES = {
+    "worker1": r"C:\Users\potre\SeleniumProfileWorker1",
+    "worker2": r"C:\Users\potre\SeleniumProfileWorker2",
+    "worker3": r"C:\Users\potre\SeleniumProfileWorker3",
+}
 
 def validate_and_get_profile_path():
     """Validate profile exists and return path"""
@@ -59,9 +87,12 @@ def validate_and_get_profile_path():
         logging.info(f"Created new profile directory: {profile_path}")
     return profile_path
 
+# Множитель всех "человеческих" пауз; offline replay (replay_benchmark.py) ставит 0
+HUMAN_DELAY_SCALE = 1.0
+
 def get_random_delay(min_sec=2, max_sec=8):
     """Get random delay for behavioral disguise"""
-    return random.uniform(min_sec, max_sec)
+    return random.uniform(min_sec, max_sec) * HUMAN_DELAY_SCALE
 
 def generate_output_filename(country, keyword):
     """Generate output filename from country and keyword"""
@@ -141,6 +172,9 @@ KEYWORDS_PLANNING = [
     "logistics planning", "operations planning", "master production scheduling", "forecasting", "s&op",
     "sales and operations planning", "warehouse planning", "network planning", "procurement planning"
 ]
+ALREADY_APPLIED_MARKERS = [
+    "applied", "see application", "you have already applied", "already submitted", "previously applied"
+]
 ALL_KEYWORDS = (
     KEYWORDS_VISA
     + KEYWORDS_ANAPLAN
@@ -150,83 +184,139 @@ ALL_KEYWORDS = (
     + REMOTE_REQUIREMENTS
 )
 
-# Глобальные переменные
-results = []
-total_vacancies_checked = 0
+def describe_filter_config(config):
+    """Human-readable filter settings (also used as the seen-index signature)"""
+    return (
+        f"Remote:{config.get('require_remote', False)}, Visa:{config.get('require_visa', False)}, "
+        f"Logic:{config.get('location_logic','OR')}, Skills:{config.get('require_skills',False)}, "
+        f"Block:{config.get('block_remote_prohibited',False)}"
+    ) + (f", Lang:{','.join(sorted(parse_language_list(config.get('target_languages'))))}"
+         if config.get("target_languages") else "") + (
+        f", {prefilter}" if (prefilter := CardPrefilter.from_config(config).describe()) else "")
+
+def get_seen_index_path(config):
+    """Seen-job index lives next to the output files so all keyword/country runs share it"""
+    if config.get("seen_index_path"):
+        return config["seen_index_path"]
+    output_dir = os.path.dirname(config.get("output_file_path", "")) or os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(output_dir, "seen_jobs_index.json")
 
-# Cycle tracking variables
-cycle_number = 1
-cycle_parsed_jobs = 0
-cycle_new_matches = 0
-cycle_matched_jobs = []  # List of {company, position} dicts for current cycle
-cycle_new_jobs_only = []  # NEW: List of truly new jobs (not seen in previous cycles)
-total_matches_all_time = 0
-unique_jobs_discovered = 0  # NEW: Count of unique jobs discovered across all cycles
-all_time_matched_jobs = set()  # NEW: Track all jobs ever matched across all cycles
+def get_scroll_stats_path(config):
+    """Scroll strategy statistics are kept next to the seen-job index"""
+    if config.get("scroll_stats_path"):
+        return config["scroll_stats_path"]
+    return os.path.join(os.path.dirname(get_seen_index_path(config)), "scroll_strategy_stats.json")
+
+def build_keyword_matcher(config):
+    """Compile the configured keyword lists into one matcher (built once per run)"""
+    return KeywordMatcher({
+        "visa": config.get("keywords_visa") or KEYWORDS_VISA,
+        "anaplan": config.get("keywords_anaplan") or KEYWORDS_ANAPLAN,
+        "sap": config.get("keywords_sap") or KEYWORDS_SAP,
+        "planning": config.get("keywords_planning") or KEYWORDS_PLANNING,
+        "no_relocation": config.get("no_relocation_requirements") or NO_RELOCATION_REQUIREMENTS,
+        "remote": config.get("remote_requirements") or REMOTE_REQUIREMENTS,
+        "remote_prohibited": config.get("remote_prohibited") or REMOTE_PROHIBITED,
+        "already_applied": ALREADY_APPLIED_MARKERS,
+    }, silent=("already_applied",))
 
 # ================================
 # Функция отправки сообщений в Telegram
 # ================================
+TELEGRAM_SPOOL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "telegram_spool")
+_telegram_notifiers = {}
+_telegram_notifiers_lock = threading.Lock()
+
+def get_telegram_notifier(bot_token, chat_id):
+    """One background notifier (worker thread + pooled session + own spool folder) per bot/chat"""
+    with _telegram_notifiers_lock:
+        notifier = _telegram_notifiers.get((bot_token, chat_id))
+        if notifier is None:
+            notifier = TelegramNotifier(bot_token, chat_id,
+                                        spool_dir=spool_dir_for(TELEGRAM_SPOOL_DIR, bot_token, chat_id))
+            _telegram_notifiers[(bot_token, chat_id)] = notifier
+        return notifier
+
+def flush_telegram_notifiers(timeout=60):
+    """Give queued notifications a chance to go out (the spool keeps whatever does not)"""
+    with _telegram_notifiers_lock:
+        notifiers = list(_telegram_notifiers.values())
+    for notifier in notifiers:
+        if not notifier.flush(timeout):
+            logging.warning(f"Telegram queue not drained in {timeout}s - unsent messages stay in the spool")
+        logging.info(notifier.describe())
+
 def send_telegram_message(bot_token, chat_id, message, job_url=None, images=None):
-    """Send Telegram notification with graceful degradation on failure."""
+    """Queue a Telegram notification; a background worker delivers it without blocking the scraper."""
     if not bot_token or not chat_id:
         logging.warning("Telegram not configured, skipping notification")
         return  # Silently skip if not configured
-    
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+
     if job_url:
         message += f"\n\n<a href='{job_url}'>Открыть вакансию на LinkedIn</a>"
-    data = {"chat_id": chat_id, "text": message, "parse_mode": "HTML"}
-    
     try:
-        resp = requests.post(url, data=data, timeout=10)  # Add timeout
-        if resp.status_code == 200:
-            logging.info("Telegram message sent successfully")
-        else:
-            logging.warning(f"Telegram API error: {resp.status_code} - continuing without notification")
-    except requests.exceptions.Timeout:
-        logging.warning("Telegram timeout - continuing without notification")
+        get_telegram_notifier(bot_token, chat_id).send_message(message, images=images)
     except Exception as e:
         logging.warning(f"Telegram unavailable ({str(e)[:50]}) - continuing without notification")
-    
-    if images:
-        url_photo = f"https://api.telegram.org/bot{bot_token}/sendPhoto"
-        for img in images:
-            files = {"photo": img}
-            data = {"chat_id": chat_id}
-            try:
-                resp_img = requests.post(url_photo, files=files, data=data)
-                if resp_img.status_code == 200:
-                    logging.info("Изображение отправлено в Telegram.")
-                else:
-                    logging.error(f"Ошибка при отправке изображения: {resp_img.text}")
-            except Exception as e:
-                logging.error(f"Ошибка подключения к Telegram при отправке изображения: {e}")
+
+def format_job_alert(config, job_company_name, job_title, matched_keywords, top_skills, detected_language, job_url):
+    """Per-job alert block (single message or one entry of a digest)"""
+    return (
+        f"🔔 Найдена вакансия по ключевому слову <b>{config['keyword']}</b>\n"
+        f"Компания: <b>{job_company_name}</b>\n"
+        f"Вакансия: <b>{job_title}</b>\n\n"
+        f"Matched key words: {', '.join(matched_keywords)}\n"
+        f"Навыки: {', '.join(top_skills)}\n"
+        f"Язык описания: {detected_language.upper()}\n\n"
+        f"Ссылка на вакансию: <a href='{job_url}'>{job_url}</a>"
+    )
+
+def build_alert_digest(config, start_time):
+    """Digest mode: new jobs are collected and sent as one message + one chart album"""
+    if not (config.get("telegram_digest") and config.get("telegram_bot_token") and config.get("telegram_chat_id")):
+        return None
+
+    def header(count):
+        running_minutes = (time.perf_counter() - start_time) / 60
+        journal = config.get("results_journal")
+        session = config["session"]
+        lines = [f"🔔 Новых вакансий: {count} (ключевое слово <b>{config['keyword']}</b>)", ""]
+        lines += build_cycle_statistics_lines(session)
+        lines += ["", f"Всего проверено вакансий: {session.total_vacancies_checked}",
+                  get_excel_summary(config["output_file_path"], running_minutes,
+                                    checked_count=journal.count if journal else None)]
+        return "\n".join(lines)
+
+    return AlertDigest(
+        get_telegram_notifier(config["telegram_bot_token"], config["telegram_chat_id"]),
+        window_s=config.get("digest_window_s", 300),
+        max_jobs=config.get("digest_max_jobs", 10),
+        header_fn=header,
+        images_fn=lambda: create_chart_images(config),
+    )
 
 # ================================
 # Cycle Summary Functions
 # ================================
-def generate_cycle_summary_message():
+def build_cycle_statistics_lines(session):
+    """Statistics block shared by the cycle summary and digest headers"""
+    return session.statistics_lines()
+
+def generate_cycle_summary_message(session):
     """Generate cycle summary message with matched jobs list"""
-    global cycle_number, cycle_parsed_jobs, cycle_new_matches, total_matches_all_time, cycle_new_jobs_only, unique_jobs_discovered
-    
     # Validate state before generating summary
-    if not validate_cycle_state():
+    if not validate_cycle_state(session):
         logging.error("Cycle state validation failed during summary generation")
-    
-    # Calculate duplicates found this cycle
-    duplicates_this_cycle = cycle_new_matches - len(cycle_new_jobs_only)
-    
+
+    with session.lock:
+        cycle_number = session.cycle_number
+        cycle_new_jobs_only = list(session.cycle_new_jobs_only)
+
     # Build the main summary
     message_lines = [
         f"🔄 Cycle #{cycle_number} Completed",
         "",
-        "📊 Statistics:",
-        f"• Jobs scanned: {cycle_parsed_jobs}",
-        f"• Matches found this cycle: {cycle_new_matches} ({len(cycle_new_jobs_only)} new, {duplicates_this_cycle} duplicates)",
-        f"• Unique jobs discovered to date: {unique_jobs_discovered}",
-        f"• Total match occurrences: {total_matches_all_time}",
-    ]
+    ] + build_cycle_statistics_lines(session)
     
     # Add NEW jobs list if any (only jobs not seen in previous cycles)
     if cycle_new_jobs_only:
@@ -248,53 +338,29 @@ def generate_cycle_summary_message():
     
     return "\n".join(message_lines)
 
-def validate_cycle_state():
+def validate_cycle_state(session):
     """Validate that cycle tracking variables are consistent"""
-    global unique_jobs_discovered, total_matches_all_time, all_time_matched_jobs, cycle_new_matches, cycle_new_jobs_only
-    
-    # Validate that unique jobs counter matches the set size
-    if unique_jobs_discovered != len(all_time_matched_jobs):
-        logging.error(f"State inconsistency: unique_jobs_discovered={unique_jobs_discovered}, but set size={len(all_time_matched_jobs)}")
-        return False
-    
-    # Validate that unique jobs count doesn't exceed total matches
-    if unique_jobs_discovered > total_matches_all_time:
-        logging.error(f"State inconsistency: unique_jobs_discovered={unique_jobs_discovered} > total_matches_all_time={total_matches_all_time}")
-        return False
-    
-    # Validate cycle consistency  
-    duplicates_this_cycle = cycle_new_matches - len(cycle_new_jobs_only)
-    if duplicates_this_cycle < 0:
-        logging.error(f"Cycle inconsistency: cycle_new_matches={cycle_new_matches} < cycle_new_jobs_only={len(cycle_new_jobs_only)}")
-        return False
-    
-    return True
+    return session.validate()
 
-def reset_cycle_counters():
+def reset_cycle_counters(session):
     """Reset cycle-specific counters for new cycle"""
-    global cycle_parsed_jobs, cycle_new_matches, cycle_matched_jobs, cycle_new_jobs_only, cycle_number
-    
-    # Validate state before reset
-    if not validate_cycle_state():
-        logging.warning("Cycle state validation failed before reset - continuing anyway")
-    
-    cycle_parsed_jobs = 0
-    cycle_new_matches = 0
-    cycle_matched_jobs = []
-    cycle_new_jobs_only = []  # Reset new jobs list for next cycle
-    cycle_number += 1
-    logging.info(f"Starting cycle #{cycle_number}")
+    session.reset_cycle()
 
 # ================================
 # Работа с Excel
 # ================================
-def get_excel_summary(file_path, running_time_minutes):
+def get_excel_summary(file_path, running_time_minutes, checked_count=None):
+    if checked_count is not None:
+        # Счётчик из журнала — без чтения всего workbook на каждое уведомление
+        return f"Running time, min: {running_time_minutes:.2f}\nChecked companies: {checked_count}"
     try:
         wb = load_workbook(file_path)
         sheet = wb.active
         summary = []
         summary.append(f"Running time, min: {running_time_minutes:.2f}")
-        summary.append(f"Checked companies: {sheet['S1'].value} {sheet['T1'].value}")
+        checked = read_summary(sheet)
+        if checked:
+            summary.append(f"Checked companies: {checked[0]} {checked[1]}")
         return "\n".join(summary)
     except FileNotFoundError:
         # Excel file doesn't exist yet (first run) - this is normal
@@ -306,86 +372,69 @@ def get_excel_summary(file_path, running_time_minutes):
 
 def save_results_to_file_with_calculations(results, output_file, elapsed_time):
     try:
-        df = pd.DataFrame(results)
-        true_count = sum(
-            any(value is True for key, value in row.items() if key not in ["Elapsed Time (s)", "Job URL"])
-            for row in results
-        )
-        ratio = true_count / len(df) if len(df) > 0 else 0
+        # ColumnarResults строит DataFrame по колонкам, без промежуточного списка словарей
+        df = results.to_dataframe() if hasattr(results, "to_dataframe") else pd.DataFrame(results)
         processed_companies = len(df)
-        avg_time_per_company = elapsed_time / processed_companies if processed_companies > 0 else 0
 
         with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
             df.to_excel(writer, index=False, sheet_name="Results")
-            wb = writer.book
             sheet = writer.sheets["Results"]
-            sheet["S1"] = "Checked companies:"
-            sheet["T1"] = processed_companies
+            # Summary after the last column, so it never overwrites a header
+            sheet.cell(row=1, column=df.shape[1] + 1, value=SUMMARY_LABEL)
+            sheet.cell(row=1, column=df.shape[1] + 2, value=processed_companies)
 
         logging.info(f"Результаты сохранены в файл: {output_file}")
     except Exception as e:
         logging.error(f"Ошибка при сохранении результатов в Excel: {e}")
 
+def record_result(config, row):
+    """Keep the row in memory for charts and append it to the results journal"""
+    config["session"].add_result(row)
+    if config.get("run_stats"):
+        config["run_stats"].add(row)
+    journal = config.get("results_journal")
+    if journal:
+        journal.append(row)
+
+_excel_write_lock = threading.Lock()  # pool workers share one output workbook
+
+def flush_results(config, elapsed_time, force=False):
+    """Rebuild the Excel file: from the journal on interval/cycle end, or the legacy full rewrite"""
+    journal = config.get("results_journal")
+    with _excel_write_lock:
+        if journal is None:
+            save_results_to_file_with_calculations(config["session"].results, config["output_file_path"], elapsed_time)
+        elif force:
+            journal.rebuild_excel(config["output_file_path"])
+        else:
+            journal.maybe_rebuild(config["output_file_path"], config.get("excel_rebuild_interval_s", 300))
+
 # ================================
 # Построение аналитики
 # ================================
-def create_p_chart(results):
-    if len(results) < 2:
-        return None
-    df = pd.DataFrame(results)
-    try:
-        df["Elapsed Time (s)"] = df["Elapsed Time (s)"].astype(float)
-        df["Time Difference (s)"] = df["Elapsed Time (s)"].diff()
-        time_diffs = df["Time Difference (s)"][1:].tail(50)
-        avg_time_diff = time_diffs.mean()
-        plt.figure(figsize=(10, 5))
-        plt.plot(time_diffs.index, time_diffs, marker='o', linestyle='-', color='b', label='Time Difference (s)')
-        plt.axhline(y=avg_time_diff, color='r', linestyle='--', label=f'Avg Diff ({avg_time_diff:.2f}s)')
-        plt.fill_between(time_diffs.index, avg_time_diff, time_diffs,
-                         where=(time_diffs > avg_time_diff), color='red', alpha=0.1)
-        plt.fill_between(time_diffs.index, avg_time_diff, time_diffs,
-                         where=(time_diffs < avg_time_diff), color='green', alpha=0.1)
-        plt.xlabel('Listing Index')
-        plt.ylabel('Time Diff (s)')
-        plt.title('P-Chart: Time Difference (Last 50)')
-        plt.legend()
-        plt.grid(True)
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        plt.close()
-        return buf
-    except Exception as e:
-        logging.error(f"Ошибка при построении p-chart: {e}")
-        return None
-
-def create_bar_chart(results):
-    if not results:
-        return None
-    df = pd.DataFrame(results)
-    criteria = ["Visa Sponsorship or Relocation", "Anaplan", "SAP APO", "Planning", "No Relocation Support", "Remote", "Remote Prohibited"]
-    try:
-        counts = {crit: df[crit].sum() if crit in df.columns else 0 for crit in criteria}
-        plt.figure(figsize=(8, 5))
-        plt.bar(counts.keys(), counts.values(), color='skyblue')
-        plt.xlabel('Criteria')
-        plt.ylabel('Count')
-        plt.title('Distribution of Criteria in Processed Jobs')
-        num_labels = len(counts)
-        fontsize = max(6, 14 - num_labels)
-        plt.xticks(rotation=45, fontsize=fontsize)
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        plt.close()
-        return buf
-    except Exception as e:
-        logging.error(f"Ошибка при построении бар-чарта: {e}")
-        return None
+def create_chart_images(config):
+    """p-chart + bar chart PNGs from the incremental stats (re-rendered only when they change enough)"""
+    chart_cache = config.get("chart_cache")
+    if chart_cache is None:
+        chart_cache = config["chart_cache"] = ChartCache(config.setdefault("run_stats", RunningStats()))
+    return chart_cache.images()
 
 # ================================
 # Google Sheets Integration
 # ================================
+SHEETS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheets_cache")
+_sheets_loggers = {}
+_sheets_loggers_lock = threading.Lock()
+
+def get_sheets_logger(credentials_path, sheet_url):
+    """Long-lived Sheets client + local dedup-key index, one per sheet"""
+    with _sheets_loggers_lock:
+        sheets_logger = _sheets_loggers.get((credentials_path, sheet_url))
+        if sheets_logger is None:
+            sheets_logger = SheetsEventLogger(credentials_path, sheet_url, cache_dir=SHEETS_CACHE_DIR)
+            _sheets_loggers[(credentials_path, sheet_url)] = sheets_logger
+        return sheets_logger
+
 def log_parser_event_to_sheets(event_dict, credentials_path, sheet_url, log_sheet_name=None):
     """
     Logs parser event as a new row in the main Google Sheet (not a separate tab).
@@ -394,102 +443,70 @@ def log_parser_event_to_sheets(event_dict, credentials_path, sheet_url, log_shee
     :param sheet_url: str - Google Sheets URL
     :param log_sheet_name: str - ignored (for compatibility)
     """
-    import gspread
     if not credentials_path or not sheet_url:
         logging.debug("Google Sheets not configured, skipping log")
         return  # Silently skip if not configured
     
+    sheets_logger = get_sheets_logger(credentials_path, sheet_url)
     try:
-        gc = gspread.service_account(filename=credentials_path)
-        sh = gc.open_by_url(sheet_url)
-        worksheet = sh.sheet1
-        # Ensure header exists
-        headers = worksheet.row_values(1)
-        # Add any missing columns from event_dict
-        for col in event_dict.keys():
-            if col not in headers:
-                worksheet.update_cell(1, len(headers)+1, col)
-                headers.append(col)
-        # --- Duplicate check logic ---
-        key_fields = ["Company", "Vacancy Title", "Stage", "TG message sent"]
-        key_indices = [headers.index(f)+1 for f in key_fields if f in headers]
-        if len(key_indices) == 4:
-            all_rows = worksheet.get_all_values()[1:]
-            existing_keys = set()
-            for row in all_rows:
-                try:
-                    key = "-".join([row[i-1] for i in key_indices])
-                    existing_keys.add(key)
-                except Exception:
-                    continue
-            new_key = "-".join([str(event_dict.get(f, "")) for f in key_fields])
-            if new_key in existing_keys:
-                logging.info(f"Duplicate event (key: {new_key}) not logged to Google Sheets.")
-                return
-        # Prepare row to append (align to headers)
-        row = [event_dict.get(col, "") for col in headers]
-        worksheet.append_row(row, value_input_option='USER_ENTERED')
+        sheets_logger.log_events([event_dict])
     except FileNotFoundError:
         logging.error(f"Google Sheets credentials file not found: {credentials_path}")
     except Exception as e:
         # Log error but continue - don't crash the scraper
+        sheets_logger.reset_connection()
         logging.warning(f"Could not log to Google Sheets: {str(e)[:100]} - continuing")
 
+_sheets_sinks = {}
+
+def get_sheets_sink(credentials_path, sheet_url):
+    """Write-behind sink: durable local queue + background batched append_rows"""
+    with _sheets_loggers_lock:
+        sink = _sheets_sinks.get((credentials_path, sheet_url))
+    if sink is None:
+        sheets_logger = get_sheets_logger(credentials_path, sheet_url)
+        queue_path = queue_path_for(SHEETS_CACHE_DIR, sheet_url)
+        with _sheets_loggers_lock:
+            sink = _sheets_sinks.get((credentials_path, sheet_url))
+            if sink is None:
+                sink = SheetsWriteBehindSink(sheets_logger, queue_path)
+                _sheets_sinks[(credentials_path, sheet_url)] = sink
+    return sink
+
+def close_sheets_sinks(timeout=60):
+    """Drain queued Sheets events at shutdown (whatever is left is replayed next start)"""
+    with _sheets_loggers_lock:
+        sinks = list(_sheets_sinks.values())
+        _sheets_sinks.clear()
+    for sink in sinks:
+        if not sink.close(timeout):
+            logging.warning(f"Sheets queue not drained: {sink.queue_depth()} events kept for next start")
+
 # === Batch logging to Google Sheets ===
 def batch_log_parser_events_to_sheets(events, credentials_path, sheet_url):
-    import gspread
     if not events:
         return
+    sheets_logger = get_sheets_logger(credentials_path, sheet_url)
     try:
-        gc = gspread.service_account(filename=credentials_path)
-        sh = gc.open_by_url(sheet_url)
-        worksheet = sh.sheet1
-        headers = worksheet.row_values(1)
-        # Add any missing columns from events
-        for event_dict in events:
-            for col in event_dict.keys():
-                if col not in headers:
-                    worksheet.update_cell(1, len(headers)+1, col)
-                    headers.append(col)
-        # --- Duplicate check logic for batch ---
-        key_fields = ["Company", "Vacancy Title", "Stage", "TG message sent"]
-        key_indices = [headers.index(f)+1 for f in key_fields if f in headers]
-        all_rows = worksheet.get_all_values()[1:]
-        existing_keys = set()
-        if len(key_indices) == 4:
-            for row in all_rows:
-                try:
-                    key = "-".join([row[i-1] for i in key_indices])
-                    existing_keys.add(key)
-                except Exception:
-                    continue
-        filtered_events = []
-        for event_dict in events:
-            new_key = "-".join([str(event_dict.get(f, "")) for f in key_fields])
-            if len(key_indices) == 4 and new_key in existing_keys:
-                logging.info(f"Duplicate event (key: {new_key}) not logged to Google Sheets.")
-                continue
-            filtered_events.append(event_dict)
-            existing_keys.add(new_key)
-        if not filtered_events:
-            return
-        rows = [[event_dict.get(col, "") for col in headers] for event_dict in filtered_events]
-        worksheet.append_rows(rows, value_input_option='USER_ENTERED')
+        sheets_logger.log_events(events)
     except Exception as e:
+        sheets_logger.reset_connection()
         logging.error(f"Error batch logging events to Google Sheets: {e}")
 
 # ================================
 # Функция прокрутки с захватом вакансий
 # ================================
-def scroll_until_loaded_linkedin_specific(driver, max_attempts=20, pause_time=1.5):
+def scroll_until_loaded_linkedin_specific(driver, target_count=23, max_idle_steps=6, scroll_stats=None, harvest=None,
+                                          timings=None):
     """
     LINKEDIN-SPECIFIC FIX: Targets LinkedIn's specific lazy loading mechanism.
-    Forces the job list container to load all content by scrolling to specific trigger points.
+    Scroll steps are followed by an event-driven wait (MutationObserver in the page):
+    each step returns as soon as new cards settle or the list goes quiet.
+    With scroll_stats the step order and the target count are learned across runs;
+    with harvest every step also collects the rendered cards (the list is virtualized).
     """
-    from selenium.webdriver.common.by import By
-    import time
-    
     logging.info("Starting LinkedIn-specific scrolling...")
+    started = time.perf_counter()
     
     # Find the specific LinkedIn job list container - EXPANDED SELECTORS
     job_list_selectors = [
@@ -519,367 +536,338 @@ def scroll_until_loaded_linkedin_specific(driver, max_attempts=20, pause_time=1.
         logging.warning("Could not find job container, falling back to body scroll")
         job_container = driver.find_element(By.TAG_NAME, "body")
     
-    prev_count = 0
-    no_change_count = 0
-    
-    # Strategy 1: Scroll to bottom of job container to force loading
+    loader = ScrollLoader(driver, job_container, selector=JOB_CARD_SELECTOR, scheduler=scroll_stats, harvester=harvest,
+                          jitter=(0.1 * HUMAN_DELAY_SCALE, 0.4 * HUMAN_DELAY_SCALE), timings=timings)
+    if scroll_stats:
+        final_count = loader.run(target_count=None, max_idle_steps=max_idle_steps)
+    else:
+        final_count = loader.run(DEFAULT_SCROLL_PLAN, target_count=target_count, max_idle_steps=max_idle_steps)
+    logging.info(f"LINKEDIN SCROLLING COMPLETE: Found {final_count} jobs in {time.perf_counter() - started:.1f}s "
+                 f"({loader.describe()})")
+    return final_count
+
+# ================================
+# Извлечение данных карточки (по одной, fallback для batch-режима)
+# ================================
+def extract_job_card_fields(job):
+    """Per-card WebDriver extraction of title/company/URL/date (slow path)"""
+    date_text = ""
     try:
-        driver.execute_script("""
-            const container = arguments[0];
-            const scrollHeight = container.scrollHeight || document.documentElement.scrollHeight;
-            
-            // Scroll in increments to trigger lazy loading
-            let currentScroll = 0;
-            const scrollStep = Math.max(400, scrollHeight / 10);
-            
-            const scrollInterval = setInterval(() => {
-                currentScroll += scrollStep;
-                window.scrollTo(0, currentScroll);
-                
-                if (currentScroll >= scrollHeight + 1000) {
-                    clearInterval(scrollInterval);
-                }
-            }, 800);
-            
-            // Also scroll the container itself if it's scrollable
-            if (container.scrollHeight > container.clientHeight) {
-                container.scrollTop = container.scrollHeight;
-            }
-        """, job_container)
-        
-        time.sleep(5)  # Wait for JavaScript scrolling to complete
-        
-    except Exception as e:
-        logging.warning(f"JavaScript scroll failed: {e}")
-    
-    # Strategy 2: Manual step-by-step scrolling with job count monitoring  
-    for attempt in range(max_attempts):
-        current_count = len(driver.find_elements(By.CSS_SELECTOR, ".job-card-container--clickable"))
-        
-        if current_count > prev_count:
-            logging.info(f"Found {current_count - prev_count} new jobs (total: {current_count})")
-            prev_count = current_count
-            no_change_count = 0
-        else:
-            no_change_count += 1
-        
-        # Stop if no new jobs for several attempts OR we have reasonable count
-        if no_change_count >= 8 or current_count >= 20:
-            logging.info(f"Stopping: no_change_count={no_change_count}, current_count={current_count}")
-            break
-        
-        # Different scrolling strategies based on attempt
-        if attempt < 5:
-            # Initial: Scroll by pixels to trigger loading
-            driver.execute_script(f"window.scrollBy(0, {500 + attempt * 100});")
-        elif attempt < 10:
-            # Mid: Try scrolling to specific job elements
+        for sel in DATE_SELECTORS:
             try:
-                jobs = driver.find_elements(By.CSS_SELECTOR, ".job-card-container--clickable")
-                if jobs:
-                    last_job = jobs[-1]
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", last_job)
-                    time.sleep(0.5)
-                    driver.execute_script("window.scrollBy(0, 300);")  # Scroll past it
-            except:
-                driver.execute_script("window.scrollBy(0, 600);")
-        else:
-            # Final: Aggressive scrolling to bottom
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.5)
-            driver.execute_script("window.scrollBy(0, 500);")  # Scroll even further
-        
-        time.sleep(pause_time + get_random_delay(0.3, 0.8))
-    
-    final_count = len(driver.find_elements(By.CSS_SELECTOR, ".job-card-container--clickable"))
-    logging.info(f"LINKEDIN SCROLLING COMPLETE: Found {final_count} jobs after {attempt + 1} attempts")
-    
-    # ENHANCED: More aggressive final attempt if we still have few jobs
-    if final_count < 23:  # Increased threshold since we expect ~25 per page
-        logging.warning(f"Moderate job count ({final_count}), trying enhanced scroll...")
-        
-        # Multiple enhanced strategies
-        strategies = [
-            # Strategy 1: Multiple bottom scrolls with pauses
-            lambda: [driver.execute_script("window.scrollTo(0, document.body.scrollHeight + 500 * i);") or time.sleep(0.8) for i in range(8)],
-            # Strategy 2: Scroll to each existing job element
-            lambda: [driver.execute_script("arguments[0].scrollIntoView({block: 'start'});", job) or time.sleep(0.3) for job in driver.find_elements(By.CSS_SELECTOR, ".job-card-container--clickable")],
-            # Strategy 3: Rapid scroll bursts
-            lambda: [driver.execute_script(f"window.scrollBy(0, {200 + i * 100});") or time.sleep(0.2) for i in range(12)],
-            # Strategy 4: End scroll + key presses
-            lambda: [driver.execute_script("window.scrollTo(0, document.body.scrollHeight);") or time.sleep(0.5) or driver.find_element(By.TAG_NAME, "body").send_keys(Keys.END) or time.sleep(0.5) for _ in range(3)]
-        ]
-        
-        for i, strategy in enumerate(strategies):
+                elem = job.find_element(By.CSS_SELECTOR, sel)
+                text = elem.text.strip()
+                if text and any(x in text.lower() for x in DATE_MARKERS):
+                    date_text = text
+                    break
+            except Exception:
+                continue
+        if not date_text:
+            for elem in job.find_elements(By.XPATH, ".//*"):
+                text = elem.text.strip()
+                if text and any(x in text.lower() for x in DATE_MARKERS):
+                    date_text = text
+                    break
+    except Exception as e:
+        print(f"[Job Date] Ошибка поиска даты: {e}")
+
+    job_url = None
+    try:
+        # 1. Самый специфичный класс
+        try:
+            link_elem = job.find_element(By.CSS_SELECTOR, "a.job-card-list__title--link")
+        except Exception:
+            # 2. Более общий класс
             try:
-                strategy()
-                current_count = len(driver.find_elements(By.CSS_SELECTOR, ".job-card-container--clickable"))
-                if current_count > final_count:
-                    logging.info(f"Strategy {i+1} found {current_count - final_count} more jobs (total: {current_count})")
-                    final_count = current_count
-                    if final_count >= 23:  # Good enough
-                        break
-            except Exception as e:
-                logging.debug(f"Strategy {i+1} failed: {e}")
-        
-        final_final_count = len(driver.find_elements(By.CSS_SELECTOR, ".job-card-container--clickable"))
-        logging.info(f"After enhanced scroll: {final_final_count} jobs (gained: {final_final_count - final_count})")
-    
-    # Final wait for any remaining content
-    time.sleep(get_random_delay(2, 4))
+                link_elem = job.find_element(By.CSS_SELECTOR, "a.job-card-container__link")
+            except Exception:
+                link_elem = None
+        job_url = link_elem.get_attribute('href') if link_elem else None
+
+        # 3. Если не нашли — старый fallback
+        if not job_url:
+            for a in job.find_elements(By.TAG_NAME, 'a'):
+                href = a.get_attribute('href')
+                if href and '/jobs/view/' in href:
+                    job_url = href
+                    break
+    except Exception as ex:
+        logging.error(f"[Job URL] Ошибка поиска ссылки: {ex}\nHTML карточки:\n{job.get_attribute('outerHTML')}")
+
+    # Получаем данные вакансии
+    try:
+        job_company_name = job.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__subtitle span").text.strip()
+    except Exception as e:
+        logging.debug(f"Не удалось получить имя компании: {e}")
+        job_company_name = ""
+    try:
+        job_title = job.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__title span").text.strip()
+    except Exception:
+        try:
+            job_title = job.find_element(By.CSS_SELECTOR, ".job-card-list__title").text.strip()
+        except Exception as e2:
+            logging.debug(f"Не удалось получить заголовок вакансии: {e2}")
+            job_title = ""
+
+    return normalize_card({"title": job_title, "company": job_company_name, "url": job_url, "date_text": date_text})
 
-# Helper functions removed - using simpler approach
 
 # ================================
 # Обработка вакансий на странице
 # ================================
-def parse_current_page(driver, wait, start_time, config):
-    global results, total_vacancies_checked
+def parse_current_page(driver, wait, start_time, config, resume_after=None, on_job_done=None,
+                       retry_job_ids=(), on_job_failed=None):
+    """
+    Scroll, capture and analyze every card on the current results page.
+    :param resume_after: job ID from a checkpoint - cards up to and including it are skipped
+    :param on_job_done: called with each card once it is fully handled (checkpointing)
+    :param retry_job_ids: job IDs from a checkpoint that failed - processed again even before resume_after
+    :param on_job_failed: called with each card whose processing raised (checkpointing)
+    :return: dict with the number of cards captured and processed on the page
+    """
+    session = config["session"]
+    cycle_number = session.cycle_number
     logs_buffer = []
-    matching_jobs = []
+    page_result = {"cards": 0, "processed": 0, "skipped_seen": 0, "prefiltered": 0, "deferred": 0, "job_cards": []}
+    timings = config.get("stage_timings")
+    page_started = time.perf_counter()
     try:
         # LINKEDIN-SPECIFIC FIX: Target LinkedIn's lazy loading mechanism
-        scroll_until_loaded_linkedin_specific(driver, max_attempts=20, pause_time=1.5)
-        job_listings = driver.find_elements(By.CSS_SELECTOR, ".job-card-container--clickable")
-        actual_job_count = len(job_listings)
+        # Batch-режим: прокрутка и сбор карточек в один проход — список виртуализирован,
+        # поэтому метаданные (job ID и т.д.) собираются после каждого шага прокрутки
+        harvest = CardHarvest() if config.get("batch_card_extraction", True) else None
+        scroll_until_loaded_linkedin_specific(driver, scroll_stats=config.get("scroll_stats"), harvest=harvest,
+                                              timings=timings)
+        job_cards = harvest.cards() if harvest else []
+        job_listings = []
+        if not job_cards:
+            if harvest is not None:
+                logging.warning("Card harvest returned nothing, using per-card extraction")
+            job_listings = driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR)
+        actual_job_count = len(job_cards) if job_cards else len(job_listings)
+        page_result["cards"] = actual_job_count
+        page_result["job_cards"] = list(job_cards)
         logging.info(f"CAPTURED вакансий на странице: {actual_job_count}")
-        total_vacancies_checked += actual_job_count
-        # Используем пользовательские ключевые слова
-        keywords_visa = config.get("keywords_visa") or KEYWORDS_VISA
-        keywords_anaplan = config.get("keywords_anaplan") or KEYWORDS_ANAPLAN
-        keywords_sap = config.get("keywords_sap") or KEYWORDS_SAP
-        keywords_planning = config.get("keywords_planning") or KEYWORDS_PLANNING
-        no_relocation_requirements = config.get("no_relocation_requirements") or NO_RELOCATION_REQUIREMENTS
-        remote_requirements = config.get("remote_requirements") or REMOTE_REQUIREMENTS
-        remote_prohibited = config.get("remote_prohibited") or REMOTE_PROHIBITED
-        all_keywords = config.get("all_keywords") or (
-            keywords_visa + keywords_anaplan + keywords_sap + keywords_planning + no_relocation_requirements + remote_requirements + remote_prohibited
-        )
+        # Запись fixture для offline replay (карточки страницы + описания открытых вакансий)
+        fixture_page = None
+        if config.get("fixture_recorder") and job_cards:
+            fixture_page = config["fixture_recorder"].start_page(job_cards, {
+                "keyword": config.get("keyword", ""),
+                "country": config.get("search_country", ""),
+                "url": driver.current_url,
+            })
+        capture = getattr(driver, "job_payload_capture", None)
+        if capture:
+            # JSON-ответы LinkedIn (CDP): пустые поля карточек дополняются из них, ответы пишутся в fixture
+            capture.sink = fixture_page.record_payload if fixture_page else None
+            capture.poll()
+            job_cards = [capture.store.enrich(card) for card in job_cards]
+        planner = config.get("crawl_planner")
+        if planner and job_cards:
+            # Сначала самые перспективные карточки (по заголовку), слабые — в конец страницы
+            job_cards = planner.order(job_cards)
+        first_index = 1
+        if resume_after:
+            job_ids = [card["job_id"] for card in job_cards]
+            if resume_after in job_ids:
+                first_index = job_ids.index(resume_after) + 2
+                # Неудачные карточки до контрольной точки обрабатываются повторно
+                retry_cards = [card for card in job_cards[:first_index - 1] if card["job_id"] in retry_job_ids]
+                job_cards = retry_cards + job_cards[first_index - 1:]
+                logging.info(f"Resuming page after job {resume_after}: {first_index - 1} cards already handled"
+                             + (f", {len(retry_cards)} failed ones retried" if retry_cards else ""))
+                first_index -= len(retry_cards)
+            else:
+                logging.info(f"Checkpoint job {resume_after} not on this page any more, processing the whole page")
+        session.add_checked(actual_job_count)
+        # Скомпилированный матчер строится один раз в run_scraper
+        keyword_matcher = config.get("keyword_matcher") or build_keyword_matcher(config)
+        language_detector = config.get("language_detector") or LanguageDetector()
+        target_languages = parse_language_list(config.get("target_languages"))
+        analysis_cache = config.get("analysis_cache")
+        matcher_signature = keyword_matcher.signature()
+        seen_index = config.get("seen_index") if config.get("skip_seen_jobs", True) else None
+        filter_signature = describe_filter_config(config)
+        card_prefilter = config.get("card_prefilter")
+        skipped_seen = 0
+        prefiltered = 0
 
         # SIMPLIFIED: Process jobs with basic error handling
         processed_jobs = 0
-        for i, job in enumerate(job_listings, start=1):
+        deferred_cards = []
+        for i, entry in enumerate(job_cards or job_listings, start=first_index):
+            card = None
+            card_failed = False
+            card_deferred = False
+            job_started = None
             try:
-                # Basic validation that element is still accessible
-                try:
-                    job.tag_name  # Simple stale element check
-                except Exception:
-                    logging.warning(f"Job element {i} became stale, skipping...")
-                    continue
+                if job_cards:
+                    # Собранная карточка: элемент ищем по job ID непосредственно перед кликом
+                    card, job = entry, None
+                else:
+                    job = entry
+                    # Basic validation that element is still accessible
+                    try:
+                        job.tag_name  # Simple stale element check
+                    except Exception:
+                        logging.warning(f"Job element {i} became stale, skipping...")
+                        continue
                 
                 action = ActionChains(driver)
-                # --- Улучшенное извлечение даты публикации ДО клика на карточку ---
-                date_text = ""
-                transformed_publish_date = ""
-                try:
-                    date_selectors = [
-                        ".job-search-card__listdate",
-                        ".job-search-card__listdate--new",
-                        ".job-card-container__listed-time",
-                        ".job-card-list__footer-wrapper time",
-                        "time",
-                        "span"
-                    ]
-                    for sel in date_selectors:
-                        try:
-                            elem = job.find_element(By.CSS_SELECTOR, sel)
-                            text = elem.text.strip()
-                            if text and any(x in text.lower() for x in ["ago", "hour", "day", "month", "viewed", "yesterday", "today", "just now"]):
-                                date_text = text
-                                break
-                        except Exception:
-                            continue
-                    if not date_text:
-                        for elem in job.find_elements(By.XPATH, ".//*"):
-                            text = elem.text.strip()
-                            if text and any(x in text.lower() for x in ["ago", "hour", "day", "month", "viewed", "yesterday", "today", "just now"]):
-                                date_text = text
-                                break
-                except Exception as e:
-                    print(f"[Job Date] Ошибка поиска даты: {e}")
-
-                # --- Преобразование "N days ago" и др. в YYYY-MM-DD ---
-                import re, datetime
-                def parse_relative_date(text, now=None):
-                    if now is None:
-                        now = datetime.datetime.now()
-                    text = text.lower().strip()
-                    if "just now" in text:
-                        return now.date().isoformat()
-                    if "today" in text:
-                        return now.date().isoformat()
-                    if "yesterday" in text:
-                        return (now - datetime.timedelta(days=1)).date().isoformat()
-                    m = re.match(r"(\d+)\s+minute", text)
-                    if m:
-                        return (now - datetime.timedelta(minutes=int(m.group(1)))).date().isoformat()
-                    m = re.match(r"(\d+)\s+hour", text)
-                    if m:
-                        return (now - datetime.timedelta(hours=int(m.group(1)))).date().isoformat()
-                    m = re.match(r"(\d+)\s+day", text)
-                    if m:
-                        return (now - datetime.timedelta(days=int(m.group(1)))).date().isoformat()
-                    m = re.match(r"(\d+)\s+week", text)
-                    if m:
-                        return (now - datetime.timedelta(weeks=int(m.group(1)))).date().isoformat()
-                    m = re.match(r"(\d+)\s+month", text)
-                    if m:
-                        # Приблизительно 30 дней в месяце
-                        return (now - datetime.timedelta(days=30*int(m.group(1)))).date().isoformat()
-                    m = re.match(r"(\d+)\s+year", text)
-                    if m:
-                        return (now - datetime.timedelta(days=365*int(m.group(1)))).date().isoformat()
-                    # Если просто "viewed" или что-то нестандартное, возвращаем пусто
-                    return ""
-                transformed_publish_date = parse_relative_date(date_text, now=datetime.datetime.strptime("2025-04-22T21:35:02+02:00", "%Y-%m-%dT%H:%M:%S%z")) if date_text else ""
+                # --- Данные карточки ДО клика: из собранного списка или по одной ---
+                if job is not None:
+                    card = extract_job_card_fields(job)
+                    page_result["job_cards"].append(card)
+                job_title = card["title"]
+                job_company_name = card["company"]
+                job_url = card["url"]
+                date_text = card["date_text"]
+                if not job_url:
+                    logging.warning(f"[Job URL] Не удалось найти ссылку для: {job_title} / {job_company_name}")
+
+                # Уже анализировали этот job ID (в этом или прошлом запуске, под любым keyword/страной) — не кликаем
+                seen_entry = seen_index.lookup(card["job_id"], filter_signature) if seen_index else None
+                if seen_entry:
+                    skipped_seen += 1
+                    # Повторное совпадение учитывается в статистике цикла как дубликат, без TG
+                    session.record_seen_skip(bool(seen_entry.get("matched")), job_company_name, job_title)
+                    logging.debug(f"Skipping already analyzed job {card['job_id']}: '{job_title}' / {job_company_name}")
+                    continue
+
+                # --- Преобразование "N days ago" и др. в YYYY-MM-DD (относительно текущего времени) ---
+                transformed_publish_date = parse_relative_date(date_text) if date_text else ""
+
+                # Одна компактная запись на вакансию: события для Sheets и строка результата строятся из неё
+                record = JobRecord(job_company_name, job_title, cycle_number, job_url,
+                                   config.get("keyword", ""), config.get("search_country", ""),
+                                   date_text, transformed_publish_date)
+
+                # Пре-фильтр по данным карточки (заголовок, компания, бейдж Applied, формат работы) — без клика
+                prefilter_reason = card_prefilter.reason(card) if card_prefilter else None
+                if prefilter_reason:
+                    prefiltered += 1
+                    session.record_prefilter()
+                    logging.info(f"Pre-filtered ({prefilter_reason}): '{job_title}' / {job_company_name}")
+                    logs_buffer.append(record.event(f"Filtered (pre-filter: {prefilter_reason})",
+                                                    time.perf_counter() - start_time, details=False))
+                    if seen_index:
+                        seen_index.mark(card["job_id"], False, job_company_name, job_title, filter_signature, cycle_number)
+                    continue
+
+                if planner and job_cards and not planner.has_time():
+                    # Бюджет цикла исчерпан: открывать карточку некогда — переносим её на следующий цикл
+                    # (уже виденные и отсеянные пре-фильтром карточки выше пропускаются без клика)
+                    card_deferred = True
+                    deferred_cards.append(card)
+                    continue
+
+                job_started = time.perf_counter()
+                if job is None:
+                    with measure_stage(config, "card_lookup"):
+                        job = locate_job_card(driver, card)
+                    if job is None:
+                        logging.warning(f"Job card {card['job_id'] or job_url} could not be re-located, skipping...")
+                        continue
                 # Теперь кликаем на карточку, чтобы раскрыть детали
-                action.move_to_element(job).click().perform()
-
-                desc_element = WebDriverWait(driver, 30).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "jobs-box__html-content"))
-                )
-                desc_text = ""
-                for _ in range(10):
-                    time.sleep(get_random_delay(0.5, 1.5))  # Random delay between job clicks
-                    tmp = desc_element.get_attribute("innerText").strip()
-                    if len(tmp) > 50:
-                        desc_text = tmp.lower()
-                        break
+                with measure_stage(config, "click"):
+                    action.move_to_element(job).click().perform()
+
+                with measure_stage(config, "description_wait"):
+                    desc_text = ""
+                    desc_element = None
+                    payload_description = ""
+                    if capture and card["job_id"]:
+                        # Описание из JSON-ответа на клик — без поиска и опроса панели описания
+                        time.sleep(get_random_delay(0.5, 1.5))  # Random delay between job clicks
+                        payload_description = capture.wait_for_description(
+                            card["job_id"], timeout=config.get("cdp_description_timeout", 5))
+                        desc_text = payload_description.lower()
+                    if not desc_text:
+                        desc_element = WebDriverWait(driver, 30).until(
+                            EC.presence_of_element_located((By.CLASS_NAME, "jobs-box__html-content"))
+                        )
+                        for _ in range(10):
+                            time.sleep(get_random_delay(0.5, 1.5))  # Random delay between job clicks
+                            tmp = desc_element.get_attribute("innerText").strip()
+                            if len(tmp) > 50:
+                                desc_text = tmp.lower()
+                                break
                 if not desc_text:
                     logging.info("Описание не успело прогрузиться, пропускаем.")
                     continue
+                if fixture_page:
+                    fixture_page.record_description(card, desc_element.get_attribute("innerHTML")
+                                                    if desc_element is not None else payload_description)
 
-                try:
-                    detected_language = detect(desc_text)
-                except LangDetectException:
-                    detected_language = "unknown"
+                # Кэш анализа по хэшу описания: та же вакансия под другим keyword/страной/циклом не анализируется заново
+                cache_key = analysis_key(desc_text, job_title, matcher_signature)
+                analysis = analysis_cache.get(cache_key) if analysis_cache else None
+                if analysis_cache:
+                    session.record_analysis(analysis is not None)
+                detected_language = (analysis or {}).get("language")
 
-                try:
-                    # 1. Самый специфичный класс
-                    try:
-                        link_elem = job.find_element(By.CSS_SELECTOR, "a.job-card-list__title--link")
-                    except Exception:
-                        # 2. Более общий класс
-                        try:
-                            link_elem = job.find_element(By.CSS_SELECTOR, "a.job-card-container__link")
-                        except Exception:
-                            link_elem = None
-
-                    job_url = link_elem.get_attribute('href') if link_elem else None
-                    if job_url and job_url.startswith('/jobs/view/'):
-                        job_url = 'https://www.linkedin.com' + job_url
-
-                    # 3. Если не нашли — старый fallback
-                    if not job_url:
-                        all_links = job.find_elements(By.TAG_NAME, 'a')
-                        for a in all_links:
-                            href = a.get_attribute('href')
-                            if href and '/jobs/view/' in href:
-                                if href.startswith('/jobs/view/'):
-                                    href = 'https://www.linkedin.com' + href
-                                job_url = href
-                                break
-
-                    if not job_url:
-                        logging.warning(f"[Job URL] Не удалось найти ссылку для: {job_title} / {job_company_name}\nHTML карточки:\n{job.get_attribute('outerHTML')}")
-                except Exception as ex:
-                    job_url = None
-                    logging.error(f"[Job URL] Ошибка поиска ссылки: {ex}\nHTML карточки:\n{job.get_attribute('outerHTML')}")
-
-                # Получаем данные вакансии
-                try:
-                    job_company_name = job.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__subtitle span").text.strip()
-                except Exception as e:
-                    logging.debug(f"Не удалось получить имя компании: {e}")
-                    job_company_name = "Unknown Company"
-                try:
-                    job_title = job.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__title span").text.strip()
-                except Exception as e:
-                    try:
-                        job_title = job.find_element(By.CSS_SELECTOR, ".job-card-list__title").text.strip()
-                    except Exception as e2:
-                        logging.debug(f"Не удалось получить заголовок вакансии: {e2}")
-                        job_title = "Title not found"
+                # Языковой фильтр (опционально): описания не на целевых языках не анализируем
+                if target_languages:
+                    if not detected_language:
+                        with measure_stage(config, "langdetect"):
+                            detected_language = language_detector.detect(desc_text)
+                        if analysis:
+                            analysis_cache.update(cache_key, language=detected_language)
+                    if not language_allowed(detected_language, target_languages):
+                        logging.info(f"Skipping job in another language ({detected_language}): "
+                                     f"'{job_title}' / {job_company_name}")
+                        logs_buffer.append(record.event("Filtered (language)", time.perf_counter() - start_time, details=False))
+                        if seen_index:
+                            seen_index.mark(card["job_id"], False, job_company_name, job_title, filter_signature, cycle_number)
+                        continue
 
                 logging.info(f"Обработка вакансии №{i}: '{job_title}' / {job_company_name}")
 
+                if analysis:
+                    keyword_scan = KeywordScan(set(analysis["categories"]), list(analysis["matched_keywords"]))
+                    top_skills = list(analysis["top_skills"])
+                else:
+                    # Один проход по описанию: все флаги категорий + список совпавших ключевых слов
+                    with measure_stage(config, "keyword_match"):
+                        keyword_scan = keyword_matcher.scan(desc_text)
+
+                    # Быстрый парсинг навыков для каждой вакансии
+                    with measure_stage(config, "skill_extraction"):
+                        title_words = set(re.findall(r"[A-Za-z0-9\-]+", job_title.lower()))
+                        desc_words = set(re.findall(r"[A-Za-z0-9\-]+", desc_text))
+                        stopwords = set(['and','or','the','a','of','to','in','for','on','at','by','with','without','from','is','are','as','an','be','it','this','that','will','not','but','if','we','you','our','your','can','may','all'])
+                        skill_candidates = [w for w in title_words.union(desc_words) if len(w)>2 and w not in stopwords]
+                        top_skills = sorted(skill_candidates, key=lambda x: desc_text.count(x) + job_title.lower().count(x), reverse=True)[:10]
+                    if analysis_cache:
+                        analysis_cache.put(cache_key, {
+                            "categories": sorted(keyword_scan.categories),
+                            "matched_keywords": keyword_scan.matched_keywords,
+                            "top_skills": top_skills,
+                            "language": detected_language,
+                        })
+                matched_keywords = keyword_scan.matched_keywords
+                record.set_analysis(keyword_scan.categories, top_skills, matched_keywords)
+
                 # ДО ФИЛЬТРОВ: логируем просмотр вакансии
-                matched_keywords = []
-                for kw in (
-                    keywords_visa + keywords_anaplan + keywords_sap + keywords_planning + no_relocation_requirements + remote_requirements + remote_prohibited
-                ):
-                    if kw.lower() in desc_text.lower():
-                        matched_keywords.append(kw)
-                logs_buffer.append({
-                    "Timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "Stage": "Viewed",
-                    "Company": job_company_name,
-                    "Vacancy Title": job_title,
-                    "Cycle #": cycle_number,
-                    "Visa Sponsorship or Relocation": False,
-                    "Anaplan": False,
-                    "SAP APO": False,
-                    "Planning": False,
-                    "No Relocation Support": False,
-                    "Remote": False,
-                    "Remote Prohibited": False,
-                    "Already Applied": False,
-                    "Job URL": job_url,
-                    "Elapsed Time (s)": round(time.perf_counter() - start_time, 2),
-                    "Skills": "",
-                    "TG message sent": "",
-                    "Matched key words": ", ".join(matched_keywords),
-                    "Search Keyword": config.get("keyword", ""),
-                    "Search Country": config.get("search_country", ""),
-                    "Job Date": date_text or "",
-                    "transformed publish date from description": transformed_publish_date or ""
-                })
+                logs_buffer.append(record.event("Viewed", time.perf_counter() - start_time, details=False))
                 # Increment cycle parsed jobs counter
-                global cycle_parsed_jobs
-                cycle_parsed_jobs += 1
+                session.add_parsed()
 
                 # Определяем флаги соответствия
-                remote_found = any(x in desc_text for x in remote_requirements)
-                remote_prohibited_found = any(x in desc_text for x in remote_prohibited)
-                visa_or_relocation = any(x in desc_text for x in keywords_visa)
-                anaplan_found = any(x in desc_text for x in keywords_anaplan)
-                sap_apo_found = any(x in desc_text for x in keywords_sap)
-                planning_found = any(x in desc_text for x in keywords_planning)
-                already_applied = any(x in desc_text for x in ["applied", "see application", "you have already applied", "already submitted", "previously applied"])
-
-                # Быстрый парсинг навыков для каждой вакансии
-                title_words = set(re.findall(r"[A-Za-z0-9\-]+", job_title.lower()))
-                desc_words = set(re.findall(r"[A-Za-z0-9\-]+", desc_text))
-                stopwords = set(['and','or','the','a','of','to','in','for','on','at','by','with','without','from','is','are','as','an','be','it','this','that','will','not','but','if','we','you','our','your','can','may','all'])
-                skill_candidates = [w for w in title_words.union(desc_words) if len(w)>2 and w not in stopwords]
-                top_skills = sorted(skill_candidates, key=lambda x: desc_text.count(x) + job_title.lower().count(x), reverse=True)[:10]
+                remote_found = keyword_scan.has("remote")
+                remote_prohibited_found = keyword_scan.has("remote_prohibited")
+                visa_or_relocation = keyword_scan.has("visa")
+                anaplan_found = keyword_scan.has("anaplan")
+                sap_apo_found = keyword_scan.has("sap")
+                planning_found = keyword_scan.has("planning")
+                no_relocation_found = keyword_scan.has("no_relocation")
+                already_applied = keyword_scan.has("already_applied")
 
                 # ФИЛЬТРЫ: если вакансия отсеяна
                 if already_applied:
-                    logs_buffer.append({
-                        "Timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                        "Stage": "Filtered (already applied)",
-                        "Company": job_company_name,
-                        "Vacancy Title": job_title,
-                        "Cycle #": cycle_number,
-                        "Visa Sponsorship or Relocation": visa_or_relocation,
-                        "Anaplan": anaplan_found,
-                        "SAP APO": sap_apo_found,
-                        "Planning": planning_found,
-                        "No Relocation Support": any(x in desc_text for x in no_relocation_requirements),
-                        "Remote": remote_found,
-                        "Remote Prohibited": remote_prohibited_found,
-                        "Already Applied": already_applied,
-                        "Job URL": job_url,
-                        "Elapsed Time (s)": round(time.perf_counter() - start_time, 2),
-                        "Skills": ", ".join(top_skills),
-                        "TG message sent": "",
-                        "Matched key words": ", ".join(matched_keywords),
-                        "Search Keyword": config.get("keyword", ""),
-                        "Search Country": config.get("search_country", ""),
-                        "Job Date": date_text or "",
-                        "transformed publish date from description": transformed_publish_date or ""
-                    })
+                    logs_buffer.append(record.event("Filtered (already applied)", time.perf_counter() - start_time))
+                    if seen_index:
+                        seen_index.mark(card["job_id"], False, job_company_name, job_title, filter_signature, cycle_number)
                     continue
 
                 # Apply configurable filter logic
@@ -946,348 +934,613 @@ def parse_current_page(driver, wait, start_time, config):
                 
                 # Final filter decision
                 if not (location_passes and skills_passes):
-                    logs_buffer.append({
-                        "Timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                        "Stage": f"Filtered ({filter_reason})",
-                        "Company": job_company_name,
-                        "Vacancy Title": job_title,
-                        "Cycle #": cycle_number,
-                        "Visa Sponsorship or Relocation": visa_or_relocation,
-                        "Anaplan": anaplan_found,
-                        "SAP APO": sap_apo_found,
-                        "Planning": planning_found,
-                        "No Relocation Support": any(x in desc_text for x in no_relocation_requirements),
-                        "Remote": remote_found,
-                        "Remote Prohibited": remote_prohibited_found,
-                        "Already Applied": already_applied,
-                        "Job URL": job_url,
-                        "Elapsed Time (s)": round(time.perf_counter() - start_time, 2),
-                        "Skills": ", ".join(top_skills),
-                        "TG message sent": "",
-                        "Matched key words": ", ".join(matched_keywords),
-                        "Search Keyword": config.get("keyword", ""),
-                        "Search Country": config.get("search_country", ""),
-                        "Job Date": date_text or "",
-                        "transformed publish date from description": transformed_publish_date or ""
-                    })
+                    logs_buffer.append(record.event(f"Filtered ({filter_reason})", time.perf_counter() - start_time))
+                    if seen_index:
+                        seen_index.mark(card["job_id"], False, job_company_name, job_title, filter_signature, cycle_number)
                     continue
 
                 # ПРОШЛА ФИЛЬТРЫ: логируем
                 tg_sent = False
-                logs_buffer.append({
-                    "Timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "Stage": "Passed filters",
-                    "Company": job_company_name,
-                    "Vacancy Title": job_title,
-                    "Cycle #": cycle_number,
-                    "Visa Sponsorship or Relocation": visa_or_relocation,
-                    "Anaplan": anaplan_found,
-                    "SAP APO": sap_apo_found,
-                    "Planning": planning_found,
-                    "No Relocation Support": any(x in desc_text for x in no_relocation_requirements),
-                    "Remote": remote_found,
-                    "Remote Prohibited": remote_prohibited_found,
-                    "Already Applied": already_applied,
-                    "Job URL": job_url,
-                    "Elapsed Time (s)": round(time.perf_counter() - start_time, 2),
-                    "Skills": ", ".join(top_skills),
-                    "TG message sent": "",
-                    "Matched key words": ", ".join(matched_keywords),
-                    "Search Keyword": config.get("keyword", ""),
-                    "Search Country": config.get("search_country", ""),
-                    "Job Date": date_text or "",
-                    "transformed publish date from description": transformed_publish_date or "",
-                    "Filter Config": f"Remote:{require_remote}, Visa:{require_visa}, Logic:{config.get('location_logic','OR')}, Skills:{config.get('require_skills',False)}, Block:{config.get('block_remote_prohibited',False)}"
-                })
+                logs_buffer.append(record.event("Passed filters", time.perf_counter() - start_time, filter_config=filter_signature))
 
-                matched_keywords = []
-                for kw in (
-                    keywords_visa + keywords_anaplan + keywords_sap + keywords_planning + no_relocation_requirements + remote_requirements + remote_prohibited
-                ):
-                    if kw.lower() in desc_text.lower():
-                        matched_keywords.append(kw)
-                current_result = {
-                    "Company": job_company_name,
-                    "Vacancy Title": job_title,
-                    "Cycle #": cycle_number,
-                    "Visa Sponsorship or Relocation": visa_or_relocation,
-                    "Anaplan": anaplan_found,
-                    "SAP APO": sap_apo_found,
-                    "Planning": planning_found,
-                    "No Relocation Support": any(x in desc_text for x in no_relocation_requirements),
-                    "Remote": remote_found,
-                    "Remote Prohibited": remote_prohibited_found,
-                    "Already Applied": already_applied,
-                    "Job URL": job_url,
-                    "Elapsed Time (s)": round(time.perf_counter() - start_time, 2),
-                    "Skills": ", ".join(top_skills),
-                    "Matched key words": ", ".join(matched_keywords),
-                    "Search Keyword": config.get("keyword", ""),
-                    "Search Country": config.get("search_country", ""),
-                    "Job Date": date_text or "",
-                    "transformed publish date from description": transformed_publish_date or ""
-                }
-                matching_jobs.append(current_result)
-                
-                # Track matched job for cycle summary
-                global cycle_new_matches, total_matches_all_time, cycle_matched_jobs, cycle_new_jobs_only, all_time_matched_jobs
-                job_entry = {"company": job_company_name, "position": job_title}
-                job_key = f"{job_company_name.lower().strip()}|{job_title.lower().strip()}"  # Create unique identifier (normalized)
+                current_result = record.result_row(time.perf_counter() - start_time)
                 
-                # Check if this is truly a NEW job (not seen in any previous cycle)
-                is_new_job = job_key not in all_time_matched_jobs
-                
-                # Always increment counters and track in cycle (for statistics)
-                cycle_new_matches += 1
-                total_matches_all_time += 1
-                
-                # Add to matched jobs list if not already there (avoid duplicates within cycle)
-                if job_entry not in cycle_matched_jobs:
-                    cycle_matched_jobs.append(job_entry)
+                # Track matched job for cycle summary; True only for a job not matched in any previous cycle
+                # (checked and recorded atomically, so parallel workers never alert the same job twice)
+                is_new_job = session.record_match(job_company_name, job_title)
                 
                 # Only send Telegram message for NEW jobs (not duplicates from previous cycles)
                 if is_new_job:
-                    global unique_jobs_discovered
-                    all_time_matched_jobs.add(job_key)  # Mark as seen
-                    cycle_new_jobs_only.append(job_entry)  # Add to truly new jobs list
-                    unique_jobs_discovered += 1  # Track unique jobs discovered
-                    
+                    # Язык нужен только для текста уведомления: определяем лениво, с кэшем по хэшу описания
+                    if not detected_language:
+                        with measure_stage(config, "langdetect"):
+                            detected_language = language_detector.detect(desc_text)
+                        if analysis_cache:
+                            analysis_cache.update(cache_key, language=detected_language)
                     # Send Telegram notification
-                    running_minutes = (time.perf_counter() - start_time) / 60
-                    summary = get_excel_summary(config["output_file_path"], running_minutes)
-                    message_text = (
-                        f"🔔 Найдена вакансия по ключевому слову <b>{config['keyword']}</b>\n"
-                        f"Компания: <b>{job_company_name}</b>\n"
-                        f"Вакансия: <b>{job_title}</b>\n\n"
-                        f"Matched key words: {', '.join(matched_keywords)}\n"
-                        f"Навыки: {', '.join(top_skills)}\n"
-                        f"Язык описания: {detected_language.upper()}\n\n"
-                        f"Ссылка на вакансию: <a href='{job_url}'>{job_url}</a>\n\n"
-                        f"Всего проверено вакансий: {total_vacancies_checked}\n"
-                        + summary
-                    )
-                    p_chart = create_p_chart(results)
-                    bar_chart = create_bar_chart(results)
-                    images = []
-                    if p_chart:
-                        images.append(p_chart)
-                    if bar_chart:
-                        images.append(bar_chart)
-                    send_telegram_message(config["telegram_bot_token"], config["telegram_chat_id"], message_text, job_url=job_url, images=images)
+                    with measure_stage(config, "telegram"):
+                        job_alert = format_job_alert(config, job_company_name, job_title, matched_keywords,
+                                                     top_skills, detected_language, job_url)
+                        alert_digest = config.get("alert_digest")
+                        if alert_digest:
+                            alert_digest.add(job_alert)
+                        else:
+                            running_minutes = (time.perf_counter() - start_time) / 60
+                            journal = config.get("results_journal")
+                            summary = get_excel_summary(config["output_file_path"], running_minutes,
+                                                        checked_count=journal.count if journal else None)
+                            message_text = (
+                                job_alert + "\n\n"
+                                f"Всего проверено вакансий: {session.total_vacancies_checked}\n"
+                                + summary
+                            )
+                            images = create_chart_images(config)
+                            send_telegram_message(config["telegram_bot_token"], config["telegram_chat_id"], message_text, job_url=job_url, images=images)
                     tg_sent = True
                     logging.info(f"NEW job: Telegram message sent for {job_company_name} - {job_title}")
                 else:
                     logging.info(f"DUPLICATE job: Telegram message NOT sent for {job_company_name} - {job_title} (already seen in previous cycle)")
                     tg_sent = False
                 # Update log with TG message sent
-                logs_buffer.append({
-                    "Timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "Stage": "Passed filters",
-                    "Company": job_company_name,
-                    "Vacancy Title": job_title,
-                    "Cycle #": cycle_number,
-                    "Visa Sponsorship or Relocation": visa_or_relocation,
-                    "Anaplan": anaplan_found,
-                    "SAP APO": sap_apo_found,
-                    "Planning": planning_found,
-                    "No Relocation Support": any(x in desc_text for x in no_relocation_requirements),
-                    "Remote": remote_found,
-                    "Remote Prohibited": remote_prohibited_found,
-                    "Already Applied": already_applied,
-                    "Job URL": job_url,
-                    "Elapsed Time (s)": round(time.perf_counter() - start_time, 2),
-                    "Skills": ", ".join(top_skills),
-                    "TG message sent": "yes" if tg_sent else "no (duplicate)",
-                    "Matched key words": ", ".join(matched_keywords),
-                    "Search Keyword": config.get("keyword", ""),
-                    "Search Country": config.get("search_country", ""),
-                    "Job Date": date_text or "",
-                    "transformed publish date from description": transformed_publish_date or ""
-                })
-                results.append(current_result)
+                current_result["TG message sent"] = "yes" if tg_sent else "no (duplicate)"
+                logs_buffer.append(record.event("Passed filters", time.perf_counter() - start_time, tg_sent=current_result["TG message sent"]))
+                record_result(config, current_result)
+                if seen_index:
+                    seen_index.mark(card["job_id"], True, job_company_name, job_title, filter_signature, cycle_number)
                 processed_jobs += 1
             except Exception as e:
+                card_failed = True
                 logging.error(f"Ошибка при обработке вакансии №{i}: {e}", exc_info=True)
                 continue
+            finally:
+                # Неудачные карточки запоминаются в контрольной точке — после перезапуска браузера они обработаются снова
+                if card is not None and not card_deferred:
+                    if card_failed:
+                        if on_job_failed:
+                            on_job_failed(card)
+                    elif on_job_done:
+                        on_job_done(card)
+                # Полное время открытой вакансии (от поиска карточки до записи результата)
+                if timings and job_started is not None:
+                    timings.record("job", time.perf_counter() - job_started)
+                if planner and job_started is not None:
+                    planner.record_job(time.perf_counter() - job_started)
+
+        if deferred_cards:
+            planner.defer(deferred_cards)
+            page_result["deferred"] = len(deferred_cards)
+            logging.info(f"Cycle time budget spent: {len(deferred_cards)} cards deferred to the next cycle")
 
         # Simple validation: log final counts
-        logging.info(f"PAGE COMPLETE: {processed_jobs} jobs processed from {actual_job_count} found")
+        logging.info(f"PAGE COMPLETE: {processed_jobs} jobs processed from {actual_job_count} found ({skipped_seen} skipped as already analyzed, {prefiltered} pre-filtered)")
+        page_result.update(processed=processed_jobs, skipped_seen=skipped_seen, prefiltered=prefiltered)
+        if seen_index:
+            seen_index.save()
+        if analysis_cache:
+            analysis_cache.save()
+        if config.get("scroll_stats"):
+            config["scroll_stats"].save()
+        if config.get("alert_digest"):
+            config["alert_digest"].maybe_flush()
         
         # --- Google Sheets: запись результатов (batch) ---
         if config.get("google_sheets_url") and config.get("google_sheets_credentials"):
-            batch_log_parser_events_to_sheets(logs_buffer, config["google_sheets_credentials"], config["google_sheets_url"])
+            with measure_stage(config, "sheets"):
+                # Одна строка на вакансию за цикл (Stage / Filter Reason / TG / Stage History)
+                if config.get("compact_sheet_log", True):
+                    logs_buffer = compact_events(logs_buffer)
+                if config.get("sheets_write_behind", True):
+                    # Не блокируем парсинг: события уходят в локальную очередь, запись в фоне
+                    get_sheets_sink(config["google_sheets_credentials"], config["google_sheets_url"]).submit(logs_buffer)
+                else:
+                    batch_log_parser_events_to_sheets(logs_buffer, config["google_sheets_credentials"], config["google_sheets_url"])
+        if timings:
+            timings.record("page", time.perf_counter() - page_started)
     except Exception as e:
         logging.error(f"Ошибка при разборе текущей страницы: {e}")
+    return page_result
 
 # ================================
-# Основная функция запуска парсера
+# Общая подготовка запуска
 # ================================
-def run_scraper(config):
-    global results, total_vacancies_checked
-    global cycle_number, cycle_parsed_jobs, cycle_new_matches, cycle_matched_jobs, cycle_new_jobs_only, total_matches_all_time, unique_jobs_discovered, all_time_matched_jobs
-    results = []
-    total_vacancies_checked = 0
-    # Initialize cycle tracking variables
-    cycle_number = 1
-    cycle_parsed_jobs = 0
-    cycle_new_matches = 0
-    cycle_matched_jobs = []
-    cycle_new_jobs_only = []
-    total_matches_all_time = 0
-    unique_jobs_discovered = 0
-    all_time_matched_jobs = set()
+def prepare_keywords(config):
+    """Resolve user keyword lists (or defaults) and compile the matcher shared by all pages"""
+    # Используем пользовательские ключевые слова, если они есть, иначе дефолтные
+    keywords_visa = config.get("keywords_visa") or KEYWORDS_VISA
+    keywords_anaplan = config.get("keywords_anaplan") or KEYWORDS_ANAPLAN
+    keywords_sap = config.get("keywords_sap") or KEYWORDS_SAP
+    keywords_planning = config.get("keywords_planning") or KEYWORDS_PLANNING
+    no_relocation_requirements = config.get("no_relocation_requirements") or NO_RELOCATION_REQUIREMENTS
+    remote_requirements = config.get("remote_requirements") or REMOTE_REQUIREMENTS
+    remote_prohibited = config.get("remote_prohibited") or REMOTE_PROHIBITED
+    all_keywords = (
+        keywords_visa
+        + keywords_anaplan
+        + keywords_sap
+        + keywords_planning
+        + no_relocation_requirements
+        + remote_requirements
+        + remote_prohibited
+    )
+    # Передаче all_keywords и остальные списки в parse_current_page через config
+    config["all_keywords"] = all_keywords
+    config["keywords_visa"] = keywords_visa
+    config["keywords_anaplan"] = keywords_anaplan
+    config["keywords_sap"] = keywords_sap
+    config["keywords_planning"] = keywords_planning
+    config["no_relocation_requirements"] = no_relocation_requirements
+    config["remote_requirements"] = remote_requirements
+    config["remote_prohibited"] = remote_prohibited
+    config["keyword_matcher"] = build_keyword_matcher(config)
+
+def prepare_run(config):
+    """Fresh per-run state shared by every browser: session counters, seen index, journal, stats, digest"""
+    config["session"] = ScraperSession()
+    if config.get("skip_seen_jobs", True):
+        config["seen_index"] = SeenJobIndex(get_seen_index_path(config), ttl_days=config.get("seen_ttl_days", 30))
+    if config.get("results_journal_enabled", True):
+        # Новый запуск — новый журнал (как раньше Excel перезаписывался с нуля)
+        config["results_journal"] = ResultsJournal(journal_path_for(config["output_file_path"]), reset=True)
+    config["run_stats"] = RunningStats()
+    config["chart_cache"] = ChartCache(config["run_stats"])
+    if config.get("adaptive_scroll", True):
+        config["scroll_stats"] = ScrollStrategyStats(get_scroll_stats_path(config))
+    if config.get("crawl_checkpoints", True):
+        config["crawl_checkpoint"] = CrawlCheckpoint(get_checkpoint_path(config))
+    if config.get("incremental_crawl", True):
+        config["recency_watermark"] = RecencyWatermark(get_watermark_path(config))
+    config["language_detector"] = LanguageDetector()
+    if config.get("analysis_cache_enabled", True):
+        # Дисковый уровень кэша (опционально) переживает перезапуск
+        config["analysis_cache"] = AnalysisCache(get_analysis_cache_path(config) if config.get("analysis_cache_disk", True) else None)
+    if config.get("stage_timing", True):
+        config["stage_timings"] = StageTimings()
+    if config.get("card_prefilter_enabled", True):
+        config["card_prefilter"] = CardPrefilter.from_config(config)
+    if config.get("record_fixtures") or config.get("record_fixtures_dir"):
+        config["fixture_recorder"] = FixtureRecorder(get_fixtures_dir(config))
+    prepare_keywords(config)
     start_time = time.perf_counter()
-    repetitive_parsing = config.get("repetitive_parsing", False)
-    logging.info(f"Starting cycle #{cycle_number}")
-    while True:
-        # Используем пользовательские ключевые слова, если они есть, иначе дефолтные
-        keywords_visa = config.get("keywords_visa") or KEYWORDS_VISA
-        keywords_anaplan = config.get("keywords_anaplan") or KEYWORDS_ANAPLAN
-        keywords_sap = config.get("keywords_sap") or KEYWORDS_SAP
-        keywords_planning = config.get("keywords_planning") or KEYWORDS_PLANNING
-        no_relocation_requirements = config.get("no_relocation_requirements") or NO_RELOCATION_REQUIREMENTS
-        remote_requirements = config.get("remote_requirements") or REMOTE_REQUIREMENTS
-        remote_prohibited = config.get("remote_prohibited") or REMOTE_PROHIBITED
-        all_keywords = (
-            keywords_visa
-            + keywords_anaplan
-            + keywords_sap
-            + keywords_planning
-            + no_relocation_requirements
-            + remote_requirements
-            + remote_prohibited
+    if config.get("value_ordering", True) or config.get("cycle_time_budget_min"):
+        search_terms = [config.get("keyword", "")] + list(config.get("extra_keywords", []))
+        config["crawl_planner"] = CrawlPlanner(config["keyword_matcher"], search_terms,
+                                               cycle_budget_s=float(config.get("cycle_time_budget_min") or 0) * 60)
+    config["alert_digest"] = build_alert_digest(config, start_time)
+    return start_time
+
+def finish_run(config):
+    """Close the journal and drain the Telegram / Sheets background queues"""
+    if config.get("results_journal"):
+        config["results_journal"].close()
+    if config.get("scroll_stats"):
+        config["scroll_stats"].save()
+        logging.info(f"Scroll strategies: {config['scroll_stats'].describe()}")
+    if config.get("language_detector"):
+        logging.info(f"Language detection: {config['language_detector'].describe()}")
+    if config.get("analysis_cache"):
+        logging.info(f"Analysis cache: {config['analysis_cache'].describe()}")
+        config["analysis_cache"].close()
+    flush_telegram_notifiers()
+    close_sheets_sinks()
+
+def send_cycle_summary(config):
+    """Cycle summary via Telegram (with the last digest of the cycle in digest mode)"""
+    session = config["session"]
+    try:
+        summary_message = generate_cycle_summary_message(session)
+        if config.get("alert_digest"):
+            # Оставшиеся вакансии цикла + итог одним сообщением
+            config["alert_digest"].flush(footer=summary_message)
+        else:
+            send_telegram_message(
+                config["telegram_bot_token"], 
+                config["telegram_chat_id"], 
+                summary_message
+            )
+        logging.info(f"Cycle #{session.cycle_number} summary sent to Telegram")
+    except Exception as e:
+        logging.warning(f"Failed to send cycle summary: {e}")
+
+def measure_stage(config, stage):
+    """Timer for one named stage (no-op when stage timing is off)"""
+    timings = config.get("stage_timings")
+    return timings.measure(stage) if timings else contextlib.nullcontext()
+
+def export_stage_timings(config):
+    """Append the cycle's stage histograms to <output>.stage_timings.ndjson and start fresh ones"""
+    timings = config.get("stage_timings")
+    if not timings:
+        return
+    path = config.get("stage_timings_path") or stage_timings_path_for(config["output_file_path"])
+    timings.export(path, config["session"].cycle_number, keyword=config.get("keyword", ""),
+                   country=config.get("search_country", ""), workers=config.get("workers", 1))
+    logging.info(f"Stage timings for cycle #{config['session'].cycle_number} written to {path}:")
+    for line in timings.summary_lines():
+        logging.info(f"  {line}")
+    timings.reset()
+
+def build_search_url(keyword, country, page=1, posted_within_s=None):
+    """
+    Job search URL; pages past the first are addressed by LinkedIn's start= offset (25 cards per page).
+    posted_within_s adds the time-posted filter (f_TPR=r<seconds>) with newest-first sorting.
+    """
+    url = (
+        "https://www.linkedin.com/jobs/search/"
+        f"?keywords={keyword.replace(' ', '%20')}"
+        f"&location={country.replace(' ', '%20')}"
+    )
+    if posted_within_s:
+        url += f"&f_TPR=r{int(posted_within_s)}&sortBy=DD"
+    if page > 1:
+        url += f"&start={(page - 1) * 25}"
+    return url
+
+def launch_browser(config, profile_path):
+    """Start Chrome on the given profile and wait for the manual login; None on failure"""
+    options = uc.ChromeOptions()
+    options.add_argument(f"--user-data-dir={profile_path}")
+    # options.add_argument("--profile-directory=Default")
+    options.add_argument("--disable-webrtc")
+    options.add_argument("--disable-features=WebRtcHideLocalIpsWithMdns")
+    options.add_argument("--disable-udp")
+    options.add_argument("--log-level=3")
+    options.add_argument("--disable-logging")
+    options.add_argument("--v=0")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+
+    if config.get("chrome_binary_location"):
+        options.binary_location = config["chrome_binary_location"]
+    if config.get("cdp_capture"):
+        # Network.* события DevTools в performance log — для чтения JSON-ответов LinkedIn
+        options.set_capability("goog:loggingPrefs", performance_logging_capability())
+
+    service = Service(config["chromedriver_path"])
+    try:
+        driver = uc.Chrome(options=options, service=service)
+    except Exception as e:
+        logging.error(f"Ошибка запуска браузера: {e}")
+        return None
+
+    driver.get("https://www.linkedin.com/login")
+    logging.info("Ожидаем ручной вход в систему...")
+    try:
+        WebDriverWait(driver, 60).until(
+            lambda d: ("feed" in d.current_url or "linkedin.com/feed" in d.current_url)
         )
-        # Передаче all_keywords и остальные списки в parse_current_page через config
-        config["all_keywords"] = all_keywords
-        config["keywords_visa"] = keywords_visa
-        config["keywords_anaplan"] = keywords_anaplan
-        config["keywords_sap"] = keywords_sap
-        config["keywords_planning"] = keywords_planning
-        config["no_relocation_requirements"] = no_relocation_requirements
-        config["remote_requirements"] = remote_requirements
-        config["remote_prohibited"] = remote_prohibited
-
-        options = uc.ChromeOptions()
-        options.add_argument(f"--user-data-dir={config['chrome_profile_path']}")
-        # options.add_argument("--profile-directory=Default")
-        options.add_argument("--disable-webrtc")
-        options.add_argument("--disable-features=WebRtcHideLocalIpsWithMdns")
-        options.add_argument("--disable-udp")
-        options.add_argument("--log-level=3")
-        options.add_argument("--disable-logging")
-        options.add_argument("--v=0")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-
-        if config.get("chrome_binary_location"):
-            options.binary_location = config["chrome_binary_location"]
-
-        service = Service(config["chromedriver_path"])
-        try:
-            driver = uc.Chrome(options=options, service=service)
-        except Exception as e:
-            logging.error(f"Ошибка запуска браузера: {e}")
-            return
+        logging.info("Вход выполнен успешно.")
+    except Exception as e:
+        logging.error("Ошибка при входе в систему. Проверьте логин вручную.")
+        driver.quit()
+        return None
+    if config.get("cdp_capture"):
+        driver.job_payload_capture = CdpNetworkCapture(driver)
+    return driver
 
-        driver.get("https://www.linkedin.com/login")
-        logging.info("Ожидаем ручной вход в систему...")
+def browser_is_healthy(driver):
+    """Cheap liveness check (one round trip): page responds and the session was not bounced to login"""
+    try:
+        ready_state, url = driver.execute_script("return [document.readyState, location.href];")
+    except Exception as e:
+        logging.warning(f"Browser health check failed: {str(e)[:100]}")
+        return False
+    if any(marker in url for marker in ("/login", "/authwall", "/checkpoint", "/uas/")):
+        logging.warning(f"Browser session is no longer logged in ({url})")
+        return False
+    return ready_state in ("interactive", "complete")
+
+def ensure_browser(config, driver, profile_path):
+    """Reuse the running driver between cycles; relaunch (with manual login) only if the health check fails"""
+    if driver is not None:
+        if browser_is_healthy(driver):
+            return driver
+        logging.warning("Restarting browser...")
         try:
-            WebDriverWait(driver, 60).until(
-                lambda d: ("feed" in d.current_url or "linkedin.com/feed" in d.current_url)
-            )
-            logging.info("Вход выполнен успешно.")
-        except Exception as e:
-            logging.error("Ошибка при входе в систему. Проверьте логин вручную.")
             driver.quit()
-            return
+        except Exception:
+            pass
+    return launch_browser(config, profile_path)
 
-        try:
-            direct_url = (
-                "https://www.linkedin.com/jobs/search/"
-                f"?keywords={config['keyword'].replace(' ', '%20')}"
-                f"&location={config['search_country'].replace(' ', '%20')}"
-            )
-            driver.get(direct_url)
-            time.sleep(get_random_delay(2, 5))  # Random delay between pages
-            wait = WebDriverWait(driver, 30)
-
-            current_page = 1
-            while True:
-                logging.info(f"=== Обработка страницы {current_page} ===")
-                parse_current_page(driver, wait, start_time, config)
-                elapsed_time = round(time.perf_counter() - start_time, 2)
-                save_results_to_file_with_calculations(results, config["output_file_path"], elapsed_time)
+def get_checkpoint_path(config):
+    """Crawl checkpoint is kept next to the seen-job index"""
+    if config.get("checkpoint_path"):
+        return config["checkpoint_path"]
+    return os.path.join(os.path.dirname(get_seen_index_path(config)), "crawl_checkpoint.json")
 
-                next_page_number = current_page + 1
-                next_button_xpath = f"//button[@aria-label='Page {next_page_number}']"
-                next_buttons = driver.find_elements(By.XPATH, next_button_xpath)
-                if not next_buttons:
-                    logging.info(f"Страница {next_page_number} не найдена. Пагинация завершена.")
-                    break
+def get_watermark_path(config):
+    """Recency watermark is kept next to the seen-job index"""
+    if config.get("watermark_path"):
+        return config["watermark_path"]
+    return os.path.join(os.path.dirname(get_seen_index_path(config)), "recency_watermark.json")
 
-                next_buttons[0].click()
-                current_page += 1
-                time.sleep(get_random_delay(2, 5))  # Random delay between pages
+def get_analysis_cache_path(config):
+    """Disk tier of the description analysis cache is kept next to the seen-job index"""
+    if config.get("analysis_cache_path"):
+        return config["analysis_cache_path"]
+    return os.path.join(os.path.dirname(get_seen_index_path(config)), "analysis_cache.sqlite3")
 
-            elapsed_time = round(time.perf_counter() - start_time, 2)
-            save_results_to_file_with_calculations(results, config["output_file_path"], elapsed_time)
-            logging.info("Пагинация завершена. Финальные результаты сохранены.")
-        except Exception as e:
-            logging.error(f"Глобальная ошибка при поиске вакансий: {e}")
-            elapsed_time = round(time.perf_counter() - start_time, 2)
-            results.append({
-                "Company": config["keyword"],
-                "Vacancy Title": "",
-                "Cycle #": cycle_number,
-                "Visa Sponsorship or Relocation": False,
-                "Anaplan": False,
-                "SAP APO": False,
-                "Planning": False,
-                "No Relocation Support": False,
-                "Remote": False,
-                "Remote Prohibited": False,
-                "Already Applied": False,
-                "Job URL": None,
-                "Elapsed Time (s)": elapsed_time,
-                "Skills": "",
-                "TG message sent": "",
-                "Matched key words": "",
-                "Search Keyword": config.get("keyword", ""),
-                "Search Country": config.get("search_country", ""),
-                "Job Date": "",
-                "transformed publish date from description": ""
-            })
-            save_results_to_file_with_calculations(results, config["output_file_path"], elapsed_time)
-        finally:
+def get_fixtures_dir(config):
+    """Recorded pages for offline replay (replay_benchmark.py) go next to the seen-job index"""
+    if config.get("record_fixtures_dir"):
+        return config["record_fixtures_dir"]
+    return os.path.join(os.path.dirname(get_seen_index_path(config)), "page_fixtures")
+
+def crawl_position(config, keyword, country):
+    """First page to crawl for this search: the checkpoint's unfinished page, else 1"""
+    checkpoint = config.get("crawl_checkpoint")
+    position = checkpoint.position(keyword, country) if checkpoint else None
+    if not position:
+        return 1
+    logging.info(f"Resuming '{keyword}' / {country} from checkpoint: page {position['page']}"
+                 + (f", after job {position['last_job_id']}" if position.get("last_job_id") else ""))
+    return position["page"]
+
+def crawl_page(driver, config, start_time, page):
+    """
+    Open one result page by its start= offset, analyze it and advance the checkpoint.
+    Returns True if a next page exists.
+    """
+    keyword, country = config["keyword"], config["search_country"]
+    session = config["session"]
+    checkpoint = config.get("crawl_checkpoint")
+    watermark = config.get("recency_watermark")
+    planner = config.get("crawl_planner")
+    if planner and not planner.page_worth_crawling(keyword, country, page):
+        logging.info(f"Crawl planner: page {page} of '{keyword}' / {country} left for the next cycle")
+        if checkpoint:
+            checkpoint.complete(keyword, country, session.cycle_number)
+        return False
+    posted_within_s = None
+    if watermark:
+        watermark.begin_cycle(keyword, country)
+        posted_within_s = watermark.posted_within_s(keyword, country)
+    resume_after = None
+    retry_job_ids = ()
+    on_job_done = on_job_failed = None
+    if checkpoint:
+        position = checkpoint.position(keyword, country)
+        if position and position["page"] == page:
+            resume_after = position.get("last_job_id")
+            retry_job_ids = set(position.get("failed_job_ids") or ())
+        on_job_done = lambda card: checkpoint.record_job(keyword, country, session.cycle_number, page, card["job_id"])
+        on_job_failed = lambda card: checkpoint.record_failure(keyword, country, session.cycle_number, page, card["job_id"])
+
+    logging.info(f"=== Обработка страницы {page} ===" + (f" (posted within {posted_within_s // 3600}h)" if posted_within_s else ""))
+    with measure_stage(config, "page_turn"):
+        driver.get(build_search_url(keyword, country, page, posted_within_s=posted_within_s))
+        time.sleep(get_random_delay(2, 5))  # Random delay between pages
+    page_result = parse_current_page(driver, WebDriverWait(driver, 30), start_time, config,
+                                     resume_after=resume_after, on_job_done=on_job_done,
+                                     retry_job_ids=retry_job_ids, on_job_failed=on_job_failed)
+    flush_results(config, round(time.perf_counter() - start_time, 2))
+
+    has_next = page_result["cards"] > 0 and bool(driver.find_elements(By.XPATH, f"//button[@aria-label='Page {page + 1}']"))
+    budget_spent = bool(page_result.get("deferred"))
+    if planner:
+        planner.observe_page(keyword, country, page, page_result["job_cards"])
+    if watermark:
+        known = watermark.observe(keyword, country, page_result["job_cards"])
+        watermark.save()
+        if has_next and known and known == len(page_result["job_cards"]):
+            logging.info(f"Страница {page}: все {known} вакансий уже известны с прошлых циклов — пагинация остановлена досрочно.")
+            has_next = False
+        if not has_next and not budget_spent:
+            watermark.complete_cycle(keyword, country)
+            logging.info(f"Recency watermark '{keyword}' / {country}: {watermark.describe(keyword, country)}")
+    if budget_spent:
+        # Непройденные страницы и карточки — в следующем цикле (водяной знак цикла не закрывается)
+        has_next = False
+    if checkpoint:
+        if has_next:
+            checkpoint.record_page_done(keyword, country, session.cycle_number, page)
+        else:
+            checkpoint.complete(keyword, country, session.cycle_number)
+    if not has_next:
+        logging.info(f"Страница {page + 1} не найдена. Пагинация завершена.")
+    return has_next
+
+# ================================
+# Основная функция запуска парсера
+# ================================
+def run_scraper(config):
+    start_time = prepare_run(config)
+    session = config["session"]
+    repetitive_parsing = config.get("repetitive_parsing", False)
+    logging.info(f"Starting cycle #{session.cycle_number}")
+    driver = None
+    resume_attempts = 0
+    try:
+        while True:
+            # Браузер живёт между циклами: запуск и логин только при первом цикле или после сбоя
+            driver = ensure_browser(config, driver, config["chrome_profile_path"])
+            if driver is None:
+                break
+
+            try:
+                current_page = crawl_position(config, config["keyword"], config["search_country"])
+                while True:
+                    if not crawl_page(driver, config, start_time, current_page):
+                        break
+                    current_page += 1
+
+                elapsed_time = round(time.perf_counter() - start_time, 2)
+                flush_results(config, elapsed_time, force=True)
+                logging.info("Пагинация завершена. Финальные результаты сохранены.")
+                resume_attempts = 0
+            except Exception as e:
+                logging.error(f"Глобальная ошибка при поиске вакансий: {e}")
+                elapsed_time = round(time.perf_counter() - start_time, 2)
+                record_result(config, {
+                    "Company": config["keyword"],
+                    "Vacancy Title": "",
+                    "Cycle #": session.cycle_number,
+                    "Visa Sponsorship or Relocation": False,
+                    "Anaplan": False,
+                    "SAP APO": False,
+                    "Planning": False,
+                    "No Relocation Support": False,
+                    "Remote": False,
+                    "Remote Prohibited": False,
+                    "Already Applied": False,
+                    "Job URL": None,
+                    "Elapsed Time (s)": elapsed_time,
+                    "Skills": "",
+                    "TG message sent": "",
+                    "Matched key words": "",
+                    "Search Keyword": config.get("keyword", ""),
+                    "Search Country": config.get("search_country", ""),
+                    "Job Date": "",
+                    "transformed publish date from description": ""
+                })
+                flush_results(config, elapsed_time, force=True)
+                if config.get("crawl_checkpoint") and resume_attempts < config.get("max_resume_attempts", 3):
+                    # Браузер перезапускается проверкой ensure_browser, обход продолжается с контрольной точки
+                    resume_attempts += 1
+                    logging.info(f"Resuming from checkpoint (attempt {resume_attempts})...")
+                    continue
+                resume_attempts = 0
+            finally:
+                if config.get("seen_index"):
+                    config["seen_index"].save()
+            export_stage_timings(config)
+            if not repetitive_parsing:
+                if config.get("alert_digest"):
+                    config["alert_digest"].flush()
+                break
+            
+            # Send cycle summary via Telegram before starting next cycle
+            send_cycle_summary(config)
+            
+            # Reset cycle counters for new cycle
+            reset_cycle_counters(session)
+            if config.get("crawl_planner"):
+                config["crawl_planner"].begin_cycle()
+            logging.info("Repetitive parsing enabled: restarting from first page in the same browser...")
+    finally:
+        if driver is not None:
             driver.quit()
             logging.info("Браузер закрыт.")
-            if config.get("shutdown_on_finish"):
-                logging.info("Скрипт завершён. Выключение компьютера через 30 секунд.")
-                os.system("shutdown /s /t 30")
-        if not repetitive_parsing:
+
+    finish_run(config)
+    if config.get("shutdown_on_finish"):
+        logging.info("Скрипт завершён. Выключение компьютера через 30 секунд.")
+        os.system("shutdown /s /t 30")
+
+# ================================
+# Пул браузеров: параллельный обход keyword × country
+# ================================
+def split_search_terms(text):
+    """Additional keywords / countries are ';'-separated (keywords themselves may contain commas)"""
+    return [term.strip() for term in (text or "").split(";") if term.strip()]
+
+def build_search_tasks(config):
+    """Every (keyword, country) pair the run should cover, main search first"""
+    keywords = [config["keyword"]] + [k for k in config.get("extra_keywords", []) if k != config["keyword"]]
+    countries = [config["search_country"]] + [c for c in config.get("extra_countries", []) if c != config["search_country"]]
+    return [(keyword, country) for keyword in keywords for country in countries]
+
+def get_worker_profile_path(config, index):
+    """Chrome can't share a user-data-dir between instances: worker 0 uses the configured profile, others WORKER_PROFILES"""
+    if index == 0:
+        return config["chrome_profile_path"]
+    profile_path = WORKER_PROFILES.get(f"worker{index}") or f"{config['chrome_profile_path']}_worker{index}"
+    if not os.path.exists(profile_path):
+        os.makedirs(profile_path, exist_ok=True)
+        logging.info(f"Created new profile directory: {profile_path}")
+    return profile_path
+
+def pool_worker(index, config, task_queue, start_time):
+    """One browser pulling (keyword, country, page) tasks until it receives None"""
+    profile_path = get_worker_profile_path(config, index)
+    driver = launch_browser(config, profile_path)
+    if driver is None:
+        logging.error(f"Worker {index + 1}: browser not available, leaving tasks to the other workers")
+        return
+    failures = {}
+    try:
+        while True:
+            task = task_queue.get()
+            try:
+                if task is None:
+                    return
+                driver = ensure_browser(config, driver, profile_path)
+                if driver is None:
+                    logging.error(f"Worker {index + 1}: browser could not be restarted, returning task {task} to the queue")
+                    task_queue.put(task)
+                    return
+                keyword, country, page = task
+                # Общие session / seen index / journal / sink / checkpoint, своё ключевое слово и страна
+                worker_config = dict(config, keyword=keyword, search_country=country)
+                logging.info(f"=== Worker {index + 1}: '{keyword}' / {country}, страница {page} ===")
+                # Следующая страница ставится в очередь до task_done, чтобы цикл не завершился раньше времени
+                if crawl_page(driver, worker_config, start_time, page):
+                    task_queue.put((keyword, country, page + 1))
+            except Exception as e:
+                logging.error(f"Worker {index + 1}: ошибка при обработке задачи {task}: {e}")
+                failures[task] = failures.get(task, 0) + 1
+                if config.get("crawl_checkpoint") and failures[task] <= config.get("max_resume_attempts", 3):
+                    # Браузер проверяется перед следующей задачей, страница продолжается с контрольной точки
+                    logging.info(f"Worker {index + 1}: re-queueing {task} to resume from checkpoint")
+                    task_queue.put(task)
+            finally:
+                task_queue.task_done()
+    finally:
+        if driver is not None:
+            driver.quit()
+            logging.info(f"Worker {index + 1}: браузер закрыт.")
+
+def run_worker_pool(config):
+    """N browsers crawl keyword × country pages from one queue, sharing session, seen index and sinks"""
+    start_time = prepare_run(config)
+    session = config["session"]
+    search_tasks = build_search_tasks(config)
+    worker_count = max(1, config.get("workers", 1))
+    task_queue = queue.Queue()
+    workers = [
+        threading.Thread(target=pool_worker, args=(i, config, task_queue, start_time), name=f"scraper-worker-{i + 1}", daemon=True)
+        for i in range(worker_count)
+    ]
+    logging.info(f"Worker pool: {worker_count} browsers, {len(search_tasks)} searches")
+    for worker in workers:
+        worker.start()
+
+    logging.info(f"Starting cycle #{session.cycle_number}")
+    while True:
+        planner = config.get("crawl_planner")
+        for keyword, country in (planner.order_searches(search_tasks) if planner else search_tasks):
+            task_queue.put((keyword, country, crawl_position(config, keyword, country)))
+        # queue.join() would hang if every browser failed to start, so also watch the workers
+        while task_queue.unfinished_tasks and any(worker.is_alive() for worker in workers):
+            time.sleep(1)
+        elapsed_time = round(time.perf_counter() - start_time, 2)
+        flush_results(config, elapsed_time, force=True)
+        if config.get("seen_index"):
+            config["seen_index"].save()
+        export_stage_timings(config)
+        if task_queue.unfinished_tasks:
+            logging.error("All pool workers stopped - finishing run")
             break
-        
-        # Send cycle summary via Telegram before starting next cycle
-        try:
-            summary_message = generate_cycle_summary_message()
-            send_telegram_message(
-                config["telegram_bot_token"], 
-                config["telegram_chat_id"], 
-                summary_message
-            )
-            logging.info(f"Cycle #{cycle_number} summary sent to Telegram")
-        except Exception as e:
-            logging.warning(f"Failed to send cycle summary: {e}")
-        
-        # Reset cycle counters for new cycle
-        reset_cycle_counters()
-        logging.info("Repetitive parsing enabled: restarting from first page...")
-        # Здесь можно добавить сброс состояния, если нужно
-        # Например, сбросить текущую страницу на 1, обновить драйвер и т.д.
-        # В зависимости от вашей логики, возможно потребуется реализовать функцию reset_to_first_page()
-        # reset_to_first_page(driver)
+        if not config.get("repetitive_parsing", False):
+            break
+        send_cycle_summary(config)
+        reset_cycle_counters(session)
+        if config.get("crawl_planner"):
+            config["crawl_planner"].begin_cycle()
+        logging.info("Repetitive parsing enabled: restarting all searches from first page...")
+
+    if config.get("alert_digest"):
+        config["alert_digest"].flush()
+    for _ in workers:
+        task_queue.put(None)
+    for worker in workers:
+        worker.join(timeout=60)
+    finish_run(config)
+    if config.get("shutdown_on_finish"):
+        logging.info("Скрипт завершён. Выключение компьютера через 30 секунд.")
+        os.system("shutdown /s /t 30")
 
 def start_scraper_thread(config):
-    thread = threading.Thread(target=run_scraper, args=(config,))
+    use_pool = config.get("workers", 1) > 1 or len(build_search_tasks(config)) > 1
+    thread = threading.Thread(target=run_worker_pool if use_pool else run_scraper, args=(config,))
     thread.start()
 
 # ================================
@@ -1427,6 +1680,53 @@ def create_gui():
     tk.Label(root, text="Exclusions:").grid(row=13, column=0, sticky="e", padx=5, pady=2)
     tk.Checkbutton(root, text="Block jobs that prohibit remote work", variable=block_remote_prohibited_var).grid(row=13, column=1, sticky="w", padx=5, pady=2)
 
+    # Performance
+    batch_card_extraction_var = tk.BooleanVar(value=True)
+    tk.Label(root, text="Performance:").grid(row=14, column=0, sticky="e", padx=5, pady=2)
+    tk.Checkbutton(root, text="Batch card extraction (one JS call per page)", variable=batch_card_extraction_var).grid(row=14, column=1, sticky="w", padx=5, pady=2)
+    skip_seen_jobs_var = tk.BooleanVar(value=True)
+    tk.Checkbutton(root, text="Skip jobs already analyzed (persistent job ID index)", variable=skip_seen_jobs_var).grid(row=15, column=1, sticky="w", padx=5, pady=2)
+    telegram_digest_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(root, text="Telegram digest (group new jobs, one message + charts per batch)", variable=telegram_digest_var).grid(row=16, column=1, sticky="w", padx=5, pady=2)
+
+    # Parallel crawling
+    workers_var = tk.IntVar(value=1)
+    extra_keywords_var = tk.StringVar(value="")
+    extra_countries_var = tk.StringVar(value="")
+    tk.Label(root, text="Parallel browsers:").grid(row=17, column=0, sticky="e", padx=5, pady=2)
+    tk.Spinbox(root, from_=1, to=4, textvariable=workers_var, width=5).grid(row=17, column=1, sticky="w", padx=5, pady=2)
+    tk.Label(root, text="More keywords (;):").grid(row=18, column=0, sticky="e", padx=5, pady=2)
+    tk.Entry(root, textvariable=extra_keywords_var, width=40).grid(row=18, column=1, padx=5, pady=2)
+    tk.Label(root, text="More countries (;):").grid(row=19, column=0, sticky="e", padx=5, pady=2)
+    tk.Entry(root, textvariable=extra_countries_var, width=40).grid(row=19, column=1, padx=5, pady=2)
+    adaptive_scroll_var = tk.BooleanVar(value=True)
+    tk.Checkbutton(root, text="Adaptive scrolling (order strategies by past yield)", variable=adaptive_scroll_var).grid(row=20, column=1, sticky="w", padx=5, pady=2)
+    incremental_crawl_var = tk.BooleanVar(value=True)
+    tk.Checkbutton(root, text="Incremental crawl (only postings since last cycle, stop at known pages)", variable=incremental_crawl_var).grid(row=21, column=1, sticky="w", padx=5, pady=2)
+    record_fixtures_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(root, text="Record pages for offline replay (replay_benchmark.py)", variable=record_fixtures_var).grid(row=22, column=1, sticky="w", padx=5, pady=2)
+    target_languages_var = tk.StringVar(value="")
+    tk.Label(root, text="Only languages (e.g. en,de):").grid(row=23, column=0, sticky="e", padx=5, pady=2)
+    tk.Entry(root, textvariable=target_languages_var, width=40).grid(row=23, column=1, padx=5, pady=2)
+    # Пре-фильтр по карточке: такие вакансии не открываются вовсе
+    title_include_var = tk.StringVar(value="")
+    tk.Label(root, text="Title must match (e.g. planner,anaplan):").grid(row=24, column=0, sticky="e", padx=5, pady=2)
+    tk.Entry(root, textvariable=title_include_var, width=40).grid(row=24, column=1, padx=5, pady=2)
+    title_exclude_var = tk.StringVar(value="")
+    tk.Label(root, text="Skip titles matching (e.g. intern,sales):").grid(row=25, column=0, sticky="e", padx=5, pady=2)
+    tk.Entry(root, textvariable=title_exclude_var, width=40).grid(row=25, column=1, padx=5, pady=2)
+    company_blocklist_var = tk.StringVar(value="")
+    tk.Label(root, text="Skip companies:").grid(row=26, column=0, sticky="e", padx=5, pady=2)
+    tk.Entry(root, textvariable=company_blocklist_var, width=40).grid(row=26, column=1, padx=5, pady=2)
+    # Бюджет времени на цикл: сначала самые перспективные вакансии, остальное — в следующем цикле
+    cycle_budget_var = tk.IntVar(value=0)
+    tk.Label(root, text="Cycle time budget (min, 0 = none):").grid(row=27, column=0, sticky="e", padx=5, pady=2)
+    tk.Spinbox(root, from_=0, to=600, increment=5, textvariable=cycle_budget_var, width=5).grid(row=27, column=1, sticky="w", padx=5, pady=2)
+    cdp_capture_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(root, text="Read job data from LinkedIn's JSON responses (DevTools network capture)", variable=cdp_capture_var).grid(row=28, column=1, sticky="w", padx=5, pady=2)
+    prefilter_on_site_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(root, text="Skip On-site cards unopened when remote is required/prohibited (off: decided from the description)", variable=prefilter_on_site_var).grid(row=29, column=1, sticky="w", padx=5, pady=2)
+
     def on_start():
         # Получаем пользовательские ключевые слова и разбиваем их по запятым
         config = {
@@ -1453,7 +1753,23 @@ def create_gui():
             "require_visa": require_visa_var.get(),
             "require_skills": require_skills_var.get(),
             "location_logic": location_logic_var.get(),
-            "block_remote_prohibited": block_remote_prohibited_var.get()
+            "block_remote_prohibited": block_remote_prohibited_var.get(),
+            "batch_card_extraction": batch_card_extraction_var.get(),
+            "skip_seen_jobs": skip_seen_jobs_var.get(),
+            "telegram_digest": telegram_digest_var.get(),
+            "workers": workers_var.get(),
+            "extra_keywords": split_search_terms(extra_keywords_var.get()),
+            "extra_countries": split_search_terms(extra_countries_var.get()),
+            "adaptive_scroll": adaptive_scroll_var.get(),
+            "incremental_crawl": incremental_crawl_var.get(),
+            "record_fixtures": record_fixtures_var.get(),
+            "target_languages": sorted(parse_language_list(target_languages_var.get())),
+            "title_include": parse_pattern_list(title_include_var.get()),
+            "title_exclude": parse_pattern_list(title_exclude_var.get()),
+            "company_blocklist": parse_pattern_list(company_blocklist_var.get()),
+            "cycle_time_budget_min": cycle_budget_var.get(),
+            "cdp_capture": cdp_capture_var.get(),
+            "prefilter_on_site": prefilter_on_site_var.get()
         }
         if not config["output_file_path"]:
             messagebox.showerror("Ошибка", "Укажите путь для сохранения Excel файла.")
@@ -1461,7 +1777,7 @@ def create_gui():
         root.destroy()
         start_scraper_thread(config)
 
-    tk.Button(root, text="Start Scraper", command=on_start, bg="green", fg="white").grid(row=14, column=0, columnspan=3, pady=10)
+    tk.Button(root, text="Start Scraper", command=on_start, bg="green", fg="white").grid(row=30, column=0, columnspan=3, pady=10)
     root.mainloop()
 
 if __name__ == "__main__":